@@ -1,102 +1,241 @@
+import argparse
 import pandas as pd
-from transformers import pipeline
 from pathlib import Path
 import os
-import torch
-from langdetect import detect, DetectorFactory
-
-DetectorFactory.seed = 0
-
-# 🔹 요약 모델 (영어 요약에 특화된 모델 사용)
-device = -1
-print("영어 요약 모델 로드 중... (facebook/bart-large-cnn)")
-summarizer_en = pipeline("summarization", model="facebook/bart-large-cnn", device=device)
-print("영어 요약 모델 로드 완료.")
-
-# 🔹 입력 보고서 폴더 경로 (원본 데이터가 있는 곳)
-# 이 폴더에서 가장 최신 CSV 파일을 찾습니다.
-input_report_dir = Path(r"C:\업무\16.뉴스 스크랩(feat.AI.ML)\weekly_reports")
-
-# 🔹 AI 요약 결과 저장 폴더 경로 (새로 생성하거나 지정)
-# 이 폴더에 AI 요약 결과 CSV 파일이 저장됩니다.
-output_summary_dir = Path(r"C:\업무\16.뉴스 스크랩(feat.AI.ML)\summarized_outputs")
-output_summary_dir.mkdir(parents=True, exist_ok=True)  # 폴더가 없으면 생성
-
-# 🔹 최신 CSV 선택 (입력 폴더에서만)
-csv_files = list(input_report_dir.glob("*.csv"))  # input_report_dir에서만 찾기
-if not csv_files:
-    raise FileNotFoundError(f"📂 {input_report_dir} 디렉토리에 CSV 파일이 없습니다.")
-
-# 여기서 `weekly_security_report_2025-06-25.csv` 와 같은 원본 파일을 정확히 찾으려면
-# 파일 이름 패턴을 더 명확히 하거나 (예: starts with 'weekly_security_report_')
-# 또는 단순히 가장 오래된 파일이 아닌, 특정 패턴을 가진 가장 최신 파일을 선택하는 로직이 필요할 수 있습니다.
-# 일단은 'ai_insight_summary_' 로 시작하지 않는 파일 중 가장 최신 파일을 선택하도록 수정합니다.
-target_csv_files = [f for f in csv_files if not f.name.startswith("ai_insight_summary_")]
-if not target_csv_files:
-    raise FileNotFoundError(f"📂 {input_report_dir} 디렉토리에 'ai_insight_summary_'로 시작하지 않는 원본 CSV 파일이 없습니다.")
-latest_file = max(target_csv_files, key=os.path.getmtime)
-
-print(f"📄 최신 입력 파일: {latest_file.name}")  # 입력 파일임을 명시
-
-# 🔹 CSV 로드
-df = pd.read_csv(latest_file, encoding="utf-8")
-
-df_to_process = df.head(6)
-print(f"✔️ CSV 파일에서 상위 {len(df_to_process)}개 기사를 검토합니다.")
-
-output = []
-processed_count = 0
-
-for idx, row in df_to_process.iterrows():
-    title = str(row.get("Title", "")).strip()
-    content = str(row.get("Summary", "")).strip()
-
-    print(f"\n--- {idx + 1}번째 기사 처리 중: '{title[:50]}...' ---")
-
-    if not content or len(content) < 30:
-        print(f"  🚨 건너뛰기: 내용이 없거나 30자 미만입니다.")
-        continue
-
-    # 1. 언어 감지
-    try:
-        lang = detect(content)
-        print(f"  ➡️ 감지된 언어: {lang.upper()}")
-    except Exception as e:
-        lang = 'unknown'
-        print(f"  ⚠️ 언어 감지 실패 ({e}), 건너뜁니다.")
-        continue
-
-    # 2. 영어 기사가 아니면 건너뛰기
-    if lang != 'en':
-        print(f"  🚫 건너뛰기: 영어 기사가 아닙니다.")
-        continue
-
-    # 3. 영어 요약 모델에 입력할 프롬프트 생성 (인사이트 추출 강조)
-    input_text = f"Title: {title}\n\nBody: {content}\n\nBased on the above news summary, describe the emerging trend or significant shift in the cybersecurity landscape in two concise sentences."
-
-    try:
-        print("  AI 인사이트 추출 중...")
-        insight_summary = summarizer_en(input_text, max_length=60, min_length=20, do_sample=False)[0]["summary_text"]
-        print("  ✅ 인사이트 추출 완료.")
-        processed_count += 1
-    except Exception as e:
-        insight_summary = f"(Insight extraction failed: {e})"
-        print(f"  ❌ 인사이트 추출 실패: {e}")
-
-    output.append({
-        "title": title,
-        "summary": content,
-        "ai_insight": insight_summary,
-        "url": row.get("Link", ""),
-        "source": row.get("Source", "")
-    })
-
-# 🔹 결과 확인
-print(f"\n✅ 총 인사이트 추출 완료: {processed_count}건")
-
-# 🔹 결과 저장 🔹
-output_df = pd.DataFrame(output)
-# 결과를 새로운 폴더에 저장하도록 경로 변경
-output_df.to_csv(output_summary_dir / f"ai_insight_summary_{latest_file.stem}_en_only.csv", index=False,
-                 encoding="utf-8-sig")
-print(f"\n🎉 AI 인사이트 요약 보고서 저장 완료: {output_summary_dir / f'ai_insight_summary_{latest_file.stem}_en_only.csv'}")
+import time
+from config import (AI_ANALYSIS_REPORT_DIR, ANALYSIS_NUM_WORKERS, SUMMARIZER_BACKEND, SUMMARY_BATCH_SIZE,
+                    SUMMARY_MAX_ARTICLES, SUMMARY_NUM_THREADS, WEEKLY_REPORT_DIR)
+from lang_router import ensure_lang
+from metrics import export_run_report, get_metrics
+from result_cache import ResultCache, cached_map
+from sharded_analysis import summarize_sharded
+from summarizer_backends import backend_model_id, load_summarizer
+from summarizer_worker import request_summaries
+from text_preprocessing import build_insight_prompts, has_min_length, stripped
+from trend_engine import spiking_keywords
+
+SUMMARY_GENERATION_KWARGS = {"max_length": 60, "min_length": 20, "do_sample": False, "truncation": True}
+
+# 🔹 결과 캐시 키: 모델(추론 백엔드 포함)·생성 옵션과 프롬프트 버전이 바뀌면 이전 결과를 재사용하지 않음
+SUMMARIZER_MODEL_ID = backend_model_id()
+INSIGHT_MODEL_ID = f"{SUMMARIZER_MODEL_ID}|" + ",".join(f"{k}={v}" for k, v in sorted(SUMMARY_GENERATION_KWARGS.items()))
+INSIGHT_PROMPT_VERSION = "insight-v1"
+
+# 🔹 요약 모델은 처음 필요할 때 한 번만 로드 (torch / transformers import 도 이때 수행)
+_summarizer = None
+
+
+def get_summarizer():
+    """영어 요약 파이프라인을 지연 로드하여 반환 (프로세스당 1회)"""
+    global _summarizer
+    if _summarizer is None:
+        # 🔹 요약 모델 (영어 요약에 특화된 모델, CPU 추론 백엔드는 SUMMARIZER_BACKEND 로 선택)
+        print(f"영어 요약 모델 로드 중... ({SUMMARIZER_MODEL_ID}, backend={SUMMARIZER_BACKEND})")
+        with get_metrics().timer("model_load", model=SUMMARIZER_MODEL_ID):
+            _summarizer = load_summarizer(SUMMARIZER_BACKEND, num_threads=SUMMARY_NUM_THREADS)
+        print("영어 요약 모델 로드 완료.")
+    return _summarizer
+
+
+def summarize_batched(summarizer, texts, batch_size):
+    """
+    입력을 토큰 길이순으로 정렬해 비슷한 길이끼리 배치로 묶어 요약합니다 (패딩 낭비 최소화).
+    결과는 입력 순서대로 반환되며, 배치가 실패하면 해당 배치만 한 건씩 다시 시도합니다.
+    """
+    if not texts:
+        return []
+
+    metrics = get_metrics()
+    lengths = [len(ids) for ids in summarizer.tokenizer(texts, truncation=True)["input_ids"]]
+    order = sorted(range(len(texts)), key=lambda i: lengths[i])
+    results = [None] * len(texts)
+
+    for batch_start in range(0, len(order), batch_size):
+        batch_idx = order[batch_start:batch_start + batch_size]
+        batch_texts = [texts[i] for i in batch_idx]
+        batch_start_time = time.perf_counter()
+        try:
+            outputs = summarizer(batch_texts, batch_size=len(batch_texts), **SUMMARY_GENERATION_KWARGS)
+            for i, out in zip(batch_idx, outputs):
+                results[i] = out["summary_text"]
+        except Exception as e:
+            print(f"  ⚠️ 배치 요약 실패 ({e}), 기사별로 다시 시도합니다.")
+            for i in batch_idx:
+                try:
+                    results[i] = summarizer(texts[i], **SUMMARY_GENERATION_KWARGS)[0]["summary_text"]
+                except Exception as item_error:
+                    results[i] = f"(Insight extraction failed: {item_error})"
+                    metrics.inc("summarize_failures")
+                    print(f"  ❌ 인사이트 추출 실패: {item_error}")
+
+        # 배치 소요 시간을 기사 수로 나눠 기사당 추론 시간으로 기록
+        batch_elapsed = time.perf_counter() - batch_start_time
+        metrics.observe("summarize_batch", batch_elapsed, backend="local")
+        for _ in batch_idx:
+            metrics.observe("summarize_article", batch_elapsed / len(batch_idx), backend="local")
+
+        print(f"  AI 인사이트 추출 중... {min(batch_start + batch_size, len(order))}/{len(order)}")
+
+    return results
+
+
+def summarize_texts(texts, batch_size=SUMMARY_BATCH_SIZE, num_workers=ANALYSIS_NUM_WORKERS):
+    """
+    실행 중인 요약 워커(summarizer_worker.py)가 있으면 워커에 요청하고,
+    없으면 num_workers 개 프로세스(2 이상일 때) 또는 이 프로세스에서 모델을 로드하여 요약합니다.
+    """
+    if not texts:
+        return []
+    start_time = time.perf_counter()
+    summaries = request_summaries(texts, batch_size)
+    if summaries is not None:
+        elapsed = time.perf_counter() - start_time
+        metrics = get_metrics()
+        metrics.observe("summarize_batch", elapsed, backend="worker")
+        for _ in texts:
+            metrics.observe("summarize_article", elapsed / len(texts), backend="worker")
+        print("  ⚡ 요약 워커에서 처리했습니다.")
+        return summaries
+    if num_workers and num_workers > 1 and len(texts) > batch_size:
+        summaries = summarize_sharded(texts, num_workers, batch_size)
+        elapsed = time.perf_counter() - start_time
+        metrics = get_metrics()
+        metrics.observe("summarize_batch", elapsed, backend="sharded")
+        for _ in texts:
+            metrics.observe("summarize_article", elapsed / len(texts), backend="sharded")
+        return summaries
+    return summarize_batched(get_summarizer(), texts, batch_size)
+
+
+def find_latest_report(input_report_dir):
+    """입력 폴더에서 AI 결과 파일을 제외한 가장 최신 보고서 CSV 반환"""
+    input_report_dir = Path(input_report_dir)
+    csv_files = list(input_report_dir.glob("*.csv"))
+    if not csv_files:
+        raise FileNotFoundError(f"📂 {input_report_dir} 디렉토리에 CSV 파일이 없습니다.")
+
+    # 'ai_insight_summary_' 로 시작하지 않는 파일 중 가장 최신 파일을 선택
+    target_csv_files = [f for f in csv_files if not f.name.startswith("ai_insight_summary_")]
+    if not target_csv_files:
+        raise FileNotFoundError(f"📂 {input_report_dir} 디렉토리에 'ai_insight_summary_'로 시작하지 않는 원본 CSV 파일이 없습니다.")
+    return max(target_csv_files, key=os.path.getmtime)
+
+
+def prepare_articles(df, focus_keywords=None):
+    """
+    요약 대상(영어, 30자 이상) 기사와 모델 입력 프롬프트 목록 생성.
+    focus_keywords(급증 키워드)가 주어지면 해당 키워드가 걸린 기사를 먼저 검토하여
+    SUMMARY_MAX_ARTICLES 제한이 있어도 급증 주제 기사가 요약에서 빠지지 않도록 함
+    """
+    # 🔹 유사 중복 클러스터의 대표 기사만 분석 (같은 사건을 여러 번 요약하지 않도록)
+    if "IsRepresentative" in df.columns:
+        df = df[df["IsRepresentative"]].reset_index(drop=True)
+
+    if focus_keywords and "Keywords" in df.columns:
+        focus = set(focus_keywords)
+        is_focus = df["Keywords"].fillna("").astype(str).map(
+            lambda keywords: any(k.strip() in focus for k in keywords.split(";")))
+        df = pd.concat([df[is_focus], df[~is_focus]], ignore_index=True)
+        print(f"🔺 급증 키워드({', '.join(focus_keywords)}) 기사 {int(is_focus.sum())}건을 먼저 검토합니다.")
+
+    df_to_process = df if SUMMARY_MAX_ARTICLES is None else df.head(SUMMARY_MAX_ARTICLES)
+    print(f"✔️ {len(df_to_process)}개 기사를 검토합니다.")
+
+    # 수집 시점에 저장된 Lang 컬럼 사용 (없는 기사만 글자 비율 기반으로 판정)
+    langs = ensure_lang(df_to_process)
+
+    # 행 단위 루프 대신 컬럼 단위로 필터링·프롬프트 조립
+    titles = stripped(df_to_process, "Title")
+    contents = stripped(df_to_process, "Summary")
+    # 30자 이상인 영어 기사만 요약 대상
+    mask = has_min_length(contents) & langs.eq("en")
+
+    # 영어 요약 모델에 입력할 프롬프트 생성 (인사이트 추출 강조)
+    titles, contents = titles[mask], contents[mask]
+    input_texts = build_insight_prompts(titles, contents)
+
+    pending = [
+        {"title": title, "summary": content, "input_text": input_text, "url": url, "source": source}
+        for title, content, input_text, url, source in zip(
+            titles, contents, input_texts, stripped(df_to_process, "Link")[mask], stripped(df_to_process, "Source")[mask])
+    ]
+    return pending
+
+
+def analyze_report(df, batch_size=SUMMARY_BATCH_SIZE, focus_keywords=None, num_workers=ANALYSIS_NUM_WORKERS):
+    """보고서 DataFrame 의 영어 기사별 AI 인사이트를 추출하여 결과 DataFrame 으로 반환"""
+    pending = prepare_articles(df, focus_keywords)
+    print(f"✔️ 요약 대상 영어 기사: {len(pending)}건 (배치 크기 {batch_size})")
+
+    # 이전 실행(겹치는 주간)에서 이미 요약한 기사는 캐시에서 가져오고, 새 기사만 배치 요약
+    start_time = time.perf_counter()
+    metrics = get_metrics()
+    with ResultCache() as cache:
+        insights = cached_map(cache, [item["input_text"] for item in pending], INSIGHT_MODEL_ID,
+                              INSIGHT_PROMPT_VERSION, lambda texts: summarize_texts(texts, batch_size, num_workers),
+                              should_store=lambda insight: not insight.startswith("(Insight extraction failed"))
+        print(f"🗂️ 결과 캐시: 적중 {cache.hits}건 / 미스 {cache.misses}건")
+        # close() 가 적중/미스 횟수를 누적 카운터로 옮기며 0 으로 되돌리므로 블록 안에서 기록
+        metrics.inc("result_cache_hits", cache.hits, model=SUMMARIZER_MODEL_ID)
+        metrics.inc("result_cache_misses", cache.misses, model=SUMMARIZER_MODEL_ID)
+    elapsed = time.perf_counter() - start_time
+
+    metrics.observe("stage", elapsed, stage="analyze_en")
+
+    output = []
+    processed_count = 0
+    for item, insight_summary in zip(pending, insights):
+        if not insight_summary.startswith("(Insight extraction failed"):
+            processed_count += 1
+        output.append({
+            "title": item["title"],
+            "summary": item["summary"],
+            "ai_insight": insight_summary,
+            "url": item["url"],
+            "source": item["source"]
+        })
+
+    metrics.inc("articles_summarized", processed_count)
+    if pending:
+        print(f"⏱️ 요약 소요 시간: {elapsed:.1f}초 ({len(pending) / elapsed:.2f} articles/sec)")
+
+    # 🔹 결과 확인
+    print(f"\n✅ 총 인사이트 추출 완료: {processed_count}건")
+    return pd.DataFrame(output)
+
+
+def save_insights(output_df, report_stem, output_summary_dir=AI_ANALYSIS_REPORT_DIR):
+    """인사이트 결과를 'ai_insight_summary_<보고서 이름>_en_only.csv' 로 저장하고 경로 반환"""
+    output_summary_dir = Path(output_summary_dir)
+    output_summary_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_summary_dir / f"ai_insight_summary_{report_stem}_en_only.csv"
+    output_df.to_csv(output_file, index=False, encoding="utf-8-sig")
+    print(f"\n🎉 AI 인사이트 요약 보고서 저장 완료: {output_file}")
+    return output_file
+
+
+def main(input_report_dir=WEEKLY_REPORT_DIR, output_summary_dir=AI_ANALYSIS_REPORT_DIR, num_workers=ANALYSIS_NUM_WORKERS):
+    """최신 주간 보고서를 읽어 AI 인사이트 요약 CSV 를 저장"""
+    output_summary_dir = Path(output_summary_dir)
+    output_summary_dir.mkdir(parents=True, exist_ok=True)  # 폴더가 없으면 생성
+
+    latest_file = find_latest_report(input_report_dir)
+    print(f"📄 최신 입력 파일: {latest_file.name}")  # 입력 파일임을 명시
+
+    # 🔹 CSV 로드
+    df = pd.read_csv(latest_file, encoding="utf-8")
+    output_df = analyze_report(df, focus_keywords=spiking_keywords(), num_workers=num_workers)
+
+    # 🔹 결과 저장 🔹
+    save_insights(output_df, latest_file.stem, output_summary_dir)
+    return output_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주간 보안 뉴스 영어 기사 AI 인사이트 요약")
+    parser.add_argument("--input-dir", default=WEEKLY_REPORT_DIR, help="주간 보고서 CSV 폴더")
+    parser.add_argument("--output-dir", default=AI_ANALYSIS_REPORT_DIR, help="AI 요약 결과 저장 폴더")
+    parser.add_argument("--workers", type=int, default=ANALYSIS_NUM_WORKERS, help="요약을 나누어 실행할 프로세스 수")
+    args = parser.parse_args()
+    main(args.input_dir, args.output_dir, args.workers)
+    export_run_report("analyze_en")
@@ -0,0 +1,170 @@
+# benchmarks/compare_summarizer_backends.py
+# 요약 모델 CPU 추론 백엔드(fp32 / int8 / onnx / distilled)의 품질·처리량·최대 메모리 비교
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.compare_summarizer_backends                                   # 합성 기사 고정 세트
+#   python -m benchmarks.compare_summarizer_backends --input weekly_reports/weekly_security_report_<날짜>.csv
+#   python -m benchmarks.compare_summarizer_backends --backends fp32 int8 --articles 64
+#
+# 백엔드마다 새 프로세스에서 모델을 로드하여 최대 RSS 가 서로 섞이지 않도록 하고,
+# 품질은 같은 기사에 대한 fp32 요약과의 단어 단위 F1 (ROUGE-1 F1) 로 비교합니다.
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import resource
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.run_benchmarks import RESULTS_DIR, git_revision
+from benchmarks.synthetic_feeds import generate_article_rows
+from config import (SECURITY_KEYWORDS, SUMMARIZER_DISTILLED_MODEL, SUMMARIZER_MODEL, SUMMARY_BATCH_SIZE,
+                    SUMMARY_NUM_THREADS)
+from summarizer_backends import BACKENDS
+
+_WORD = re.compile(r"\w+")
+
+
+def unigram_f1(reference, candidate):
+    """두 요약의 단어 단위 F1 (대소문자 무시, 1.0 이면 단어 구성이 같음)"""
+    ref, cand = Counter(_WORD.findall(reference.lower())), Counter(_WORD.findall(candidate.lower()))
+    overlap = sum((ref & cand).values())
+    if not overlap:
+        return 1.0 if not ref and not cand else 0.0
+    precision, recall = overlap / sum(cand.values()), overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def load_texts(input_csv=None, count=32, seed=0):
+    """
+    비교용 고정 기사 세트의 모델 입력 프롬프트 목록.
+    input_csv 가 있으면 보고서 CSV 의 영어 기사, 없으면 같은 seed 로 생성한 합성 기사 사용
+    """
+    from ai_trend_analyzer import prepare_articles
+    from daily_news_collector import filter_relevant
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if input_csv:
+            df = pd.read_csv(input_csv, encoding="utf-8")
+        else:
+            df = filter_relevant(pd.DataFrame(generate_article_rows(count * 4, seed=seed)), SECURITY_KEYWORDS)
+        return [item["input_text"] for item in prepare_articles(df)][:count]
+
+
+def _peak_rss_mb():
+    # Linux 의 ru_maxrss 단위는 KB
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _run_backend(backend, model, texts, batch_size, num_threads, repeat):
+    """(새 프로세스에서 실행) 백엔드 로드 후 요약하여 소요 시간·메모리·요약 결과 반환"""
+    from ai_trend_analyzer import summarize_batched
+    from summarizer_backends import load_summarizer
+
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summarizer = load_summarizer(backend, model, num_threads)
+    load_s = time.perf_counter() - start
+
+    runs, summaries = [], []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            summaries = summarize_batched(summarizer, texts, batch_size)
+            runs.append(time.perf_counter() - start)
+    median = statistics.median(runs)
+    return {
+        "model": model,
+        "model_load_s": round(load_s, 3),
+        "median_s": round(median, 3),
+        "articles_per_s": round(len(texts) / median, 3) if median else None,
+        "rss_before_load_mb": rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+        "summaries": summaries,
+    }
+
+
+def compare_backends(texts, backends=BACKENDS, model=SUMMARIZER_MODEL, distilled_model=SUMMARIZER_DISTILLED_MODEL,
+                     batch_size=SUMMARY_BATCH_SIZE, num_threads=SUMMARY_NUM_THREADS, repeat=1):
+    """백엔드별 결과 dict. fp32 결과가 있으면 각 백엔드의 fp32 대비 품질(quality_f1)을 함께 기록"""
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for backend in backends:
+        print(f"▶ {backend} ...")
+        # distilled 는 다른 체크포인트를 fp32 로 불러오는 것과 같음
+        load_backend, load_model = ("fp32", distilled_model) if backend == "distilled" else (backend, model)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results[backend] = executor.submit(_run_backend, load_backend, load_model, texts, batch_size,
+                                                   num_threads, repeat).result()
+            except Exception as e:
+                results[backend] = {"skipped": f"{type(e).__name__}: {e}"}
+                print(f"  건너뜀 ({results[backend]['skipped']})")
+
+    baseline = results.get("fp32", {}).get("summaries")
+    for backend, stats in results.items():
+        if baseline and "summaries" in stats:
+            scores = [unigram_f1(ref, out) for ref, out in zip(baseline, stats["summaries"])]
+            stats["quality_f1"] = round(statistics.mean(scores), 4) if scores else None
+            stats["quality_f1_min"] = round(min(scores), 4) if scores else None
+            stats["exact_match_ratio"] = round(
+                sum(ref == out for ref, out in zip(baseline, stats["summaries"])) / len(scores), 4) if scores else None
+    return results
+
+
+def print_table(results, fp32_key="fp32"):
+    fp32_rate = results.get(fp32_key, {}).get("articles_per_s")
+    print(f"\n{'backend':<10} {'load(s)':>8} {'art/s':>8} {'speedup':>8} {'peakRSS(MB)':>12} {'F1 vs fp32':>11} {'min F1':>7}")
+    for backend, stats in results.items():
+        if "skipped" in stats:
+            print(f"{backend:<10} 건너뜀: {stats['skipped']}")
+            continue
+        speedup = f"{stats['articles_per_s'] / fp32_rate:.2f}x" if fp32_rate and stats["articles_per_s"] else "-"
+        f1 = stats.get("quality_f1")
+        min_f1 = stats.get("quality_f1_min")
+        print(f"{backend:<10} {stats['model_load_s']:>8.1f} {stats['articles_per_s']:>8.2f} {speedup:>8} "
+              f"{stats['peak_rss_mb']:>12.0f} {f1 if f1 is not None else '-':>11} {min_f1 if min_f1 is not None else '-':>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요약 모델 추론 백엔드 품질·처리량·메모리 비교")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--input", help="비교에 사용할 보고서 CSV (기본: 합성 기사 고정 세트)")
+    parser.add_argument("--articles", type=int, default=32, help="비교할 기사 수")
+    parser.add_argument("--model", default=SUMMARIZER_MODEL)
+    parser.add_argument("--distilled-model", default=SUMMARIZER_DISTILLED_MODEL)
+    parser.add_argument("--batch-size", type=int, default=SUMMARY_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=SUMMARY_NUM_THREADS, help="연산 스레드 수 (기본: 전체 코어)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    article_texts = load_texts(args.input, args.articles)
+    print(f"비교 기사 {len(article_texts)}건, 배치 크기 {args.batch_size}")
+    backend_results = compare_backends(article_texts, args.backends, args.model, args.distilled_model,
+                                       args.batch_size, args.threads, args.repeat)
+    print_table(backend_results)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "cpu_count": os.cpu_count(),
+        "params": {"input": args.input or "synthetic", "articles": len(article_texts), "model": args.model,
+                   "distilled_model": args.distilled_model, "batch_size": args.batch_size, "threads": args.threads},
+        "backends": backend_results,
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"{report['revision']}_summarizer_backends.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output_path}")
@@ -0,0 +1,134 @@
+# benchmarks/feed_server.py
+# 가상 피드를 지연·오류를 섞어 제공하는 로컬 HTTP 서버 (피드 수집 벤치마크 및 수동 테스트용)
+
+import argparse
+import gzip
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic_feeds import generate_feeds
+
+
+class FeedServer:
+    """
+    /feeds/<이름>.xml 경로로 피드를 제공하는 스레드 서버.
+    latency: 응답 전 지연(초, ±jitter 비율), error_rate: 500 응답 비율, timeout_rate: timeout_delay 만큼 멈추는 응답 비율.
+    ETag / If-None-Match 를 지원하여 조건부 GET(304) 경로도 측정 가능
+    """
+
+    def __init__(self, feeds, host="127.0.0.1", port=0, latency=0.0, jitter=0.5, error_rate=0.0,
+                 timeout_rate=0.0, timeout_delay=30.0, gzip_enabled=True, seed=0):
+        self.feeds = {}
+        for name, _, xml, _ in feeds:
+            body = xml.encode("utf-8")
+            self.feeds[name] = (body, gzip.compress(body), '"' + hashlib.sha1(body).hexdigest() + '"')
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.gzip_enabled = gzip_enabled
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self):
+        return [f"{self.base_url}/feeds/{name}.xml" for name in self.feeds]
+
+    def _roll(self):
+        with self._rng_lock:
+            self.requests += 1
+            return self._rng.random(), self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                roll, scale = server._roll()
+                name = self.path.rsplit("/", 1)[-1].split("?", 1)[0].removesuffix(".xml")
+                if server.latency:
+                    time.sleep(server.latency * scale)
+                if roll < server.timeout_rate:
+                    time.sleep(server.timeout_delay)
+                if name not in server.feeds:
+                    self.send_error(404)
+                    return
+                if roll < server.timeout_rate + server.error_rate:
+                    self.send_error(500, "synthetic failure")
+                    return
+
+                body, compressed, etag = server.feeds[name]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                use_gzip = server.gzip_enabled and "gzip" in (self.headers.get("Accept-Encoding") or "")
+                payload = compressed if use_gzip else body
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml; charset=utf-8")
+                self.send_header("ETag", etag)
+                if use_gzip:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 보안 뉴스 피드 서버")
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=100, help="피드당 기사 수")
+    parser.add_argument("--korean-ratio", type=float, default=0.4)
+    parser.add_argument("--latency", type=float, default=0.1, help="응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    feeds = generate_feeds(args.feeds, args.entries, korean_ratio=args.korean_ratio, seed=args.seed)
+    feed_server = FeedServer(feeds, port=args.port, latency=args.latency, error_rate=args.error_rate,
+                             timeout_rate=args.timeout_rate, seed=args.seed)
+    print(f"가상 피드 {len(feeds)}개 제공 중: {feed_server.base_url}/feeds/<이름>.xml (Ctrl+C 로 종료)")
+    for url in feed_server.urls():
+        print(f"  {url}")
+    feed_server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        feed_server.stop()
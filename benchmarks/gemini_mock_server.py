@@ -0,0 +1,175 @@
+# benchmarks/gemini_mock_server.py
+# Gemini generateContent REST API 를 흉내 내는 로컬 서버 (map-reduce 종합 인사이트의 수동 테스트·벤치마크용)
+#
+#   python -m benchmarks.gemini_mock_server --port 8766 --error-rate 0.2
+#   config.GEMINI_API_ENDPOINT = "http://127.0.0.1:8766" 로 두고 gemini_ai_trend_analyzer.py 실행
+#   (SDK 의 REST transport 는 스킴이 없는 주소에 https:// 를 붙이므로 http:// 를 반드시 포함.
+#    목 서버는 API 키를 확인하지 않지만 SDK 설정용으로 GEMINI_API_KEY 에 아무 값이나 넣어 둠)
+#
+# map-reduce 경로 전체를 목 서버로 실행하는 벤치마크: python -m benchmarks.run_benchmarks --stages gemini_map_reduce
+#
+# 응답 본문은 프롬프트 길이·첫 줄을 요약한 고정 형식 텍스트이며,
+# 할당량 초과(429 RESOURCE_EXHAUSTED)·컨텍스트 초과(400) 응답을 섞어 재시도·청크 분할 경로를 확인할 수 있습니다.
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import GEMINI_CHARS_PER_TOKEN
+
+
+class GeminiMockServer:
+    """
+    POST /v1beta/models/<모델>:generateContent 요청에 Gemini 형식 JSON 으로 응답하는 스레드 서버.
+    latency: 응답 전 지연(초), error_rate: 429 할당량 오류 응답 비율,
+    max_prompt_tokens: 이보다 긴 프롬프트(문자 수 / GEMINI_CHARS_PER_TOKEN)는 400 오류 (None 이면 제한 없음).
+    받은 프롬프트는 prompts 목록에 기록됩니다.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, error_rate=0.0, max_prompt_tokens=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_prompt_tokens = max_prompt_tokens
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.prompts = []
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def endpoint(self):
+        """GEMINI_API_ENDPOINT 에 넣을 주소 (평문 HTTP 이므로 http:// 스킴 포함)"""
+        return self.base_url
+
+    def generate_url(self, model="gemini-1.5-flash"):
+        return f"{self.base_url}/v1beta/models/{model}:generateContent"
+
+    def generate(self, prompt, model="gemini-1.5-flash", timeout=30):
+        """
+        SDK 없이 REST 로 generateContent 를 호출하여 응답 텍스트 반환 (map_reduce_insight 의 generate 로 사용).
+        오류 응답은 상태 코드와 본문을 담은 RuntimeError 로 올려 is_retryable_error 가 429 를 재시도하도록 함
+        """
+        body = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode("utf-8")
+        request = urllib.request.Request(self.generate_url(model), data=body,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                data = json.load(response)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"{e.code} {e.read().decode('utf-8', 'replace')}") from e
+        return data["candidates"][0]["content"]["parts"][0]["text"]
+
+    @staticmethod
+    def mock_text(prompt):
+        """프롬프트에 대한 결정적인 가짜 분석 텍스트"""
+        first_line = next((line for line in prompt.splitlines() if line.strip()), "")[:80]
+        return (f"1. Mock Trend\n"
+                f"Mock analysis of a {len(prompt)}-character prompt ({prompt.count('--- Article')} articles, "
+                f"{prompt.count('--- Partial Analysis')} partial analyses).\n"
+                f"First line: {first_line}")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, body):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_error(self, code, status, message):
+                self._send_json(code, {"error": {"code": code, "status": status, "message": message}})
+
+            def do_POST(self):
+                path = self.path.split("?", 1)[0]
+                if not path.endswith(":generateContent"):
+                    self._send_error(404, "NOT_FOUND", "not found")
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    request = json.loads(self.rfile.read(length).decode("utf-8"))
+                    prompt = "".join(part.get("text", "") for content in request["contents"]
+                                     for part in content.get("parts", []))
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    self._send_error(400, "INVALID_ARGUMENT", f"invalid request: {e}")
+                    return
+
+                with server._lock:
+                    roll = server._rng.random()
+                    server.prompts.append(prompt)
+                if server.latency:
+                    time.sleep(server.latency)
+
+                prompt_tokens = int(len(prompt) / GEMINI_CHARS_PER_TOKEN) + 1
+                if roll < server.error_rate:
+                    self._send_error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).")
+                    return
+                if server.max_prompt_tokens and prompt_tokens > server.max_prompt_tokens:
+                    self._send_error(400, "INVALID_ARGUMENT",
+                                     f"The input token count ({prompt_tokens}) exceeds the maximum number of tokens "
+                                     f"allowed ({server.max_prompt_tokens}).")
+                    return
+
+                text = server.mock_text(prompt)
+                output_tokens = int(len(text) / GEMINI_CHARS_PER_TOKEN) + 1
+                self._send_json(200, {
+                    "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                                    "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens,
+                                      "totalTokenCount": prompt_tokens + output_tokens},
+                })
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gemini generateContent 로컬 목 서버")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.2, help="응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 할당량 오류 응답 비율")
+    parser.add_argument("--max-prompt-tokens", type=int, help="이보다 긴 프롬프트는 400 오류")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock_server = GeminiMockServer(port=args.port, latency=args.latency, error_rate=args.error_rate,
+                                   max_prompt_tokens=args.max_prompt_tokens, seed=args.seed)
+    print(f"Gemini 목 서버 실행 중: {mock_server.generate_url()} (Ctrl+C 로 종료)")
+    print(f"  config.GEMINI_API_ENDPOINT = \"{mock_server.endpoint}\" (GEMINI_API_KEY 는 아무 값이나 가능)")
+    mock_server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock_server.stop()
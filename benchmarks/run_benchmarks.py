@@ -0,0 +1,420 @@
+# benchmarks/run_benchmarks.py
+# 단계별 성능 벤치마크 (피드 수집·파싱, 발행일 정규화, 키워드 필터, 중복 제거, 주간 취합, 요약, Gemini map-reduce) 실행 및 커밋 간 결과 비교
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.run_benchmarks --scale small
+#   python -m benchmarks.run_benchmarks --stages fetch_parse keyword_filter --repeat 5
+#   python -m benchmarks.run_benchmarks --compare benchmarks/results/<이전>.json benchmarks/results/<현재>.json
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from benchmarks.feed_server import FeedServer
+from benchmarks.synthetic_feeds import generate_article_rows, generate_feeds
+from config import SECURITY_KEYWORDS, SUMMARY_BATCH_SIZE
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+
+# 작은 무작위 가중치 모델: 요약 품질이 아니라 배치·토크나이즈·생성 경로의 오버헤드를 측정
+TINY_SUMMARIZER_MODEL = "sshleifer/bart-tiny-random"
+
+# Gemini map-reduce 벤치마크의 청크 토큰 예산 (청크 여러 개 + 중간 합치기가 생기도록 실제 설정보다 작게)
+GEMINI_BENCH_TOKEN_BUDGET = 4000
+
+SCALES = {
+    "small": {"feeds": 10, "entries": 50, "articles": 2000, "summaries": 16, "gemini_articles": 200},
+    "medium": {"feeds": 40, "entries": 150, "articles": 20000, "summaries": 64, "gemini_articles": 1000},
+    "large": {"feeds": 100, "entries": 300, "articles": 100000, "summaries": 256, "gemini_articles": 4000},
+}
+
+STAGES = ["fetch_parse", "date_parse", "collect", "keyword_filter", "dedupe", "weekly_aggregation", "summarization",
+          "gemini_map_reduce"]
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """config.py 의 상대 경로(DATA_DIR 등)가 임시 폴더를 가리키도록 작업 폴더를 잠시 변경"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+
+
+def measure(run, repeat, setup=None, items=None):
+    """
+    run(state) 를 repeat 회 실행하여 소요 시간(초)을 기록. setup() 의 반환값이 state 로 전달되며 측정에서 제외됨.
+    마지막 실행의 반환값과 함께 통계 dict 를 반환
+    """
+    runs, result = [], None
+    for _ in range(repeat):
+        state = setup() if setup else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = run(state)
+            runs.append(time.perf_counter() - start)
+    median = statistics.median(runs)
+    stats = {"median_s": round(median, 6), "min_s": round(min(runs), 6), "runs_s": [round(r, 6) for r in runs]}
+    if items is not None:
+        stats["items"] = items
+        stats["items_per_s"] = round(items / median, 2) if median else None
+    return stats, result
+
+
+def bench_fetch_parse(params, workdir):
+    """로컬 피드 서버에서 동시 수집 + feedparser 파싱 (최초 수집 / ETag 304 재수집)"""
+    from feed_fetcher import fetch_feeds, save_fetch_cache
+
+    feeds = generate_feeds(params["feeds"], params["entries"], seed=params["seed"])
+    with FeedServer(feeds, latency=params["latency"], error_rate=params["error_rate"], seed=params["seed"]) as server:
+        urls = server.urls()
+        cold, results = measure(lambda _: fetch_feeds(urls, cache_path=None), params["repeat"])
+        parsed = [r for r in results if r.parsed is not None]
+        cold.update({
+            "items": sum(len(r.parsed.entries) for r in parsed),
+            "feeds": len(urls),
+            "failed_feeds": len(urls) - len(parsed),
+            "bytes": sum(r.nbytes for r in parsed),
+        })
+        cold["items_per_s"] = round(cold["items"] / cold["median_s"], 2)
+
+        cache_path = os.path.join(workdir, "feed_cache.json")
+        save_fetch_cache(results, cache_path)
+        warm, results = measure(lambda _: fetch_feeds(urls, cache_path=cache_path), params["repeat"])
+        warm.update({"feeds": len(urls), "not_modified": sum(r.not_modified for r in results)})
+    return {"fetch_parse_cold": cold, "fetch_parse_warm": warm}
+
+
+def bench_date_parse(params, workdir):
+    """피드별 형식 캐시를 쓰는 발행일 정규화 (feedparser 가 만든 published / published_parsed 입력)"""
+    import feedparser
+    from date_normalizer import DateNormalizer
+
+    feeds = generate_feeds(params["feeds"], params["entries"], seed=params["seed"])
+    inputs = []
+    for name, _, xml, _ in feeds:
+        for entry in feedparser.parse(xml).entries:
+            inputs.append((name, entry.get("published"), entry.get("published_parsed")))
+
+    def run(normalizer):
+        return [normalizer.normalize(*item) for item in inputs]
+
+    stats, results = measure(run, params["repeat"], setup=lambda: DateNormalizer(cache_path=None), items=len(inputs))
+    stats["unparsed"] = sum(1 for parsed, _ in results if parsed is None)
+    return {"date_parse": stats}
+
+
+def bench_collect(params, workdir):
+    """collect_daily_news 전체 경로 (수집 → 날짜 파싱 → 정제·키워드 필터 → 색인·CSV·아카이브 저장)"""
+    from daily_news_collector import collect_daily_news
+
+    feeds = generate_feeds(params["feeds"], params["entries"], seed=params["seed"])
+    runs = iter(range(params["repeat"]))
+
+    def setup():
+        # 매 실행마다 빈 저장소에서 시작 (이전 실행의 색인·ETag 캐시가 결과를 바꾸지 않도록)
+        path = os.path.join(workdir, f"collect_{next(runs)}")
+        os.makedirs(path)
+        return path
+
+    with FeedServer(feeds, latency=params["latency"], error_rate=params["error_rate"], seed=params["seed"]) as server:
+        urls = server.urls()
+
+        def run(path):
+            with working_directory(path):
+                return collect_daily_news(urls)
+
+        stats, new_df = measure(run, params["repeat"], setup=setup,
+                                items=sum(len(entries) for _, _, _, entries in feeds))
+    stats["stored"] = len(new_df)
+    return {"collect": stats}
+
+
+def _raw_articles(params, max_age_days=1.5):
+    rows = generate_article_rows(params["articles"], seed=params["seed"], max_age_days=max_age_days)
+    return pd.DataFrame(rows)
+
+
+def bench_keyword_filter(params, workdir):
+    """HTML 정제 + 키워드 매칭 + 언어 판정 (filter_relevant)"""
+    from daily_news_collector import filter_relevant
+
+    raw = _raw_articles(params)
+    stats, relevant = measure(lambda _: filter_relevant(raw, SECURITY_KEYWORDS), params["repeat"], items=len(raw))
+    stats["hit_rate"] = round(len(relevant) / len(raw), 4) if len(raw) else None
+    return {"keyword_filter": stats}
+
+
+def bench_dedupe(params, workdir):
+    """색인 기반 정확 중복 제거(NewsStore.append) 와 MinHash 유사 중복 클러스터링"""
+    from daily_news_collector import filter_relevant
+    from near_duplicate import cluster_near_duplicates
+    from news_store import NewsStore
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        relevant = filter_relevant(_raw_articles(params), SECURITY_KEYWORDS)
+    records = relevant.to_dict("records")
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    runs = iter(range(params["repeat"]))
+
+    def fresh_store():
+        path = os.path.join(workdir, f"store_{next(runs)}")
+        os.makedirs(path)
+        return NewsStore(path, os.path.join(path, "index.sqlite3"))
+
+    def append(store):
+        with store:
+            return store.append(records, date_str)
+
+    new_stats, _ = measure(append, params["repeat"], setup=fresh_store, items=len(records))
+
+    # 모든 기사가 이미 색인에 있는 경우 (하루 여러 번 수집할 때의 일반적인 상황)
+    seen_path = os.path.join(workdir, "store_seen")
+    os.makedirs(seen_path)
+    with NewsStore(seen_path, os.path.join(seen_path, "index.sqlite3")) as store:
+        store.append(records, date_str)
+        seen_stats, _ = measure(lambda _: store.append(records, date_str), params["repeat"], items=len(records))
+
+    near_stats, clustered = measure(lambda _: cluster_near_duplicates(relevant), params["repeat"], items=len(relevant))
+    if len(clustered):
+        near_stats["cluster_ratio"] = round(float(clustered["IsRepresentative"].sum()) / len(clustered), 4)
+    return {"dedupe_store_new": new_stats, "dedupe_store_seen": seen_stats, "dedupe_near_duplicate": near_stats}
+
+
+def bench_weekly_aggregation(params, workdir):
+    """7일치 아카이브에서 주간 보고서 생성 (파티션 읽기 + 중복 제거 + 클러스터링 + CSV 저장)"""
+    from daily_news_collector import filter_relevant
+    from news_archive import append_to_archive
+    from weekly_report_generator import build_report, generate_report
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        relevant = filter_relevant(_raw_articles(params, max_age_days=7), SECURITY_KEYWORDS)
+
+    path = os.path.join(workdir, "weekly")
+    os.makedirs(path)
+    with working_directory(path):
+        append_to_archive(relevant)
+        end_date = datetime.now() + timedelta(days=1)
+        load_stats, loaded = measure(lambda _: build_report(7, end_date), params["repeat"], items=len(relevant))
+        report_stats, _ = measure(lambda _: generate_report("weekly", end_date=end_date, export_format="csv"),
+                                  params["repeat"], items=len(loaded))
+    return {"weekly_load": load_stats, "weekly_report": report_stats}
+
+
+def bench_summarization(params, workdir):
+    """작은 대체 모델로 길이 버킷 배치 요약 경로 측정 (transformers 가 없으면 건너뜀)"""
+    try:
+        from transformers import pipeline
+    except ImportError:
+        return {"summarization": {"skipped": "transformers 가 설치되어 있지 않음"}}
+    from ai_trend_analyzer import prepare_articles, summarize_batched
+    from daily_news_collector import filter_relevant
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        relevant = filter_relevant(_raw_articles(params), SECURITY_KEYWORDS)
+        texts = [item["input_text"] for item in prepare_articles(relevant)][:params["summaries"]]
+
+    start = time.perf_counter()
+    try:
+        summarizer = pipeline("summarization", model=params["summarizer_model"], device=-1)
+    except Exception as e:
+        return {"summarization": {"skipped": f"모델 로드 실패: {e}"}}
+    load_s = time.perf_counter() - start
+
+    stats, _ = measure(lambda _: summarize_batched(summarizer, texts, params["batch_size"]), params["repeat"],
+                       items=len(texts))
+    stats.update({"model": params["summarizer_model"], "model_load_s": round(load_s, 6),
+                  "batch_size": params["batch_size"]})
+    return {"summarization": stats}
+
+
+def bench_gemini_map_reduce(params, workdir):
+    """
+    로컬 Gemini 목 서버로 map-reduce 종합 인사이트 전체 경로 (청크 분할 → 동시 map → 중간 합치기 → reduce).
+    처음부터 실행한 경우와, map 도중 중단된 실행의 체크포인트에서 이어서 실행한 경우를 각각 측정
+    """
+    from benchmarks.gemini_mock_server import GeminiMockServer
+    from daily_news_collector import filter_relevant
+    from gemini_ai_trend_analyzer import build_reduce_prompt
+    from gemini_map_reduce import RateLimiter, chunk_articles, map_reduce_insight
+    from text_preprocessing import build_article_blocks
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        relevant = filter_relevant(_raw_articles(params), SECURITY_KEYWORDS)
+    relevant = relevant.head(params["gemini_articles"]).reset_index(drop=True)
+    texts = build_article_blocks(pd.Series(relevant.index + 1), relevant["Title"], relevant["Summary"]).tolist()
+    budget = GEMINI_BENCH_TOKEN_BUDGET
+    chunks = len(chunk_articles(texts, budget))
+    checkpoint_dirs = (os.path.join(workdir, f"checkpoints_{i}") for i in itertools.count())
+
+    # 프롬프트가 예산을 넘으면 목 서버가 400 으로 응답하여 벤치마크가 실패함
+    with GeminiMockServer(latency=params["latency"], max_prompt_tokens=budget, seed=params["seed"]) as server:
+        def run_from(checkpoint_dir, generate=server.generate):
+            sent = []
+
+            def counted(prompt):
+                sent.append(prompt)
+                return generate(prompt)
+
+            map_reduce_insight(texts, counted, build_reduce_prompt, token_budget=budget,
+                               rate_limiter=RateLimiter(requests_per_minute=0), checkpoint_dir=checkpoint_dir)
+            if os.listdir(checkpoint_dir):
+                raise RuntimeError("성공한 실행 뒤에 체크포인트 파일이 남아 있습니다.")
+            return len(sent)
+
+        def interrupted():
+            """map 요청 절반만 성공하고 중단된 실행의 체크포인트 폴더를 만듦"""
+            checkpoint_dir = next(checkpoint_dirs)
+            calls = itertools.count()
+
+            def failing(prompt):
+                if next(calls) >= chunks // 2:
+                    raise RuntimeError("interrupted")
+                return server.generate(prompt)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    map_reduce_insight(texts, failing, build_reduce_prompt, token_budget=budget,
+                                       rate_limiter=RateLimiter(requests_per_minute=0), checkpoint_dir=checkpoint_dir)
+                except RuntimeError:
+                    pass
+            return checkpoint_dir
+
+        cold, cold_requests = measure(run_from, params["repeat"], setup=lambda: next(checkpoint_dirs),
+                                      items=len(texts))
+        resumed, resumed_requests = measure(run_from, params["repeat"], setup=interrupted, items=len(texts))
+
+    cold.update({"chunks": chunks, "requests": cold_requests, "token_budget": budget})
+    resumed.update({"chunks": chunks, "requests": resumed_requests})
+    return {"gemini_map_reduce_cold": cold, "gemini_map_reduce_resumed": resumed}
+
+
+BENCHMARKS = {
+    "fetch_parse": bench_fetch_parse,
+    "date_parse": bench_date_parse,
+    "collect": bench_collect,
+    "keyword_filter": bench_keyword_filter,
+    "dedupe": bench_dedupe,
+    "weekly_aggregation": bench_weekly_aggregation,
+    "summarization": bench_summarization,
+    "gemini_map_reduce": bench_gemini_map_reduce,
+}
+
+
+def git_revision():
+    """현재 커밋 (작업 트리에 변경이 있으면 -dirty 표시)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def run_benchmarks(stages, params):
+    """선택한 단계를 순서대로 실행하여 결과 dict 반환"""
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+        "stages": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="news_bench_") as workdir:
+        for stage in stages:
+            print(f"▶ {stage} ...")
+            stage_dir = os.path.join(workdir, stage)
+            os.makedirs(stage_dir)
+            for name, stats in BENCHMARKS[stage](params, stage_dir).items():
+                results["stages"][name] = stats
+                if "skipped" in stats:
+                    print(f"  {name}: 건너뜀 ({stats['skipped']})")
+                else:
+                    rate = f", {stats['items_per_s']:.1f}건/초" if stats.get("items_per_s") else ""
+                    print(f"  {name}: {stats['median_s'] * 1000:.1f} ms (중앙값){rate}")
+    return results
+
+
+def save_results(results, output_dir=RESULTS_DIR):
+    """결과를 <커밋>_<규모>.json 으로 저장하고 경로 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{results['revision']}_{results['params']['scale']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare_results(base_path, new_path, threshold=0.10):
+    """
+    두 결과 파일의 단계별 중앙값을 비교하여 출력. threshold 이상 느려진 단계 이름 목록을 반환
+    """
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"기준: {base['revision']} ({base['timestamp']})  →  비교: {new['revision']} ({new['timestamp']})")
+    if base["params"] != new["params"]:
+        print("⚠️ 두 결과의 벤치마크 설정(params)이 다릅니다. 수치를 직접 비교할 수 없을 수 있습니다.")
+
+    regressions = []
+    print(f"{'stage':<26}{'base ms':>12}{'new ms':>12}{'change':>10}")
+    for name, new_stats in new["stages"].items():
+        base_stats = base["stages"].get(name)
+        if not base_stats or "median_s" not in base_stats or "median_s" not in new_stats:
+            print(f"{name:<26}{'-':>12}{'-':>12}{'n/a':>10}")
+            continue
+        change = new_stats["median_s"] / base_stats["median_s"] - 1 if base_stats["median_s"] else 0.0
+        flag = ""
+        if change >= threshold:
+            regressions.append(name)
+            flag = "  ▲ 느려짐"
+        elif change <= -threshold:
+            flag = "  ▼ 빨라짐"
+        print(f"{name:<26}{base_stats['median_s'] * 1000:>12.1f}{new_stats['median_s'] * 1000:>12.1f}"
+              f"{change:>+10.1%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보안 뉴스 파이프라인 단계별 벤치마크")
+    parser.add_argument("--scale", default="small", choices=sorted(SCALES))
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="가상 피드 서버 응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="가상 피드 서버 오류 응답 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=SUMMARY_BATCH_SIZE)
+    parser.add_argument("--summarizer-model", default=TINY_SUMMARIZER_MODEL)
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="두 결과 JSON 비교")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 판단할 중앙값 증가 비율")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare_results(*args.compare, threshold=args.threshold) else 0)
+
+    params = dict(SCALES[args.scale], scale=args.scale, repeat=args.repeat, latency=args.latency,
+                  error_rate=args.error_rate, seed=args.seed, batch_size=args.batch_size,
+                  summarizer_model=args.summarizer_model)
+    results = run_benchmarks(args.stages, params)
+    print(f"결과 저장: {save_results(results, args.output_dir)}")
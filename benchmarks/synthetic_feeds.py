@@ -0,0 +1,188 @@
+# benchmarks/synthetic_feeds.py
+# 벤치마크용 가상 RSS / Atom 피드 생성기 (한국어·영어 기사, 제각각인 날짜 형식, HTML 섞인 요약)
+
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+KST = timezone(timedelta(hours=9))
+
+EN_KEYWORDS = ["Ransomware", "Zero-day", "Vulnerability", "Exploit", "Phishing", "Malware", "Data Breach",
+               "DDoS", "Supply Chain Attack", "Security Update", "Patch", "CISA", "Cloud Security", "APT"]
+KO_KEYWORDS = ["랜섬웨어", "제로데이", "취약점", "익스플로잇", "피싱", "악성코드", "정보유출",
+               "디도스", "공급망 공격", "보안 업데이트", "패치", "해킹", "클라우드 보안", "개인정보보호"]
+
+EN_WORDS = ("company customers report attackers network systems researchers released update users data "
+            "service government agency software version servers access critical group campaign warning "
+            "analysis infrastructure credentials million affected investigation incident security team").split()
+KO_WORDS = ("기업 고객 공격자 네트워크 시스템 연구진 발표 업데이트 사용자 데이터 서비스 정부 기관 소프트웨어 "
+            "버전 서버 접근 주요 그룹 캠페인 경고 분석 인프라 계정 수백만 피해 조사 사고 보안팀 당국 확인").split()
+
+
+def _pseudo_words(lang, count=600, seed=12345):
+    """실제 기사처럼 어휘가 다양하도록 임의 음절을 조합한 단어 (고유명사·제품명 역할)"""
+    rng = random.Random(seed)
+    if lang == "ko":
+        syllables = [chr(rng.randrange(0xAC00, 0xD7A4)) for _ in range(300)]
+        return ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(count)]
+    consonants, vowels = "bcdfghklmnprstvz", "aeiou"
+    return ["".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(rng.randint(2, 4)))
+            for _ in range(count)]
+
+
+EN_WORDS += _pseudo_words("en")
+KO_WORDS += _pseudo_words("ko")
+EN_SOURCES = ["example-security.com", "threat-news.example.org", "cyber-daily.example.net"]
+KO_SOURCES = ["boannews.com", "dailysecu.com", "etnews.com"]
+
+# 실제 피드에서 보이는 날짜 표기 (일부는 feedparser 가 해석하지 못해 dateutil 경로나 '오늘'로 대체됨)
+DATE_STYLES = ("rfc822", "rfc822_kst", "rfc822_gmt", "iso", "iso_naive", "naive", "korean", "missing")
+
+
+def format_date(dt, style):
+    """published 문자열을 지정한 스타일로 표기 (missing 이면 None)"""
+    if style == "rfc822":
+        return format_datetime(dt.astimezone(timezone.utc))
+    if style == "rfc822_kst":
+        return format_datetime(dt.astimezone(KST))
+    if style == "rfc822_gmt":
+        return dt.astimezone(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    if style == "iso":
+        return dt.astimezone(KST).isoformat()
+    if style == "iso_naive":
+        return dt.astimezone(KST).strftime("%Y-%m-%dT%H:%M:%S")
+    if style == "naive":
+        return dt.astimezone(KST).strftime("%Y-%m-%d %H:%M:%S")
+    if style == "korean":
+        return dt.astimezone(KST).strftime("%Y년 %m월 %d일 %H:%M")
+    return None
+
+
+def _sentence(rng, words, keyword=None, length=12):
+    picked = [rng.choice(words) for _ in range(length)]
+    if keyword:
+        picked.insert(rng.randrange(len(picked) + 1), keyword)
+    return " ".join(picked)
+
+
+def _messy_html(rng, text, link):
+    """요약에 태그·엔티티·불규칙한 공백을 섞음"""
+    parts = text.split(" ")
+    cut = rng.randrange(1, len(parts))
+    head, tail = " ".join(parts[:cut]), " ".join(parts[cut:])
+    style = rng.randrange(4)
+    if style == 0:
+        return f"<p>{head}</p>\n\n<p>{tail} &amp; more</p>"
+    if style == 1:
+        return f'<div class="summary">{head} <a href="{link}">{tail}</a>&nbsp;&hellip;</div>'
+    if style == 2:
+        return f"{head}<br/>\t{tail}<img src=\"{link}/img.png\" />"
+    return f"  {head}   {tail}  "
+
+
+def generate_entries(count, lang="en", seed=0, now=None, max_age_days=3.0, keyword_ratio=0.6, dup_ratio=0.1):
+    """
+    가상 기사 count 건을 dict 목록으로 생성.
+    keyword_ratio: 보안 키워드가 들어간 기사 비율, dup_ratio: 앞선 기사를 조금 고쳐 다시 쓴 유사 중복 기사 비율.
+    각 dict 는 title, link, summary(HTML), published(문자열 또는 None), published_dt, date_style 를 가짐
+    """
+    rng = random.Random(f"{lang}-{seed}")
+    now = now or datetime.now(timezone.utc)
+    words, keywords = (KO_WORDS, KO_KEYWORDS) if lang == "ko" else (EN_WORDS, EN_KEYWORDS)
+    sources = KO_SOURCES if lang == "ko" else EN_SOURCES
+
+    entries = []
+    for i in range(count):
+        published_dt = now - timedelta(seconds=rng.uniform(0, max_age_days * 86400))
+        if entries and rng.random() < dup_ratio:
+            # 다른 매체가 같은 사건을 살짝 다르게 보도한 경우
+            original = rng.choice(entries)
+            title = original["title"] + " " + rng.choice(words)
+            text = original["text"].replace(rng.choice(words), rng.choice(words), 1)
+        else:
+            keyword = rng.choice(keywords) if rng.random() < keyword_ratio else None
+            title = _sentence(rng, words, keyword, length=rng.randint(5, 9))
+            text = " ".join(_sentence(rng, words, keyword if j == 0 else None, length=rng.randint(10, 20))
+                            for j in range(rng.randint(2, 5)))
+
+        link = f"https://{rng.choice(sources)}/news/{lang}/{seed}/{i}?utm_source=rss"
+        date_style = rng.choice(DATE_STYLES)
+        entries.append({
+            "title": title,
+            "link": link,
+            "text": text,
+            "summary": _messy_html(rng, text, link),
+            "published": format_date(published_dt, date_style),
+            "published_dt": published_dt,
+            "date_style": date_style,
+        })
+    return entries
+
+
+def render_rss(entries, title="Synthetic Security Feed", link="https://example.com/"):
+    """RSS 2.0 문서 문자열 생성 (요약은 CDATA 로 감쌈)"""
+    items = []
+    for entry in entries:
+        date_tag = f"<pubDate>{escape(entry['published'])}</pubDate>" if entry["published"] else ""
+        summary = entry["summary"].replace("]]>", "]]]]><![CDATA[>")
+        items.append(
+            f"<item><title>{escape(entry['title'])}</title><link>{escape(entry['link'])}</link>"
+            f"<description><![CDATA[{summary}]]></description>{date_tag}"
+            f"<guid>{escape(entry['link'])}</guid></item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+            f"<title>{escape(title)}</title><link>{escape(link)}</link><description>benchmark</description>"
+            + "".join(items) + "</channel></rss>")
+
+
+def render_atom(entries, title="Synthetic Security Feed", link="https://example.com/"):
+    """Atom 1.0 문서 문자열 생성 (요약은 escape 된 HTML)"""
+    items = []
+    for entry in entries:
+        date_tag = f"<published>{escape(entry['published'])}</published>" if entry["published"] else ""
+        items.append(
+            f"<entry><title>{escape(entry['title'])}</title><link href=\"{escape(entry['link'])}\"/>"
+            f"<id>{escape(entry['link'])}</id>{date_tag}"
+            f"<summary type=\"html\">{escape(entry['summary'])}</summary></entry>"
+        )
+    return ('<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">'
+            f"<title>{escape(title)}</title><link href=\"{escape(link)}\"/><id>{escape(link)}</id>"
+            + "".join(items) + "</feed>")
+
+
+def generate_feeds(num_feeds, entries_per_feed, korean_ratio=0.4, atom_ratio=0.3, seed=0, now=None, **entry_kwargs):
+    """
+    피드 num_feeds 개를 생성하여 [(이름, 언어, XML 문자열, 기사 목록), ...] 반환.
+    korean_ratio 비율은 한국어 피드, atom_ratio 비율은 Atom 형식으로 생성
+    """
+    rng = random.Random(seed)
+    feeds = []
+    for i in range(num_feeds):
+        lang = "ko" if rng.random() < korean_ratio else "en"
+        entries = generate_entries(entries_per_feed, lang=lang, seed=seed * 100003 + i, now=now, **entry_kwargs)
+        render = render_atom if rng.random() < atom_ratio else render_rss
+        feeds.append((f"feed{i}", lang, render(entries, title=f"Synthetic {lang} feed {i}"), entries))
+    return feeds
+
+
+def generate_article_rows(count, korean_ratio=0.4, seed=0, now=None, **entry_kwargs):
+    """
+    수집기가 피드에서 만드는 것과 같은 형태(Date, Time, Title, Link, Summary, Source)의 원본 기사 행 목록 생성.
+    키워드 필터·중복 제거·보고서 단계 벤치마크의 입력으로 사용
+    """
+    korean_count = int(count * korean_ratio)
+    rows = []
+    for lang, n in (("ko", korean_count), ("en", count - korean_count)):
+        for entry in generate_entries(n, lang=lang, seed=seed, now=now, **entry_kwargs):
+            published = entry["published_dt"].astimezone(KST)
+            source = entry["link"].split("/")[2]
+            rows.append({
+                "Date": published.strftime("%Y-%m-%d"),
+                "Time": published.strftime("%H:%M:%S"),
+                "Title": entry["title"],
+                "Link": entry["link"],
+                "Summary": entry["summary"],
+                "Source": f"https://{source}/rss",
+            })
+    return rows
@@ -53,4 +53,122 @@ WEEKLY_REPORT_DIR = "weekly_reports"
 WEEKLY_REPORT_DAYS = 7
 
 # 3단계: AI 분석 보고서 저장 경로 (현재 스크립트 파일이 있는 폴더 기준)
-AI_ANALYSIS_REPORT_DIR = "ai_analysis_reports"
\ No newline at end of file
+AI_ANALYSIS_REPORT_DIR = "ai_analysis_reports"
+
+# 1단계: 피드 동시 수집 설정
+# 동시에 요청할 최대 피드 수와 피드별 타임아웃(초). 한 피드가 느려도 전체 수집이 timeout 이상 지연되지 않음
+FEED_FETCH_MAX_WORKERS = 8
+FEED_FETCH_TIMEOUT = 20
+
+# 1단계: 피드별 ETag / Last-Modified 캐시 파일 (변경되지 않은 피드는 304 응답으로 파싱을 건너뜀)
+FEED_CACHE_FILE = f"{DATA_DIR}/feed_cache.json"
+
+# 1단계: 저장된 기사 ID(정규화 URL 해시) 색인. 이미 저장한 기사는 일별 CSV 에 다시 쓰지 않음
+ARTICLE_INDEX_DB = f"{DATA_DIR}/article_index.sqlite3"
+
+# 2단계: 발행일별로 파티션된 Parquet 아카이브 경로 (보고서는 필요한 날짜 파티션과 컬럼만 읽음)
+ARCHIVE_DIR = f"{DATA_DIR}/archive"
+# 시간별 수집으로 한 날짜 파티션의 Parquet 파일이 이 개수 이상 쌓이면 수집기가 하나로 합침
+ARCHIVE_COMPACT_MIN_PARTS = 24
+
+# 2단계: 보고서 종류별 취합 기간 (일)
+REPORT_WINDOWS = {
+    "weekly": WEEKLY_REPORT_DAYS,
+    "monthly": 30,
+    "quarterly": 90,
+}
+
+# 2단계: 유사 중복 기사(같은 사건을 다른 매체가 보도) 클러스터링 설정 (MinHash LSH)
+# THRESHOLD: 같은 사건으로 볼 추정 Jaccard 유사도, BANDS x (NUM_PERM / BANDS) 행으로 LSH 버킷 구성
+NEAR_DUP_THRESHOLD = 0.5
+NEAR_DUP_NUM_PERM = 64
+NEAR_DUP_BANDS = 16
+NEAR_DUP_SHINGLE_SIZE = 4
+
+# 3단계: 요약 모델 배치 추론 설정
+# BATCH_SIZE: 한 번에 모델에 넣을 기사 수 (토큰 길이가 비슷한 기사끼리 묶음)
+# NUM_THREADS: torch 연산 스레드 수 (None 이면 전체 CPU 코어 사용)
+# MAX_ARTICLES: 처리할 최대 기사 수 (None 이면 보고서 전체)
+SUMMARY_BATCH_SIZE = 8
+SUMMARY_NUM_THREADS = None
+SUMMARY_MAX_ARTICLES = None
+
+# 3단계: 다중 프로세스 분석 (sharded_analysis.py)
+# NUM_WORKERS: 요약·번역·언어 판정을 나누어 실행할 프로세스 수 (None 또는 1 이면 현재 프로세스에서 실행)
+# SHARDS_PER_WORKER: 워커당 shard 수 (부하 분산용), SHARD_MAX_RETRIES: 워커 장애 시 shard 재시도 횟수
+ANALYSIS_NUM_WORKERS = None
+ANALYSIS_SHARDS_PER_WORKER = 4
+ANALYSIS_SHARD_MAX_RETRIES = 2
+
+# 3단계: 영어 요약 모델
+SUMMARIZER_MODEL = "facebook/bart-large-cnn"
+
+# 3단계: 요약 모델 CPU 추론 백엔드 (summarizer_backends.py)
+# 'fp32' (원본), 'int8' (동적 양자화), 'onnx' (ONNX Runtime, optimum 필요), 'distilled' (DISTILLED_MODEL 사용)
+SUMMARIZER_BACKEND = "fp32"
+SUMMARIZER_DISTILLED_MODEL = "sshleifer/distilbart-cnn-12-6"
+SUMMARIZER_ONNX_DIR = f"{DATA_DIR}/onnx_models"
+
+# 3단계: 상주 요약 워커 (summarizer_worker.py). 워커가 떠 있으면 분석 실행 시 모델 로드 없이 워커에 요약을 요청
+SUMMARIZER_WORKER_HOST = "127.0.0.1"
+SUMMARIZER_WORKER_PORT = 8799
+SUMMARIZER_WORKER_TIMEOUT = 3600
+
+# 3단계: AI 인사이트·번역 결과 캐시 (본문 해시 기준). 크기 한도를 넘으면 오래 사용하지 않은 항목부터 삭제
+RESULT_CACHE_DB = f"{DATA_DIR}/result_cache.sqlite3"
+RESULT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# 3단계: Gemini 종합 인사이트 호출 설정
+# INSIGHT_MODE: 'auto' (예산 안이면 1회 호출, 넘치면 map-reduce), 'single', 'map_reduce'
+# CHUNK_TOKEN_BUDGET: 호출 1회에 넣을 최대 입력 토큰 수 (문자 수 / CHARS_PER_TOKEN 으로 추정)
+# MAP_CONCURRENCY: 동시에 실행할 map 호출 수, REQUESTS_PER_MINUTE: 분당 최대 요청 수
+# MAX_RETRIES / RETRY_BASE_DELAY: 할당량 오류 시 지수 백오프 재시도 횟수와 첫 대기 시간(초)
+GEMINI_INSIGHT_MODE = "auto"
+GEMINI_CHUNK_TOKEN_BUDGET = 200000
+GEMINI_CHARS_PER_TOKEN = 4
+GEMINI_MAP_CONCURRENCY = 4
+GEMINI_REQUESTS_PER_MINUTE = 15
+GEMINI_MAX_RETRIES = 5
+GEMINI_RETRY_BASE_DELAY = 2.0
+
+# 3단계: map-reduce 중간 결과 체크포인트 폴더 (실패 시 완료된 청크부터 이어서 실행)
+GEMINI_CHECKPOINT_DIR = f"{AI_ANALYSIS_REPORT_DIR}/gemini_checkpoints"
+
+# 3단계: Gemini API 주소 재지정 (None 이면 기본 주소, 테스트 시 로컬 목 서버 주소 예: "http://localhost:8766")
+GEMINI_API_ENDPOINT = None
+
+# 1단계: 국내 매체 피드 도메인 (언어 판정 시 한국어 사전 정보로 사용)
+KOREAN_FEED_DOMAINS = ["boannews.com", "dailysecu.com", "ahnlab.com", "estsecurity.com", "krcert.or.kr"]
+
+# 1단계: 언어 판정 기준 (한글 글자 / (한글 + 라틴 글자) 비율)
+# KO 이상이면 한국어, EN 이하이면 영어, 그 사이는 피드 출처 → langdetect 순으로 판정
+LANG_HANGUL_RATIO_KO = 0.3
+LANG_HANGUL_RATIO_EN = 0.05
+
+# 공통: 실행 지표(단계별 소요 시간·카운터) 저장 위치
+# METRICS_DIR: JSON 실행 보고서 폴더, METRICS_TEXTFILE_DIR: Prometheus textfile 폴더 (None 이면 METRICS_DIR 사용)
+METRICS_DIR = f"{DATA_DIR}/metrics"
+METRICS_TEXTFILE_DIR = None
+METRICS_PREFIX = "security_news"
+
+# 전체 파이프라인(수집 → 취합 → 분석) 실행 설정
+# CHECKPOINT_DIR: 단계별 결과 체크포인트 폴더 (실행 ID 별 하위 폴더), MAX_WORKERS: 동시에 실행할 단계 수
+PIPELINE_CHECKPOINT_DIR = f"{DATA_DIR}/pipeline_runs"
+PIPELINE_MAX_WORKERS = 2
+
+# 1단계: 피드별로 학습한 발행일 형식 캐시 (다음 실행에서도 같은 형식으로 바로 파싱)
+DATE_FORMAT_CACHE_FILE = f"{DATA_DIR}/date_formats.json"
+
+# 전문 검색 색인 (SQLite FTS5). 수집기가 새 기사를 저장할 때마다 갱신
+SEARCH_INDEX_DB = f"{DATA_DIR}/news_search.sqlite3"
+
+# 키워드 추세 집계 (일자·키워드·출처별 기사 수, SQLite). 수집기가 새 기사를 저장할 때마다 갱신
+# SPIKE_Z: 직전 BASELINE_WINDOWS 개 기간 평균 대비 급증으로 볼 z 점수, MIN_COUNT: 추세 표에 넣을 최소 기사 수
+# MIN_BASELINE_WINDOWS: 수집 시작 이후의 비교 기간이 이보다 적으면 급증을 판정하지 않음
+TREND_DB = f"{DATA_DIR}/keyword_trends.sqlite3"
+TREND_REPORT_DIR = f"{WEEKLY_REPORT_DIR}/trends"
+TREND_SPIKE_Z = 2.0
+TREND_BASELINE_WINDOWS = 4
+TREND_MIN_BASELINE_WINDOWS = 2
+TREND_MIN_COUNT = 3
+TREND_TOP_N = 20
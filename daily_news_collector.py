@@ -1,43 +1,66 @@
 # daily_news_collector.py (날짜 파싱 실패 시 '오늘'로 간주)
 
-import feedparser
 import pandas as pd
 import os
-from datetime import datetime, timedelta, timezone
-import re
+from datetime import datetime, timedelta
 import time
-from dateutil.parser import parse as date_parse
-from pytz import timezone as pytz_timezone
 
 from config import RSS_FEEDS, SECURITY_KEYWORDS, DATA_DIR, LATEST_DAYS
-
-# 한국 시간대 정의
-KST = pytz_timezone('Asia/Seoul')
-
-
-def clean_text(text):
-    """HTML 태그 제거 및 공백 정규화"""
-    clean = re.compile('<.*?>')
-    text = re.sub(clean, '', text)
-    return ' '.join(text.split())
-
-
-def is_relevant(title, summary, keywords):
-    """제목 또는 요약에 키워드가 포함되어 있는지 확인 (대소문자 구분 없음)"""
-    text = (title + " " + summary).lower()
-    for keyword in keywords:
-        if keyword.lower() in text:
-            return True
-    return False
-
-
-def collect_daily_news():
+from date_normalizer import KST, DateNormalizer
+from feed_fetcher import fetch_feeds, save_fetch_cache
+from keyword_matcher import KeywordMatcher
+from news_store import NewsStore
+from news_archive import append_to_archive, compact_archive
+from news_search import NewsSearchIndex
+from trend_engine import TrendStore
+from lang_router import route_languages
+from metrics import export_run_report, get_metrics
+from text_preprocessing import clean_series
+
+# 키워드 목록별로 한 번만 컴파일한 매처를 재사용
+_keyword_matchers = {}
+
+
+def get_keyword_matcher(keywords):
+    """키워드 목록에 해당하는 컴파일된 KeywordMatcher 반환 (최초 1회만 생성)"""
+    key = tuple(keywords)
+    matcher = _keyword_matchers.get(key)
+    if matcher is None:
+        matcher = _keyword_matchers[key] = KeywordMatcher(key)
+    return matcher
+
+
+def filter_relevant(df, keywords):
+    """
+    수집한 기사 전체의 제목·요약을 한 번에 정제하고, 키워드가 포함된 기사만 남겨
+    Keywords(매칭된 키워드)와 Lang(언어) 컬럼을 추가한 DataFrame 을 반환
+    """
+    if df.empty:
+        return df
+
+    df = df.copy()
+    df["Title"] = clean_series(df["Title"])
+    df["Summary"] = clean_series(df["Summary"])
+
+    matcher = get_keyword_matcher(keywords)
+    matched = [matcher.find(text) for text in (df["Title"] + " " + df["Summary"])]
+    df["Keywords"] = ["; ".join(hits) for hits in matched]
+    df = df[[bool(hits) for hits in matched]].reset_index(drop=True)
+
+    metrics = get_metrics()
+    metrics.inc("articles_in_window", len(matched))
+    metrics.inc("keyword_matched", len(df))
+    metrics.set("keyword_hit_ratio", round(len(df) / len(matched), 4))
+
+    # 기사 언어를 수집 시점에 한 번만 판정하여 저장 (분석 단계에서는 다시 감지하지 않음)
+    df["Lang"] = route_languages(df)
+    return df
+
+
+def collect_daily_news(feed_urls=RSS_FEEDS):
     """매일 RSS 피드를 수집하여 관련 기사를 파일에 저장"""
     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 일일 뉴스 수집 시작...")
 
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-
     today_str = datetime.now().strftime('%Y-%m-%d')
     output_filename = os.path.join(DATA_DIR, f"daily_news_{today_str}.csv")
 
@@ -46,80 +69,110 @@ def collect_daily_news():
     # 현재 시간을 기준으로 비교 임계점 설정 (KST 기준)
     time_threshold = datetime.now(KST) - timedelta(days=LATEST_DAYS)
 
-    for feed_url in RSS_FEEDS:
-        is_korean_feed = any(domain in feed_url for domain in
-                             ["boannews.com", "dailysecu.com", "ahnlab.com", "estsecurity.com", "krcert.or.kr"])
-
+    metrics = get_metrics()
+    collect_start = time.perf_counter()
+
+    date_normalizer = DateNormalizer()
+
+    # 모든 피드를 동시에 내려받음 (변경 없는 피드는 304 로 건너뜀)
+    fetch_results = fetch_feeds(feed_urls)
+
+    for result in fetch_results:
+        feed_url = result.url
+        metrics.observe("feed_fetch", result.elapsed, feed=feed_url)
+        metrics.inc("feed_requests", feed=feed_url, status=result.status or "error")
+        if result.not_modified:
+            print(f"변경 없음 (304): {feed_url}")
+            continue
+        if result.parsed is None:
+            metrics.inc("feed_failures", feed=feed_url, reason="fetch")
+            print(f"Error collecting from {feed_url}: {result.error}")
+            continue
+
+        feed = result.parsed
+        metrics.inc("feed_bytes", result.nbytes, feed=feed_url)
+        metrics.set("feed_entries", len(feed.entries), feed=feed_url)
+        if getattr(feed, "bozo", False):
+            # 형식 오류가 있어도 feedparser 가 읽은 항목은 계속 처리
+            metrics.inc("feed_failures", feed=feed_url, reason="parse")
+
+        date_methods = {}
         try:
-            feed = feedparser.parse(feed_url)
             for entry in feed.entries:
-                title = clean_text(entry.title if hasattr(entry, 'title') else '')
+                # 태그 제거·공백 정리는 루프가 끝난 뒤 전체 기사에 한 번에 적용
+                title = entry.title if hasattr(entry, 'title') else ''
                 link = entry.link if hasattr(entry, 'link') else ''
-                summary = clean_text(entry.summary if hasattr(entry, 'summary') else '')
-
-                published_date = None
-
-                # 1. feedparser가 파싱한 published_parsed 사용을 1순위로 시도
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    try:
-                        # struct_time을 datetime으로 변환 후 KST로 변환
-                        published_date = datetime.fromtimestamp(time.mktime(entry.published_parsed)).astimezone(KST)
-                    except Exception as e:
-                        # print(f"DEBUG: [Published_parsed] Failed to convert to datetime for '{title[:30]}...' from {feed_url}: {e}")
-                        pass  # 실패 시 published 문자열 파싱으로 넘어감
-
-                # 2. published_parsed가 없거나 파싱에 실패하면 published 문자열을 직접 파싱 시도
-                if published_date is None and hasattr(entry, 'published') and entry.published:
-                    try:
-                        parsed = date_parse(entry.published)
-                        if parsed.tzinfo is None:  # 시간대 정보가 없으면 KST로 설정
-                            published_date = KST.localize(parsed)
-                        else:  # 시간대 정보가 있으면 KST로 변환
-                            published_date = parsed.astimezone(KST)
-                    except Exception as e:
-                        # print(f"DEBUG: [Published String] Failed to parse date string for '{title[:30]}...' from {feed_url}: {e}")
-                        pass  # 최종 실패 시 published_date는 None으로 남음
-
-                # 3. 날짜 파싱이 최종적으로 실패한 경우, 현재 날짜로 간주하여 일단 수집
+                summary = entry.summary if hasattr(entry, 'summary') else ''
+
+                # 피드별로 학습한 형식으로 발행일 파싱 (읽을 수 없으면 published_parsed → dateutil)
+                published_date, date_method = date_normalizer.normalize(
+                    feed_url, entry.get('published'), entry.get('published_parsed'))
+
+                # 날짜 파싱이 최종적으로 실패한 경우, 현재 날짜로 간주하여 일단 수집
                 if published_date is None:
+                    date_method = "fallback_now"
                     published_date = datetime.now(KST)  # 현재 KST 시간으로 설정
-                    if is_korean_feed:
-                        print(f"DEBUG: [국내피드] '{feed_url}' - 제목: '{title[:30]}...' (날짜 파싱 최종 실패! 오늘 날짜로 대체)")
-
-                # DEBUG: 국내 피드의 날짜 파싱 결과 확인 (문제 해결 후 이 디버그 라인들은 삭제 가능)
-                if is_korean_feed and published_date:
-                    print(f"DEBUG: [국내피드] '{feed_url}' - 제목: '{title[:30]}...'")
-                    print(f"DEBUG: published_date (KST): {published_date}, Timezone: {published_date.tzinfo}")
-                    print(f"DEBUG: time_threshold (KST): {time_threshold}, Timezone: {time_threshold.tzinfo}")
-                    print(f"DEBUG: published_date >= time_threshold: {published_date >= time_threshold}")
+                date_methods[date_method] = date_methods.get(date_method, 0) + 1
 
                 # 발행일이 기준 시간(time_threshold) 이후인지 확인
                 if published_date >= time_threshold:  # published_date는 이제 None이 될 일이 없음
-                    if is_relevant(title, summary, SECURITY_KEYWORDS):
-                        all_articles.append({
-                            "Date": published_date.strftime('%Y-%m-%d'),
-                            "Time": published_date.strftime('%H:%M:%S'),
-                            "Title": title,
-                            "Link": link,
-                            "Summary": summary,
-                            "Source": feed_url
-                        })
+                    all_articles.append({
+                        "Date": published_date.strftime('%Y-%m-%d'),
+                        "Time": published_date.strftime('%H:%M:%S'),
+                        "Title": title,
+                        "Link": link,
+                        "Summary": summary,
+                        "Source": feed_url
+                    })
         except Exception as e:
+            metrics.inc("feed_failures", feed=feed_url, reason="entry")
             print(f"Error collecting from {feed_url}: {e}")
 
-    if all_articles:
-        df = pd.DataFrame(all_articles)
+        # 날짜 파싱 경로별 건수는 피드 단위로 한 번만 기록 (기사마다 출력하지 않음)
+        for method, count in date_methods.items():
+            metrics.inc("date_parse", count, feed=feed_url, method=method)
+        if date_methods.get("fallback_now"):
+            print(f"⚠️ 날짜 파싱 실패로 수집 시각을 사용한 기사 {date_methods['fallback_now']}건: {feed_url}")
 
-        # 파일이 이미 존재하면 기존 데이터에 추가하고 중복 제거
-        if os.path.exists(output_filename):
-            existing_df = pd.read_csv(output_filename, encoding='utf-8-sig')
-            df = pd.concat([existing_df, df]).drop_duplicates(subset=['Title', 'Link']).reset_index(drop=True)
+    date_normalizer.save()
+    metrics.observe("stage", time.perf_counter() - collect_start, stage="collect_fetch_parse")
 
-        df.to_csv(output_filename, index=False, encoding='utf-8-sig')
-        print(f"오늘 ({today_str})의 관련 보안 뉴스 {len(df)}건을 '{output_filename}'에 저장했습니다.")
+    with metrics.timer("stage", stage="collect_filter"):
+        relevant_df = filter_relevant(pd.DataFrame(all_articles), SECURITY_KEYWORDS)
+    all_articles = relevant_df.to_dict("records")
+
+    new_df = pd.DataFrame()
+    if all_articles:
+        # 이미 저장된 기사는 색인에서 걸러지고, 새 기사만 오늘 파일 끝에 추가됨
+        with metrics.timer("stage", stage="collect_store"):
+            with NewsStore() as store:
+                new_df = store.append(all_articles, today_str)
+            # 보고서용 컬럼형 아카이브, 전문 검색 색인, 키워드 추세 집계에도 새 기사만 추가
+            append_to_archive(new_df)
+            if len(new_df):
+                compact_archive(new_df["Date"].unique())
+            with NewsSearchIndex() as search_index:
+                search_index.add_articles(new_df)
+            with TrendStore() as trend_store:
+                trend_store.add_articles(new_df)
+
+        if len(new_df):
+            print(f"오늘 ({today_str})의 새 관련 보안 뉴스 {len(new_df)}건을 '{output_filename}'에 추가했습니다. "
+                  f"(중복 {len(all_articles) - len(new_df)}건 제외)")
+        else:
+            print(f"오늘 ({today_str}) 수집된 관련 보안 뉴스 {len(all_articles)}건은 모두 이미 저장된 기사입니다.")
     else:
         print(f"오늘 ({today_str}) 수집된 관련 보안 뉴스가 없습니다.")
 
+    # 기사 저장이 끝난 뒤에 검증자를 기록해야 저장 실패 시 다음 실행에서 다시 받아옴
+    save_fetch_cache(fetch_results)
+
+    metrics.inc("articles_stored", len(new_df))
+    metrics.inc("articles_duplicate", len(all_articles) - len(new_df))
+    metrics.observe("stage", time.perf_counter() - collect_start, stage="collect")
+    return new_df
+
 
 if __name__ == "__main__":
-    collect_daily_news()
\ No newline at end of file
+    collect_daily_news()
+    export_run_report("collect")
\ No newline at end of file
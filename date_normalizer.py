@@ -0,0 +1,140 @@
+# date_normalizer.py
+
+import calendar
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+from dateutil.parser import parse as date_parse
+
+from config import DATE_FORMAT_CACHE_FILE
+
+# 한국 시간대 (1988년 이후 서머타임이 없어 고정 +09:00 으로 충분하며, pytz localize 보다 수십 배 빠름)
+KST = timezone(timedelta(hours=9), "KST")
+
+# 국내 피드에서 자주 보이는 형식 (시간대 표기가 없으면 KST 로 간주)
+STRPTIME_FORMATS = [
+    "%Y.%m.%d %H:%M:%S",
+    "%Y.%m.%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y년 %m월 %d일 %H:%M:%S",
+    "%Y년 %m월 %d일 %H:%M",
+    "%Y-%m-%d %H:%M",
+    "%Y.%m.%d",
+    "%Y년 %m월 %d일",
+]
+
+
+def _parse_rfc822(text):
+    parsed = parsedate_to_datetime(text)
+    if parsed is None:
+        raise ValueError(text)
+    if parsed.tzinfo is None:
+        # RFC 822 의 -0000 이나 알 수 없는 시간대 약어(CEST 등)는 시간대 없이 반환되므로 UTC 로 간주
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _strptime_parser(fmt):
+    return lambda text: datetime.strptime(text, fmt)
+
+
+# 이름 -> 엄격한 파서 (형식이 맞지 않으면 예외). 앞에 있을수록 먼저 시도
+STRICT_PARSERS = {"rfc822": _parse_rfc822, "iso": datetime.fromisoformat}
+STRICT_PARSERS.update({fmt: _strptime_parser(fmt) for fmt in STRPTIME_FORMATS})
+
+
+def to_kst(parsed):
+    """시간대가 없으면 KST 로 간주하고, 있으면 KST 로 변환"""
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=KST)
+    return parsed.astimezone(KST)
+
+
+def struct_time_to_kst(struct):
+    """feedparser 의 *_parsed (UTC 기준 struct_time) 를 KST datetime 으로 변환"""
+    return datetime.fromtimestamp(calendar.timegm(struct), timezone.utc).astimezone(KST)
+
+
+class DateNormalizer:
+    """
+    피드별로 published 문자열에 맞는 형식을 한 번 찾아 기억해 두고, 이후 기사는 그 형식 하나로만 파싱.
+    처리 순서: 기억한 형식 → 엄격한 파서 전체(맞으면 기억) → feedparser 의 published_parsed → dateutil.
+    feedparser 는 시간대가 없는 날짜를 UTC 로 보고 '2025.10.14' 같은 국내 형식은 잘못 읽으므로,
+    published 문자열을 엄격한 파서로 읽을 수 없을 때만 published_parsed 를 사용합니다.
+    dateutil 로만 읽히는 경우는 기억하지 않으므로 다음 기사에서도 엄격한 파서를 다시 시도합니다.
+    학습한 형식은 파일에 저장되어 다음 실행에서도 재사용됩니다.
+    """
+
+    def __init__(self, cache_path=DATE_FORMAT_CACHE_FILE):
+        self.cache_path = cache_path
+        self.formats = {}
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self.formats = json.load(f)
+            except (OSError, ValueError):
+                self.formats = {}
+        # 더 이상 없는 형식(이전 버전이 기록한 'dateutil' 등)은 버림
+        self.formats = {feed: name for feed, name in self.formats.items() if name in STRICT_PARSERS}
+        self._dirty = False
+
+    def _remember(self, feed, name):
+        if self.formats.get(feed) != name:
+            self.formats[feed] = name
+            self._dirty = True
+
+    def normalize(self, feed, published=None, published_parsed=None):
+        """
+        (KST datetime, 사용한 경로) 반환. 경로: 'cached', 'strict', 'published_parsed', 'dateutil'.
+        모두 실패하면 (None, None)
+        """
+        text = published.strip() if isinstance(published, str) else ""
+        cached = self.formats.get(feed)
+
+        if text:
+            parser = STRICT_PARSERS.get(cached)
+            if parser is not None:
+                try:
+                    return to_kst(parser(text)), "cached"
+                except (TypeError, ValueError):
+                    pass  # 피드 형식이 바뀐 경우 다시 학습
+
+            for name, parser in STRICT_PARSERS.items():
+                if name == cached:
+                    continue
+                try:
+                    parsed = parser(text)
+                except (TypeError, ValueError):
+                    continue
+                self._remember(feed, name)
+                return to_kst(parsed), "strict"
+
+        # 엄격한 파서로 읽을 수 없는 형식: feedparser 가 해석한 값 → dateutil 순
+        if published_parsed:
+            try:
+                return struct_time_to_kst(published_parsed), "published_parsed"
+            except (TypeError, ValueError, OverflowError):
+                pass
+
+        if text:
+            try:
+                return to_kst(date_parse(text)), "dateutil"
+            except (ValueError, OverflowError):
+                return None, None
+        return None, None
+
+    def save(self):
+        """새로 학습한 형식이 있으면 캐시 파일에 저장"""
+        if not self.cache_path or not self._dirty:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.formats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
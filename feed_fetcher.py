@@ -0,0 +1,115 @@
+# feed_fetcher.py
+
+import gzip
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import feedparser
+
+from config import FEED_CACHE_FILE, FEED_FETCH_MAX_WORKERS, FEED_FETCH_TIMEOUT
+
+USER_AGENT = "AI-security-news-analyzer/1.0 (+feedparser)"
+
+
+class FeedResult:
+    """피드 1건의 수집 결과 (parsed 는 304 / 오류 시 None)"""
+
+    def __init__(self, url, status=None, parsed=None, error=None, etag=None, modified=None, nbytes=0, elapsed=0.0):
+        self.url = url
+        self.status = status
+        self.parsed = parsed
+        self.error = error
+        self.etag = etag
+        self.modified = modified
+        self.nbytes = nbytes
+        self.elapsed = elapsed
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+def load_feed_cache(path=FEED_CACHE_FILE):
+    """피드별 ETag / Last-Modified 캐시 로드 (없거나 손상되었으면 빈 캐시)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_feed_cache(cache, path=FEED_CACHE_FILE):
+    """캐시를 임시 파일에 쓴 뒤 교체하여 중간에 깨진 파일이 남지 않도록 저장"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def fetch_feed(url, cached=None, timeout=FEED_FETCH_TIMEOUT):
+    """조건부 GET 으로 피드 1건을 내려받아 파싱 (변경 없으면 304 로 파싱 생략)"""
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = cached["modified"]
+
+    start = time.perf_counter()
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+            etag = response.headers.get("ETag")
+            modified = response.headers.get("Last-Modified")
+            content_type = response.headers.get("Content-Type")
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+    except urllib.error.HTTPError as e:
+        elapsed = time.perf_counter() - start
+        if e.code == 304:
+            return FeedResult(url, status=304, etag=cached.get("etag") if cached else None,
+                              modified=cached.get("modified") if cached else None, elapsed=elapsed)
+        return FeedResult(url, status=e.code, error=e, elapsed=elapsed)
+    except Exception as e:
+        return FeedResult(url, error=e, elapsed=time.perf_counter() - start)
+
+    # 본문은 이미 받아두었으므로 feedparser 는 네트워크 없이 파싱만 수행
+    parsed = feedparser.parse(body, response_headers={"content-type": content_type} if content_type else None)
+    return FeedResult(url, status=status, parsed=parsed, etag=etag, modified=modified,
+                      nbytes=len(body), elapsed=time.perf_counter() - start)
+
+
+def fetch_feeds(feed_urls, cache_path=FEED_CACHE_FILE, max_workers=FEED_FETCH_MAX_WORKERS,
+                timeout=FEED_FETCH_TIMEOUT):
+    """
+    여러 피드를 스레드 풀로 동시에 수집합니다.
+    전체 소요 시간은 피드 수의 합이 아니라 가장 느린 피드(최대 timeout)에 맞춰집니다.
+    결과는 입력 순서대로 반환되며, 새 ETag / Last-Modified 는 save_fetch_cache 로 저장합니다.
+    """
+    cache = load_feed_cache(cache_path) if cache_path else {}
+    workers = max(1, min(max_workers, len(feed_urls)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda url: fetch_feed(url, cache.get(url), timeout), feed_urls))
+
+    return results
+
+
+def save_fetch_cache(results, cache_path=FEED_CACHE_FILE):
+    """정상 수집된 피드의 검증자(ETag / Last-Modified)를 캐시에 반영"""
+    cache = load_feed_cache(cache_path)
+    for result in results:
+        if result.parsed is not None and result.status == 200 and (result.etag or result.modified):
+            cache[result.url] = {"etag": result.etag, "modified": result.modified}
+    save_feed_cache(cache, cache_path)
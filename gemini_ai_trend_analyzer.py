@@ -1,140 +1,285 @@
+import argparse
 import pandas as pd
 from pathlib import Path
 import os
-import google.generativeai as genai
-from langdetect import detect, DetectorFactory
-from googletrans import Translator 
-import time 
+import time
 
-DetectorFactory.seed = 0
+from config import (AI_ANALYSIS_REPORT_DIR, ANALYSIS_NUM_WORKERS, GEMINI_API_ENDPOINT, GEMINI_CHUNK_TOKEN_BUDGET,
+                    GEMINI_INSIGHT_MODE, WEEKLY_REPORT_DIR)
+from ai_trend_analyzer import find_latest_report
+from gemini_map_reduce import RateLimiter, call_with_retry, estimate_tokens, is_retryable_error, map_reduce_insight
+from lang_router import ensure_lang, route_languages
+from metrics import export_run_report, get_metrics
+from result_cache import ResultCache, cached_map
+from sharded_analysis import route_languages_sharded, translate_sharded
+from text_preprocessing import build_article_blocks, has_min_length, stripped
+from trend_engine import spiking_keywords
 
-API_KEY = ""
-genai.configure(api_key=API_KEY)
+API_KEY = os.environ.get("GEMINI_API_KEY", "")
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
 
-try:
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    print(f"Gemini 모델 로드 완료: {model.model_name}")
-except Exception as e:
-    print(f"🚨 Gemini 모델 로드 실패: {e}. API 키 또는 네트워크 상태를 확인하세요.")
-    model = None
+# 번역 결과 캐시 키 (번역기나 번역 방식이 바뀌면 버전을 올려 이전 결과를 재사용하지 않음)
+TRANSLATOR_ID = "googletrans:ko->en"
+TRANSLATION_PROMPT_VERSION = "translate-v1"
 
-print("번역기 로드 중... (Googletrans)")
-try:
-    translator = Translator()
-    print("번역기 로드 완료.")
-except Exception as e:
-    print(f"⚠️ 번역기 로드 실패: {e}. 한국어 기사 번역 기능이 작동하지 않을 수 있습니다.")
-    translator = None
+# 종합 인사이트 추출에 실패했을 때 결과 텍스트의 머리말
+INSIGHT_FAILURE_PREFIX = "(상위 레벨 종합 인사이트 추출 실패"
 
-input_report_dir = Path(r"C:\업무\16.뉴스 스크랩(feat.AI.ML)\weekly_reports")
+# Gemini 모델과 번역기는 처음 필요할 때 한 번만 생성
+_model = None
+_translator = None
 
-output_summary_dir = Path(r"C:\업무\16.뉴스 스크랩(feat.AI.ML)\summarized_outputs")
-output_summary_dir.mkdir(parents=True, exist_ok=True)
 
-csv_files = list(input_report_dir.glob("*.csv"))
-if not csv_files:
-    raise FileNotFoundError(f"📂 {input_report_dir} 디렉토리에 CSV 파일이 없습니다.")
+def get_model():
+    """Gemini 모델을 지연 생성하여 반환 (실패 시 None)"""
+    global _model
+    if _model is None:
+        import google.generativeai as genai
 
-target_csv_files = [f for f in csv_files if not f.name.startswith("ai_insight_summary_")]
-if not target_csv_files:
-    raise FileNotFoundError(f"📂 {input_report_dir} 디렉토리에 'ai_insight_summary_'로 시작하지 않는 원본 CSV 파일이 없습니다.")
-latest_file = max(target_csv_files, key=os.path.getmtime)
+        # GEMINI_API_ENDPOINT 를 지정하면 해당 주소(예: 로컬 목 서버)로 REST 요청을 보냄
+        if GEMINI_API_ENDPOINT:
+            genai.configure(api_key=API_KEY, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+        else:
+            genai.configure(api_key=API_KEY)
+        try:
+            _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+            print(f"Gemini 모델 로드 완료: {_model.model_name}")
+        except Exception as e:
+            print(f"🚨 Gemini 모델 로드 실패: {e}. API 키 또는 네트워크 상태를 확인하세요.")
+            _model = None
+    return _model
+
+
+def get_translator():
+    """Googletrans 번역기를 지연 생성하여 반환 (실패 시 None)"""
+    global _translator
+    if _translator is None:
+        print("번역기 로드 중... (Googletrans)")
+        try:
+            from googletrans import Translator
 
-print(f"📄 최신 입력 파일: {latest_file.name}")
+            _translator = Translator()
+            print("번역기 로드 완료.")
+        except Exception as e:
+            print(f"⚠️ 번역기 로드 실패: {e}. 한국어 기사 번역 기능이 작동하지 않을 수 있습니다.")
+            _translator = None
+    return _translator
+
+
+def translate_to_english(contents):
+    """한국어 본문 목록을 영어로 번역 (번역기를 쓸 수 없거나 번역에 실패한 항목은 None)"""
+    translator = get_translator() if contents else None
+    if translator is None:
+        return [None] * len(contents)
+
+    results = []
+    for content in contents:
+        try:
+            results.append(translator.translate(content, dest='en').text)
+        except Exception as e:
+            print(f"  ⚠️ 번역 실패 ({e}), 건너뜁니다.")
+            results.append(None)
+    return results
 
-df = pd.read_csv(latest_file, encoding="utf-8")
 
-df_to_process = df
-print(f"✔️ CSV 파일에서 총 {len(df_to_process)}개 기사를 검토합니다.")
+def collect_article_texts(df, num_workers=ANALYSIS_NUM_WORKERS):
+    """
+    기사별 영어 본문(한국어는 번역)을 '--- Article N ---' 형식 텍스트 목록으로 반환.
+    num_workers 가 2 이상이면 언어 판정과 번역을 기사 shard 별로 여러 프로세스에서 실행
+    """
+    # 유사 중복 클러스터의 대표 기사만 분석 (같은 사건이 프롬프트에 여러 번 들어가지 않도록)
+    if "IsRepresentative" in df.columns:
+        df = df[df["IsRepresentative"]].reset_index(drop=True)
 
-all_articles_combined_text = []
+    print(f"✔️ 총 {len(df)}개 기사를 검토합니다.")
 
-if model is None:
-    print("🚨 Gemini 모델이 로드되지 않아 프로세스를 계속할 수 없습니다. 실행을 중단합니다.")
-else:
     print("\n--- 모든 기사 내용 취합 및 번역 시작 ---")
-    for idx, row in df_to_process.iterrows():
-        title = str(row.get("Title", "")).strip()
-        content = str(row.get("Summary", "")).strip()
+    # 1차: 수집 시점에 저장된 Lang 컬럼으로 영어 / 번역 대상(한국어) 기사 분류 (컬럼 단위 필터링)
+    titles = stripped(df, "Title")
+    contents = stripped(df, "Summary")
+    sharded = bool(num_workers and num_workers > 1)
+    langs = ensure_lang(df, (lambda rows: route_languages_sharded(rows, num_workers)) if sharded else route_languages)
+    mask = has_min_length(contents) & langs.isin(["ko", "en"])
+    titles, contents, langs = titles[mask], contents[mask], langs[mask]
 
-        if not content or len(content) < 30:
-            # print(f"  🚨 기사 {idx+1} 건너뛰기: 내용이 없거나 30자 미만입니다.")
-            continue
+    # 2차: 한국어 기사 번역 (이전 실행에서 번역한 기사는 캐시 사용, 새 기사만 번역기 호출)
+    is_korean = langs.eq("ko")
+    korean_contents = contents[is_korean].tolist()
+    with ResultCache() as cache:
+        translate = (lambda texts: translate_sharded(texts, num_workers)) if sharded else translate_to_english
+        translations = cached_map(cache, korean_contents, TRANSLATOR_ID, TRANSLATION_PROMPT_VERSION, translate)
+        if korean_contents:
+            print(f"  🗂️ 번역 캐시: 적중 {cache.hits}건 / 미스 {cache.misses}건")
 
-        processed_content_en = ""
-        try:
-            lang = detect(content)
-            # print(f"  ➡️ 기사 {idx+1} 감지된 언어: {lang.upper()}")
-
-            if lang == 'ko':
-                if translator:
-                    processed_content_en = translator.translate(content, dest='en').text
-                else:
-                    # print("  ⚠️ 번역기 로드 실패로 한국어 기사를 처리할 수 없습니다. 건너뜁니다.")
-                    continue
-            elif lang == 'en':
-                processed_content_en = content
-            else:
-                # print(f"  🚫 기사 {idx+1} 건너뛰기: 영어/한국어 기사가 아닙니다 (감지된 언어: {lang}).")
-                continue
-
-            # 합쳐질 텍스트 형식: "--- Article [번호] ---\nTitle: [제목]\nBody: [내용]\n\n"
-            all_articles_combined_text.append(f"--- Article {idx+1} ---\nTitle: {title}\nBody: {processed_content_en}\n")
+    bodies = contents.astype(object)
+    bodies[is_korean] = translations
+    # 번역에 실패한 기사는 제외
+    keep = bodies.notna() & bodies.ne("")
+    titles, bodies = titles[keep], bodies[keep]
 
-        except Exception as e:
-            print(f"  ⚠️ 기사 {idx+1} 언어 감지/번역 실패 ({e}), 건너뜁니다.")
-            continue
+    # 합쳐질 텍스트 형식: "--- Article [번호] ---\nTitle: [제목]\nBody: [내용]\n\n"
+    all_articles_combined_text = build_article_blocks(pd.Series(bodies.index + 1, index=bodies.index),
+                                                      titles, bodies).tolist()
     print("--- 모든 기사 내용 취합 및 번역 완료 ---")
+    return all_articles_combined_text
+
+
+ARTICLES_DESCRIPTION = "The following is a collection of recent cybersecurity news articles. Each article is separated by '--- Article [번호] ---'."
+ARTICLES_SOURCE = "the 80 articles provided above"
+
+# map-reduce 의 reduce 단계: 기사 원문 대신 청크별 부분 분석을 종합
+PARTIALS_DESCRIPTION = ("The following are partial trend analyses, each written from one batch of recent cybersecurity news articles. "
+                        "Each partial analysis is separated by '--- Partial Analysis [번호] ---'.")
+PARTIALS_SOURCE = "the partial analyses provided above (which were derived strictly from the original articles)"
+
+
+def build_focus_hint(focus_keywords):
+    """직전 기간 대비 보도가 급증한 키워드를 우선 분석하도록 하는 프롬프트 문단 (없으면 빈 문자열)"""
+    if not focus_keywords:
+        return ""
+    return (f"**[FOCUS] Coverage of the following topics spiked sharply compared with previous periods: "
+            f"{', '.join(focus_keywords)}. Give these spiking topics particular depth and priority, "
+            f"while still covering the other major trends.**\n\n")
+
+
+def build_overall_prompt(overall_input_text, description=ARTICLES_DESCRIPTION, source=ARTICLES_SOURCE,
+                         focus_keywords=None):
+    """취합된 기사 텍스트(또는 부분 분석)로 상위 레벨 종합 인사이트 프롬프트 생성"""
+    return (
+        f"**[CRITICAL] ABSOLUTELY DO NOT include 'Article [Number]' or any similar numerical reference to articles in the generated analysis. This is a strict requirement for a professional client report.**\n"
+        f"**[RE-EMPHASIS] All insights and examples must refer directly to specific entities, events, or attack types mentioned in the provided articles, WITHOUT citing their article numbers.**\n\n"
+        f"{description}\n\n"
+        f"{overall_input_text}\n\n"
+        f"{build_focus_hint(focus_keywords)}"
+        f"Based on all these articles, provide a comprehensive overview of the current cybersecurity landscape, "
+        f"major trends, and key implications for the industry. "
+        f"Group similar points and synthesize them into clear sections. "
+        f"Structure your response with clear headings (e.g., '1. [Trend Name]'). "
+        f"**Each major trend chapter must be at least twice the current length, providing detailed analysis.**\n"
+        f"**For each 'Insight' section, go beyond merely listing phenomena. Deeply analyze and incorporate the following aspects:**\n"
+        f"* **Diverse related cases and patterns inferable from them.**\n"
+        f"* **The practical impact and ripple effects of the trend on the industry as a whole.**\n"
+        f"* **Specific risks and challenges arising from this trend.**\n"
+        f"* **Current limitations in security responses and additional considerations needed.**\n"
+        f"* **Future predictions and potential scenarios.**\n"
+        f"For each major trend, within the '인사이트' section, clearly analyze its positive, neutral aspects, as well as its potential risks, limitations, and unresolved issues. Connect these insights with specific, factual examples or relevant entities/events mentioned in the provided articles. "
+        f"Start with a strong summary sentence, then use bullet points or numbered lists for the main insights. "
+        f"Ensure the '인사이트' section directly references real-world events or named entities from the articles to illustrate the point. "
+        f"Specifically, go beyond the surface of the articles to deeply analyze and highlight hidden meanings, potential risks, and fundamental unresolved problems within the cybersecurity environment, utilizing critical thinking. This analysis should provide comprehensive insights, not just a mere enumeration."
+        f"\n\n**CAUTION:** All analysis and insights must be strictly based ONLY on the content of {source}. Take extreme care to prevent hallucinations by not adding external information or facts not present in the articles."
+        f"\n\n**Exclude the 'Conclusion' section from the report. The report should consist only of the introduction and the major trend chapters.**"
+        f"\n\n**All responses must be written in Korean. Ensure the Korean context and expressions are as natural and professional as a specialized report.**"
+    )
 
-    print("\n--- 상위 레벨 종합 인사이트 도출 시작 (Gemini 1회 호출) ---")
+
+def build_reduce_prompt(partial_text, focus_keywords=None):
+    """map 단계 부분 분석들을 종합하는 reduce 프롬프트"""
+    return build_overall_prompt(partial_text, PARTIALS_DESCRIPTION, PARTIALS_SOURCE, focus_keywords)
+
+
+def generate_overall_insight(df, mode=GEMINI_INSIGHT_MODE, focus_keywords=None, num_workers=ANALYSIS_NUM_WORKERS):
+    """
+    보고서 DataFrame 전체를 Gemini 로 종합 분석한 결과 텍스트 반환 (모델이 없으면 None).
+    mode: 'single' (1회 호출), 'map_reduce' (청크별 map 후 reduce),
+          'auto' (프롬프트가 토큰 예산 안에 들어가면 1회 호출, 아니면 map-reduce)
+    focus_keywords: 급증 키워드 목록 (종합 프롬프트에서 우선 분석하도록 강조)
+    num_workers: 언어 판정·번역을 나누어 실행할 프로세스 수
+    """
+    model = get_model()
+    if model is None:
+        print("🚨 Gemini 모델이 로드되지 않아 프로세스를 계속할 수 없습니다. 실행을 중단합니다.")
+        return None
+
+    all_articles_combined_text = collect_article_texts(df, num_workers)
 
     overall_input_text = "\n\n".join(all_articles_combined_text)
 
     if not overall_input_text or len(overall_input_text) < 100:
         overall_summary = "처리할 기사 내용이 부족하여 상위 레벨 종합 인사이트를 생성할 수 없습니다."
         print(overall_summary)
-    else:
-        prompt_for_overall_insight = (
-            f"**[CRITICAL] ABSOLUTELY DO NOT include 'Article [Number]' or any similar numerical reference to articles in the generated analysis. This is a strict requirement for a professional client report.**\n"
-            f"**[RE-EMPHASIS] All insights and examples must refer directly to specific entities, events, or attack types mentioned in the provided articles, WITHOUT citing their article numbers.**\n\n"
-            f"The following is a collection of recent cybersecurity news articles. Each article is separated by '--- Article [번호] ---'.\n\n"
-            f"{overall_input_text}\n\n"
-            f"Based on all these articles, provide a comprehensive overview of the current cybersecurity landscape, "
-            f"major trends, and key implications for the industry. "
-            f"Group similar points and synthesize them into clear sections. "
-            f"Structure your response with clear headings (e.g., '1. [Trend Name]'). "
-            f"**Each major trend chapter must be at least twice the current length, providing detailed analysis.**\n"
-            f"**For each 'Insight' section, go beyond merely listing phenomena. Deeply analyze and incorporate the following aspects:**\n"
-            f"* **Diverse related cases and patterns inferable from them.**\n"
-            f"* **The practical impact and ripple effects of the trend on the industry as a whole.**\n"
-            f"* **Specific risks and challenges arising from this trend.**\n"
-            f"* **Current limitations in security responses and additional considerations needed.**\n"
-            f"* **Future predictions and potential scenarios.**\n"
-            f"For each major trend, within the '인사이트' section, clearly analyze its positive, neutral aspects, as well as its potential risks, limitations, and unresolved issues. Connect these insights with specific, factual examples or relevant entities/events mentioned in the provided articles. "
-            f"Start with a strong summary sentence, then use bullet points or numbered lists for the main insights. "
-            f"Ensure the '인사이트' section directly references real-world events or named entities from the articles to illustrate the point. "
-            f"Specifically, go beyond the surface of the articles to deeply analyze and highlight hidden meanings, potential risks, and fundamental unresolved problems within the cybersecurity environment, utilizing critical thinking. This analysis should provide comprehensive insights, not just a mere enumeration."
-            f"\n\n**CAUTION:** All analysis and insights must be strictly based ONLY on the content of the 80 articles provided above. Take extreme care to prevent hallucinations by not adding external information or facts not present in the articles."
-            f"\n\n**Exclude the 'Conclusion' section from the report. The report should consist only of the introduction and the major trend chapters.**"
-            f"\n\n**All responses must be written in Korean. Ensure the Korean context and expressions are as natural and professional as a specialized report.**"
-        )
-        overall_summary = ""
-        try:
+        return overall_summary
+
+    single_prompt = build_overall_prompt(overall_input_text, focus_keywords=focus_keywords)
+    if mode == "auto":
+        mode = "single" if estimate_tokens(single_prompt) <= GEMINI_CHUNK_TOKEN_BUDGET else "map_reduce"
+
+    metrics = get_metrics()
+
+    def generate(prompt):
+        response = model.generate_content(prompt)
+        # 응답에 사용량 정보가 있으면 실제 토큰 수, 없으면 문자 수 기반 추정치를 기록
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None and getattr(usage, "prompt_token_count", None):
+            metrics.inc("gemini_prompt_tokens", usage.prompt_token_count, source="api")
+            metrics.inc("gemini_output_tokens", getattr(usage, "candidates_token_count", 0) or 0, source="api")
+        else:
+            metrics.inc("gemini_prompt_tokens", estimate_tokens(prompt), source="estimate")
+            metrics.inc("gemini_output_tokens", estimate_tokens(response.text), source="estimate")
+        return response.text.strip()
+
+    metrics.set("gemini_articles", len(all_articles_combined_text))
+    overall_summary = ""
+    start_time = time.perf_counter()
+    try:
+        if mode == "map_reduce":
+            print("\n--- 상위 레벨 종합 인사이트 도출 시작 (Gemini map-reduce) ---")
+            overall_summary = map_reduce_insight(all_articles_combined_text, generate,
+                                                 lambda partial_text: build_reduce_prompt(partial_text, focus_keywords),
+                                                 model_name=GEMINI_MODEL_NAME)
+        else:
+            print("\n--- 상위 레벨 종합 인사이트 도출 시작 (Gemini 1회 호출) ---")
             print("  Gemini 상위 레벨 종합 인사이트 추출 중 (단 1회 API 호출)...")
-            response = model.generate_content(prompt_for_overall_insight)
-            overall_summary = response.text.strip()
-            print("  ✅ 상위 레벨 종합 인사이트 추출 완료.")
+            overall_summary = call_with_retry(generate, single_prompt, RateLimiter(), phase="single")
+        print("  ✅ 상위 레벨 종합 인사이트 추출 완료.")
 
-        except Exception as e:
-            overall_summary = f"(상위 레벨 종합 인사이트 추출 실패: {e})"
-            print(f"  ❌ 상위 레벨 종합 인사이트 추출 실패: {e}. 오류: {e}")
-            if "quota" in str(e).lower() or "rate limit" in str(e).lower():
-                print("    ➡️ 할당량/속도 제한 오류 감지. 다음날 다시 시도하거나 할당량 확인 필요.")
+    except Exception as e:
+        overall_summary = f"{INSIGHT_FAILURE_PREFIX}: {e})"
+        print(f"  ❌ 상위 레벨 종합 인사이트 추출 실패: {e}")
+        if is_retryable_error(e):
+            print("    ➡️ 할당량/속도 제한 오류 감지. 완료된 청크는 체크포인트에 저장되어 재실행 시 이어서 진행됩니다.")
+    metrics.observe("stage", time.perf_counter() - start_time, stage="analyze_gemini", mode=mode)
+    return overall_summary
 
-    overall_insight_output_file = output_summary_dir / f"ai_overall_insights_single_call_{latest_file.stem}_gemini_flash.txt" # 파일명 변경
+
+def save_overall_insight(overall_summary, report_stem, output_summary_dir=AI_ANALYSIS_REPORT_DIR):
+    """종합 인사이트를 'ai_overall_insights_<보고서 이름>_gemini_flash.txt' 로 저장하고 경로 반환"""
+    output_summary_dir = Path(output_summary_dir)
+    output_summary_dir.mkdir(parents=True, exist_ok=True)
+    overall_insight_output_file = output_summary_dir / f"ai_overall_insights_{report_stem}_gemini_flash.txt"
     with open(overall_insight_output_file, "w", encoding="utf-8") as f:
         f.write(overall_summary)
         f.write("\n\n--- End of Overall Insights ---")
 
     print(f"\n🎉 상위 레벨 종합 인사이트 보고서 저장 완료: {overall_insight_output_file}")
+    return overall_insight_output_file
+
+
+def main(input_report_dir=WEEKLY_REPORT_DIR, output_summary_dir=AI_ANALYSIS_REPORT_DIR, mode=GEMINI_INSIGHT_MODE,
+         num_workers=ANALYSIS_NUM_WORKERS):
+    """최신 주간 보고서를 읽어 Gemini 종합 인사이트 텍스트 파일을 저장"""
+    output_summary_dir = Path(output_summary_dir)
+    output_summary_dir.mkdir(parents=True, exist_ok=True)
+
+    latest_file = find_latest_report(input_report_dir)
+    print(f"📄 최신 입력 파일: {latest_file.name}")
+
+    df = pd.read_csv(latest_file, encoding="utf-8")
+
+    overall_summary = generate_overall_insight(df, mode, spiking_keywords(), num_workers)
+    if overall_summary is None:
+        return None
+
+    save_overall_insight(overall_summary, latest_file.stem, output_summary_dir)
     print("\nAI 인사이트 도출 프로세스가 완료되었습니다.")
+    return overall_summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주간 보안 뉴스 Gemini 종합 인사이트 도출")
+    parser.add_argument("--input-dir", default=WEEKLY_REPORT_DIR, help="주간 보고서 CSV 폴더")
+    parser.add_argument("--output-dir", default=AI_ANALYSIS_REPORT_DIR, help="AI 분석 결과 저장 폴더")
+    parser.add_argument("--mode", default=GEMINI_INSIGHT_MODE, choices=["auto", "single", "map_reduce"])
+    parser.add_argument("--workers", type=int, default=ANALYSIS_NUM_WORKERS, help="언어 판정·번역을 나누어 실행할 프로세스 수")
+    args = parser.parse_args()
+    main(args.input_dir, args.output_dir, args.mode, args.workers)
+    export_run_report("analyze_gemini")
@@ -0,0 +1,253 @@
+# gemini_map_reduce.py
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (GEMINI_CHARS_PER_TOKEN, GEMINI_CHECKPOINT_DIR, GEMINI_CHUNK_TOKEN_BUDGET, GEMINI_MAP_CONCURRENCY,
+                    GEMINI_MAX_RETRIES, GEMINI_REQUESTS_PER_MINUTE, GEMINI_RETRY_BASE_DELAY)
+from metrics import get_metrics
+
+# 프롬프트를 바꾸면 버전을 올려 이전 체크포인트를 재사용하지 않도록 함
+MAP_REDUCE_PROMPT_VERSION = "map-reduce-v1"
+
+MAP_PROMPT_TEMPLATE = (
+    "The following is one batch of recent cybersecurity news articles. Each article is separated by '--- Article [번호] ---'.\n\n"
+    "{articles}\n\n"
+    "Extract the major trends in this batch as a structured English analysis for a later synthesis step. "
+    "For each trend, give a heading, the specific entities, events, vulnerabilities, threat actors and attack types involved, "
+    "and the impact and risks they imply. Do not cite article numbers. "
+    "Use ONLY the content of the articles above and do not add external facts."
+)
+
+# 부분 분석이 많아 reduce 프롬프트가 예산을 넘을 때, 부분 분석 묶음을 하나로 합치는 중간 단계 프롬프트
+COMBINE_PROMPT_TEMPLATE = (
+    "The following are partial trend analyses, each written from one batch of recent cybersecurity news articles. "
+    "Each partial analysis is separated by '--- Partial Analysis [번호] ---'.\n\n"
+    "{partials}\n\n"
+    "Merge them into a single structured English analysis for a later synthesis step. Combine overlapping trends, "
+    "keep the specific entities, events, vulnerabilities, threat actors and attack types, and the impact and risks they imply. "
+    "Use ONLY the content of the partial analyses above and do not add external facts."
+)
+
+# 중간 합치기 단계의 최대 반복 수 (그래도 예산을 넘으면 reduce 입력을 예산에 맞게 자름)
+MAX_COMBINE_LEVELS = 4
+
+# map / 합치기 호출은 여러 스레드에서 실행되므로 stats 집계는 이 잠금 안에서 갱신
+_stats_lock = threading.Lock()
+
+
+def estimate_tokens(text, chars_per_token=GEMINI_CHARS_PER_TOKEN):
+    """문자 수 기반 토큰 수 추정 (API 호출 없이 청크 크기를 정하기 위한 보수적 근사치)"""
+    return int(len(text) / chars_per_token) + 1
+
+
+def chunk_articles(article_texts, token_budget=GEMINI_CHUNK_TOKEN_BUDGET, overhead_tokens=None):
+    """
+    기사 텍스트를 입력 순서대로 토큰 예산 안에 들어가도록 청크로 묶음 (greedy packing).
+    예산보다 긴 기사 하나는 예산에 맞게 잘라 단독 청크로 만듭니다.
+    """
+    if overhead_tokens is None:
+        overhead_tokens = estimate_tokens(MAP_PROMPT_TEMPLATE)
+    budget = max(token_budget - overhead_tokens, 1)
+
+    chunks, current, current_tokens = [], [], 0
+    for text in article_texts:
+        tokens = estimate_tokens(text)
+        if tokens > budget:
+            text = text[:int(budget * GEMINI_CHARS_PER_TOKEN)]
+            tokens = budget
+        if current and current_tokens + tokens > budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class RateLimiter:
+    """분당 요청 수 제한 (여러 스레드가 공유하는 토큰 버킷)"""
+
+    def __init__(self, requests_per_minute=GEMINI_REQUESTS_PER_MINUTE):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(self._next_slot, now) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def is_retryable_error(error):
+    """할당량·속도 제한·일시적 서버 오류인지 판단"""
+    message = str(error).lower()
+    return any(token in message for token in ("quota", "rate limit", "429", "resource exhausted",
+                                              "resourceexhausted", "503", "unavailable", "deadline", "timed out"))
+
+
+def call_with_retry(generate, prompt, rate_limiter, max_retries=GEMINI_MAX_RETRIES,
+                    base_delay=GEMINI_RETRY_BASE_DELAY, stats=None, phase="single"):
+    """rate limiter 를 거쳐 generate(prompt) 호출, 할당량 오류면 지수 백오프(+지터)로 재시도"""
+    metrics = get_metrics()
+    for attempt in range(max_retries + 1):
+        with metrics.timer("gemini_rate_limit_wait", phase=phase):
+            rate_limiter.acquire()
+        start = time.perf_counter()
+        try:
+            result = generate(prompt)
+        except Exception as e:
+            metrics.observe("gemini_request", time.perf_counter() - start, phase=phase, status="error")
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = base_delay * (2 ** attempt) * (1 + random.random())
+            metrics.inc("gemini_retries", phase=phase)
+            if stats is not None:
+                with _stats_lock:
+                    stats["retries"] = stats.get("retries", 0) + 1
+            print(f"    ➡️ 할당량/일시 오류 ({e}). {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+        else:
+            metrics.observe("gemini_request", time.perf_counter() - start, phase=phase, status="ok")
+            return result
+
+
+class Checkpoint:
+    """청크별 map 결과(및 중간 합치기 결과)를 JSON 파일에 저장하여 실패한 실행을 이어서 진행"""
+
+    def __init__(self, run_key, checkpoint_dir=GEMINI_CHECKPOINT_DIR):
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self.path = os.path.join(checkpoint_dir, f"{run_key}.json")
+        self._lock = threading.Lock()
+        self.state = {"map": {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get_map(self, chunk_key):
+        return self.state["map"].get(chunk_key)
+
+    def set_map(self, chunk_key, text):
+        with self._lock:
+            self.state["map"][chunk_key] = text
+            self._save()
+
+    def remove(self):
+        """최종 결과까지 성공하면 더 이상 이어서 진행할 필요가 없으므로 파일 삭제"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def _digest(*parts):
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def map_reduce_insight(article_texts, generate, build_reduce_prompt, model_name="",
+                       token_budget=GEMINI_CHUNK_TOKEN_BUDGET, concurrency=GEMINI_MAP_CONCURRENCY,
+                       rate_limiter=None, checkpoint_dir=GEMINI_CHECKPOINT_DIR):
+    """
+    기사들을 토큰 예산 단위 청크로 나눠 동시에 map 호출로 부분 분석을 만든 뒤,
+    build_reduce_prompt(부분 분석 텍스트) 로 한 번 더 호출하여 최종 종합 인사이트를 반환.
+    부분 분석을 합친 reduce 프롬프트가 token_budget 을 넘으면 부분 분석을 다시 청크로 묶어 합치는 단계를
+    예산 안에 들어올 때까지 반복합니다 (계층적 reduce).
+    generate(prompt) -> str 은 Gemini 호출(또는 로컬 목 서버 호출) 함수이며,
+    완료된 청크 결과는 체크포인트에 남아 재실행 시 다시 호출하지 않고, 최종 결과가 나오면 체크포인트를 삭제합니다.
+    """
+    rate_limiter = rate_limiter or RateLimiter()
+    chunks = chunk_articles(article_texts, token_budget)
+    chunk_prompts = [MAP_PROMPT_TEMPLATE.format(articles="\n\n".join(chunk)) for chunk in chunks]
+    chunk_keys = [_digest(model_name, MAP_REDUCE_PROMPT_VERSION, prompt) for prompt in chunk_prompts]
+    # reduce 프롬프트(급증 키워드 강조 등)가 달라지면 다른 실행으로 보고 이전 체크포인트를 이어 쓰지 않음
+    reduce_key = _digest(build_reduce_prompt(""))
+    checkpoint = Checkpoint(_digest(model_name, MAP_REDUCE_PROMPT_VERSION, reduce_key, *chunk_keys), checkpoint_dir)
+    stats = {"chunks": len(chunks), "resumed": 0, "retries": 0}
+
+    def run_prompts(prompts, phase, label):
+        """프롬프트들을 동시에 호출 (체크포인트에 있는 결과는 재사용). 하나라도 실패하면 예외"""
+        keys = [_digest(model_name, MAP_REDUCE_PROMPT_VERSION, prompt) for prompt in prompts]
+
+        def run_one(index):
+            cached = checkpoint.get_map(keys[index])
+            if cached is not None:
+                with _stats_lock:
+                    stats["resumed"] += 1
+                return cached
+            text = call_with_retry(generate, prompts[index], rate_limiter, stats=stats, phase=phase)
+            checkpoint.set_map(keys[index], text)
+            print(f"  ✅ {label} {index + 1}/{len(prompts)} 완료")
+            return text
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [executor.submit(run_one, i) for i in range(len(prompts))]
+            results, errors = [], []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        if errors:
+            # 성공한 호출은 체크포인트에 남아 있으므로 다음 실행에서 실패한 것만 다시 호출됨
+            raise RuntimeError(f"{label} {len(errors)}/{len(prompts)}개 실패 (체크포인트 저장됨): {errors[0]}")
+        return results
+
+    print(f"  Gemini map 단계: 청크 {len(chunks)}개 (동시 {concurrency}개, 청크당 약 {token_budget} 토큰 이내)")
+    partials = run_prompts(chunk_prompts, "map", "map 청크")
+
+    metrics = get_metrics()
+    metrics.set("gemini_chunks", stats["chunks"])
+    metrics.inc("gemini_chunks_resumed", stats["resumed"])
+    if stats["resumed"]:
+        print(f"  ♻️ 체크포인트에서 {stats['resumed']}개 청크 결과를 재사용했습니다.")
+
+    def join_partials(texts):
+        return "\n\n".join(f"--- Partial Analysis {i + 1} ---\n{text}" for i, text in enumerate(texts))
+
+    # reduce 프롬프트가 예산을 넘으면 부분 분석을 예산 단위로 묶어 합치는 단계를 반복
+    reduce_overhead = estimate_tokens(build_reduce_prompt(""))
+    level = 0
+    while (len(partials) > 1 and level < MAX_COMBINE_LEVELS
+           and estimate_tokens(build_reduce_prompt(join_partials(partials))) > token_budget):
+        level += 1
+        groups = chunk_articles(partials, token_budget, overhead_tokens=max(reduce_overhead, estimate_tokens(
+            COMBINE_PROMPT_TEMPLATE)))
+        if len(groups) >= len(partials):
+            # 부분 분석 하나하나가 예산에 가까워 더 묶을 수 없으면 둘씩 묶어 개수를 줄임
+            groups = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+        print(f"  Gemini 중간 합치기 {level}단계: 부분 분석 {len(partials)}개 -> {len(groups)}개")
+        metrics.inc("gemini_combine_levels")
+        partials = run_prompts([COMBINE_PROMPT_TEMPLATE.format(partials=join_partials(group)) for group in groups],
+                               "combine", f"중간 합치기 {level}단계")
+
+    partial_text = join_partials(partials)
+    reduce_budget_chars = int(max(token_budget - reduce_overhead, 1) * GEMINI_CHARS_PER_TOKEN)
+    if len(partial_text) > reduce_budget_chars:
+        print(f"  ⚠️ 부분 분석이 예산을 넘어 reduce 입력을 {reduce_budget_chars}자로 자릅니다.")
+        partial_text = partial_text[:reduce_budget_chars]
+
+    print("  Gemini reduce 단계: 부분 분석 종합 중...")
+    overall = call_with_retry(generate, build_reduce_prompt(partial_text), rate_limiter, stats=stats, phase="reduce")
+    checkpoint.remove()
+    if stats["retries"]:
+        print(f"  재시도 횟수: {stats['retries']}회")
+    return overall
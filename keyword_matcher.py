@@ -0,0 +1,67 @@
+# keyword_matcher.py
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    보안 키워드 목록으로 Aho-Corasick 오토마톤을 한 번만 만들어 두고 재사용하는 매처.
+    검색 비용은 키워드 수와 무관하게 본문 길이에 비례하며, 한글/영문 모두 대소문자 구분 없이 찾습니다.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        # 상태 0 이 루트. goto[state] = {문자: 다음 상태}
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        # 같은 소문자 키워드(예: 'APT' / 'apt')는 하나의 패턴으로 묶어 원래 표기를 모두 보고
+        patterns = {}
+        for keyword in self.keywords:
+            lowered = keyword.lower()
+            if lowered:
+                patterns.setdefault(lowered, []).append(keyword)
+
+        for pattern, originals in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state] = tuple(originals)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        # 루트의 자식은 실패 링크가 루트(0)이므로 그 다음 깊이부터 BFS 로 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # 실패 링크 쪽에서 끝나는 더 짧은 키워드도 함께 보고되도록 출력 병합
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """본문에 포함된 키워드를 처음 등장한 순서대로 (중복 없이) 반환"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for keyword in output[state]:
+                    found.setdefault(keyword, None)
+        return list(found)
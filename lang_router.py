@@ -0,0 +1,75 @@
+# lang_router.py
+
+import pandas as pd
+
+from config import KOREAN_FEED_DOMAINS, LANG_HANGUL_RATIO_EN, LANG_HANGUL_RATIO_KO
+
+
+def is_korean_source(source):
+    """피드 URL 이 국내 매체인지 여부 (언어 사전 확률로 사용)"""
+    return any(domain in str(source) for domain in KOREAN_FEED_DOMAINS)
+
+
+def hangul_ratio(texts):
+    """문자열 Series 전체에 대해 한글 글자 / (한글 + 라틴 글자) 비율을 벡터 연산으로 계산 (글자가 없으면 NaN)"""
+    texts = texts.fillna("").astype(str)
+    hangul = texts.str.count(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+    latin = texts.str.count(r"[A-Za-z]")
+    total = hangul + latin
+    return (hangul / total.where(total > 0)).astype("float64")
+
+
+def _detect(text):
+    from langdetect import detect, DetectorFactory
+
+    DetectorFactory.seed = 0
+    try:
+        return detect(text)
+    except Exception:
+        return "unknown"
+
+
+def route_languages(df, text_columns=("Title", "Summary"), source_column="Source"):
+    """
+    기사별 언어('ko' / 'en' / 기타 langdetect 결과 / 'unknown')를 Series 로 반환.
+    1) 한글·라틴 글자 비율로 대부분의 기사를 한 번에 판정하고,
+    2) 애매한 기사는 피드 출처(국내 매체 여부)를 사전 정보로 사용하며,
+    3) 그래도 판단이 어려운 기사만 langdetect 로 감지합니다.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+
+    text = df[text_columns[0]].fillna("").astype(str)
+    for column in text_columns[1:]:
+        text = text + " " + df[column].fillna("").astype(str)
+    ratio = hangul_ratio(text)
+
+    lang = pd.Series("unknown", index=df.index, dtype=object)
+    lang[ratio >= LANG_HANGUL_RATIO_KO] = "ko"
+    lang[ratio <= LANG_HANGUL_RATIO_EN] = "en"
+
+    ambiguous = ratio.notna() & (ratio > LANG_HANGUL_RATIO_EN) & (ratio < LANG_HANGUL_RATIO_KO)
+    if ambiguous.any() and source_column in df.columns:
+        # 국내 매체 기사에 한글이 조금이라도 섞여 있으면 한국어로 간주 (영문 용어가 많은 국내 기사)
+        korean_prior = df.loc[ambiguous, source_column].map(is_korean_source).astype(bool)
+        lang[korean_prior[korean_prior].index] = "ko"
+        ambiguous &= ~lang.eq("ko")
+
+    for idx in ambiguous[ambiguous].index:
+        lang[idx] = _detect(text[idx])
+    return lang
+
+
+def ensure_lang(df, router=route_languages):
+    """
+    저장된 Lang 컬럼을 그대로 쓰고, 컬럼이 없거나 비어 있는 기사만 판정하여 채운 Series 반환.
+    router: 판정 함수 (기본 route_languages, 다중 프로세스 판정은 sharded_analysis.route_languages_sharded)
+    """
+    if "Lang" not in df.columns:
+        return router(df)
+    lang = df["Lang"].astype(object)
+    missing = lang.isna() | lang.eq("")
+    if missing.any():
+        lang = lang.copy()
+        lang[missing] = router(df[missing])
+    return lang
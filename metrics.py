@@ -0,0 +1,146 @@
+# metrics.py
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from config import METRICS_DIR, METRICS_PREFIX, METRICS_TEXTFILE_DIR
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunMetrics:
+    """
+    한 번의 실행 동안 단계별 카운터·게이지·소요 시간을 라벨과 함께 모으는 레지스트리 (스레드 안전).
+    - inc: 누적 카운터 (예: 수집 기사 수, 재시도 횟수)
+    - set: 마지막 값만 남는 게이지 (예: 키워드 적중률)
+    - observe / timer: 소요 시간(초) 관측값의 횟수·합계·최댓값
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self.counters = {}
+            self.gauges = {}
+            self.timings = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            count, total, maximum = self.timings.get(key, (0, 0.0, 0.0))
+            self.timings[key] = (count + 1, total + seconds, max(maximum, seconds))
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록의 소요 시간을 observe 로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def value(self, name, **labels):
+        """카운터 또는 게이지의 현재 값 (없으면 0)"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            return self.counters.get(key, self.gauges.get(key, 0))
+
+    def to_dict(self):
+        """JSON 실행 보고서용 dict"""
+        def rows(items, fields):
+            return [dict(name=name, labels=dict(labels), **fields(value)) for (name, labels), value in sorted(items)]
+
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "counters": rows(self.counters.items(), lambda v: {"value": v}),
+                "gauges": rows(self.gauges.items(), lambda v: {"value": v}),
+                "timings": rows(self.timings.items(), lambda v: {
+                    "count": v[0], "sum_seconds": round(v[1], 6), "max_seconds": round(v[2], 6),
+                    "avg_seconds": round(v[1] / v[0], 6) if v[0] else 0.0}),
+            }
+
+    def to_prometheus(self, prefix=METRICS_PREFIX):
+        """Prometheus textfile collector 형식 문자열 (카운터는 _total, 소요 시간은 summary _sum/_count + _max)"""
+        def series(name, labels, value):
+            label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels)
+            return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+        lines = []
+        with self._lock:
+            groups = {}
+            for (name, labels), value in self.counters.items():
+                groups.setdefault((f"{prefix}_{name}_total", "counter"), []).append(series(f"{prefix}_{name}_total", labels, value))
+            for (name, labels), value in self.gauges.items():
+                groups.setdefault((f"{prefix}_{name}", "gauge"), []).append(series(f"{prefix}_{name}", labels, value))
+            for (name, labels), (count, total, maximum) in self.timings.items():
+                metric = f"{prefix}_{name}_seconds"
+                groups.setdefault((metric, "summary"), []).extend([
+                    series(f"{metric}_sum", labels, round(total, 6)),
+                    series(f"{metric}_count", labels, count),
+                ])
+                groups.setdefault((f"{metric}_max", "gauge"), []).append(series(f"{metric}_max", labels, round(maximum, 6)))
+            finished = time.time()
+
+        for (metric, metric_type), samples in sorted(groups.items()):
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.extend(sorted(samples))
+        lines.append(f"# TYPE {prefix}_last_run_timestamp_seconds gauge")
+        lines.append(f"{prefix}_last_run_timestamp_seconds {int(finished)}")
+        return "\n".join(lines) + "\n"
+
+
+def _atomic_write(path, text):
+    # textfile collector 가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+# 🔹 프로세스 전역 레지스트리 (각 모듈은 get_metrics() 로 같은 객체에 기록)
+_metrics = RunMetrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+def export_run_report(run_name, metrics_dir=METRICS_DIR, textfile_dir=METRICS_TEXTFILE_DIR):
+    """
+    현재까지 모은 지표를 JSON 실행 보고서(<run_name>_<시각>.json)와
+    Prometheus textfile(<prefix>_<run_name>.prom, 매 실행 덮어씀)로 저장하고 두 경로를 반환
+    """
+    report = dict(run=run_name, **_metrics.to_dict())
+    json_path = os.path.join(metrics_dir, f"{run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    _atomic_write(json_path, json.dumps(report, ensure_ascii=False, indent=2))
+
+    prom_path = os.path.join(textfile_dir or metrics_dir, f"{METRICS_PREFIX}_{run_name}.prom")
+    _atomic_write(prom_path, _metrics.to_prometheus())
+    return json_path, prom_path
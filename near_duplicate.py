@@ -0,0 +1,162 @@
+# near_duplicate.py
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from config import NEAR_DUP_BANDS, NEAR_DUP_NUM_PERM, NEAR_DUP_SHINGLE_SIZE, NEAR_DUP_THRESHOLD
+
+# 해시 연산은 모두 uint32 오버플로(mod 2^32)를 이용하며, 고정 시드로 실행마다 같은 클러스터가 나오도록 함
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+_ROLLING_BASE = np.uint32(0x01000193)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _fmix32(h):
+    """MurmurHash3 마무리 단계: 선형 롤링 해시의 비트를 고르게 섞음"""
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+def normalize_for_shingles(texts, k):
+    """소문자화·구두점 제거·공백 정리 (k 글자보다 짧은 본문은 k 글자로 채워 shingle 1개가 되도록)"""
+    # pandas 의 pyarrow 문자열 정규식은 \w 가 ASCII 전용이라 한글이 지워지므로 파이썬 re 패턴을 사용
+    normalized = (_NON_WORD.sub(" ", text).strip() for text in texts.fillna("").astype(str).str.lower())
+    return [text.ljust(k) if text else "" for text in normalized]
+
+
+class MinHasher:
+    """
+    문자 k-gram(shingle) 집합의 MinHash 서명을 계산합니다. 한글/영문 모두 같은 방식으로 동작합니다.
+    전체 문서를 하나의 코드포인트 배열로 이어 붙여 k-gram 해시와 순열 적용, 문서별 최솟값 계산을 모두 numpy 로 처리합니다.
+    (최솟값은 중복 shingle 에 영향을 받지 않으므로 집합으로 만들 필요가 없음)
+    """
+
+    def __init__(self, num_perm=NEAR_DUP_NUM_PERM, shingle_size=NEAR_DUP_SHINGLE_SIZE, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # 홀수 a 로 a*x+b (mod 2^32) 가 32비트 공간의 순열이 되도록 함
+        self._a = (rng.randint(0, 1 << 31, size=num_perm).astype(np.uint32) << np.uint32(1)) | np.uint32(1)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint32)
+
+    def _shingle_hashes(self, codepoints):
+        k = self.shingle_size
+        windows = len(codepoints) - k + 1
+        h = np.zeros(max(windows, 0), dtype=np.uint32)
+        for offset in range(k):
+            h = h * _ROLLING_BASE + codepoints[offset:offset + windows]
+        return _fmix32(h)
+
+    def signatures(self, texts, chunk_size=200000):
+        """정규화된 문서 목록의 서명을 (문서 수 x num_perm) uint32 행렬로 반환"""
+        k = self.shingle_size
+        n = len(texts)
+        result = np.full((n, self.num_perm), _MAX_HASH, dtype=np.uint32)
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n)
+        if not lengths.sum():
+            return result
+
+        codepoints = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+        all_hashes = self._shingle_hashes(codepoints)
+
+        # 문서 경계를 넘는 k-gram 은 제외하고 문서별 shingle 해시만 남김
+        doc_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        shingle_counts = np.maximum(lengths - k + 1, 0)
+        positions = np.repeat(doc_starts, shingle_counts) + (
+            np.arange(shingle_counts.sum()) - np.repeat(np.cumsum(shingle_counts) - shingle_counts, shingle_counts))
+        hashes = all_hashes[positions]
+        offsets = np.concatenate(([0], np.cumsum(shingle_counts)))
+
+        # 메모리 사용을 제한하기 위해 문서 경계에 맞춘 청크로 나눠 순열 적용
+        doc = 0
+        while doc < n:
+            end_doc = int(np.searchsorted(offsets, offsets[doc] + chunk_size, side="right")) - 1
+            end_doc = min(max(end_doc, doc + 1), n)
+            start, stop = offsets[doc], offsets[end_doc]
+            if stop > start:
+                permuted = self._a[:, None] * hashes[None, start:stop] + self._b[:, None]
+                permuted ^= permuted >> np.uint32(15)
+                non_empty = np.nonzero(shingle_counts[doc:end_doc])[0]
+                starts = offsets[doc:end_doc][non_empty] - start
+                result[doc + non_empty] = np.minimum.reduceat(permuted, starts, axis=1).T
+            doc = end_doc
+        return result
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def cluster_near_duplicates(df, threshold=NEAR_DUP_THRESHOLD, num_perm=NEAR_DUP_NUM_PERM, bands=NEAR_DUP_BANDS,
+                            shingle_size=NEAR_DUP_SHINGLE_SIZE):
+    """
+    제목+요약이 거의 같은 기사(출처만 다른 같은 사건)를 MinHash LSH 로 묶어
+    ClusterId, ClusterSize, IsRepresentative 컬럼을 추가한 DataFrame 을 반환합니다.
+    LSH 버킷에서 나온 후보 쌍만 비교하므로 기사 수에 대해 거의 선형 시간으로 동작합니다.
+    대표 기사는 클러스터 안에서 요약이 가장 긴 기사(같으면 먼저 나온 기사)입니다.
+    """
+    df = df.reset_index(drop=True)
+    n = len(df)
+    if n == 0:
+        return df.assign(ClusterId=pd.Series(dtype="int64"), ClusterSize=pd.Series(dtype="int64"),
+                         IsRepresentative=pd.Series(dtype="bool"))
+
+    rows_per_band = num_perm // bands
+    hasher = MinHasher(num_perm, shingle_size)
+    texts = normalize_for_shingles(df["Title"].fillna("").astype(str) + " " + df["Summary"].fillna("").astype(str),
+                                   shingle_size)
+    signatures = hasher.signatures(texts)
+    # 제목·요약이 모두 비어 있는 기사는 서로 같은 사건으로 묶지 않음
+    has_text = np.array([bool(text) for text in texts], dtype=bool)
+
+    # 밴드별 서명 조각을 64비트 키로 접어 정렬하면 같은 버킷의 기사가 연속으로 모임
+    band_mixers = np.random.RandomState(7).randint(1, 1 << 62, size=rows_per_band).astype(np.uint64) | np.uint64(1)
+    union_find = _UnionFind(n)
+    for band in range(bands):
+        band_slice = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+        keys = (band_slice * band_mixers).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        is_group_start = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        group_anchor = order[np.flatnonzero(is_group_start)][np.cumsum(is_group_start) - 1]
+
+        # 버킷 전체 쌍 대신 버킷의 첫 기사와만 비교하여 큰 버킷에서도 비교 횟수를 선형으로 유지
+        members = order[~is_group_start]
+        anchors = group_anchor[~is_group_start]
+        if not len(members):
+            continue
+        similarity = (signatures[members] == signatures[anchors]).mean(axis=1)
+        matched = (similarity >= threshold) & has_text[members] & has_text[anchors]
+        for anchor, other in zip(anchors[matched], members[matched]):
+            union_find.union(int(anchor), int(other))
+
+    roots = np.array([union_find.find(i) for i in range(n)])
+    _, cluster_ids = np.unique(roots, return_inverse=True)
+
+    result = df.copy()
+    result["ClusterId"] = cluster_ids
+    result["ClusterSize"] = result.groupby("ClusterId")["ClusterId"].transform("size")
+
+    summary_length = result["Summary"].fillna("").astype(str).str.len()
+    representative_idx = summary_length.groupby(result["ClusterId"]).idxmax()
+    result["IsRepresentative"] = False
+    result.loc[representative_idx.values, "IsRepresentative"] = True
+    return result
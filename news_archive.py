@@ -0,0 +1,175 @@
+# news_archive.py
+
+import argparse
+import glob
+import os
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config import ARCHIVE_COMPACT_MIN_PARTS, ARCHIVE_DIR, DATA_DIR
+from lang_router import route_languages
+from news_store import article_id
+
+# 아카이브 스키마: 발행 시각은 문자열 Date/Time 대신 KST 타임스탬프 컬럼으로 보관
+ARCHIVE_SCHEMA = pa.schema([
+    ("Published", pa.timestamp("s", tz="Asia/Seoul")),
+    ("Title", pa.string()),
+    ("Link", pa.string()),
+    ("Summary", pa.string()),
+    ("Source", pa.string()),
+    ("Keywords", pa.string()),
+    ("Lang", pa.string()),
+    ("ArticleId", pa.string()),
+])
+
+# 디렉터리 이름(date=YYYY-MM-DD)으로 나뉘는 파티션 컬럼
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+def _to_archive_table(df):
+    """일별 CSV 형식(Date, Time, ...)의 DataFrame 을 아카이브 스키마의 Arrow 테이블로 변환"""
+    df = df.copy()
+    published = pd.to_datetime(df["Date"].astype(str) + " " + df["Time"].astype(str), errors="coerce")
+    df["Published"] = published.dt.tz_localize("Asia/Seoul", ambiguous="NaT", nonexistent="NaT")
+    for column in ("Title", "Link", "Summary", "Source", "Keywords"):
+        df[column] = df[column].fillna("").astype(str) if column in df else ""
+    # 언어 판정 도입 이전 기사(CSV 가져오기 등)는 여기서 한 번 판정
+    if "Lang" not in df or df["Lang"].isna().any():
+        routed = route_languages(df)
+        df["Lang"] = df["Lang"].fillna(routed) if "Lang" in df else routed
+    df["ArticleId"] = [article_id(link, title) for link, title in zip(df["Link"], df["Title"])]
+    return pa.Table.from_pandas(df[ARCHIVE_SCHEMA.names], schema=ARCHIVE_SCHEMA, preserve_index=False)
+
+
+def append_to_archive(df, archive_dir=ARCHIVE_DIR):
+    """새 기사들을 발행일(Date)별 파티션에 Parquet 파일로 추가 (기존 파일은 건드리지 않음)"""
+    if df is None or df.empty:
+        return 0
+
+    written = 0
+    for date_str, df_day in df.groupby("Date", sort=False):
+        partition_dir = os.path.join(archive_dir, f"date={date_str}")
+        os.makedirs(partition_dir, exist_ok=True)
+        filename = f"part-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        pq.write_table(_to_archive_table(df_day), os.path.join(partition_dir, filename))
+        written += len(df_day)
+    return written
+
+
+def compact_partition(date_str, archive_dir=ARCHIVE_DIR):
+    """
+    시간별 수집으로 잘게 나뉜 하루치 파일들을 하나로 합치고 합친 파일 수를 반환 (합칠 것이 없으면 0).
+    합친 파일을 먼저 게시한 뒤 기존 파일을 지우므로 도중에 중단되어도 기사가 사라지지 않으며,
+    그때 남은 중복은 다음 합치기에서 ArticleId 기준으로 제거됩니다.
+    """
+    partition_dir = os.path.join(archive_dir, f"date={date_str}")
+    parts = sorted(glob.glob(os.path.join(partition_dir, "*.parquet")))
+    if len(parts) <= 1:
+        return 0
+    # 마이그레이션 등으로 같은 기사가 여러 파일에 들어갔을 수 있으므로 합치면서 중복 제거
+    df = pq.read_table(parts, schema=ARCHIVE_SCHEMA).to_pandas().drop_duplicates(subset=["ArticleId"])
+    table = pa.Table.from_pandas(df, schema=ARCHIVE_SCHEMA, preserve_index=False)
+    # '_' 로 시작하는 임시 파일은 데이터셋 조회에서 제외됨
+    tmp_path = os.path.join(partition_dir, f"_compacted-{uuid.uuid4().hex[:8]}.parquet.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, os.path.join(partition_dir, f"part-compacted-{uuid.uuid4().hex[:8]}.parquet"))
+    for part in parts:
+        os.remove(part)
+    return len(parts)
+
+
+def compact_archive(dates=None, min_parts=ARCHIVE_COMPACT_MIN_PARTS, archive_dir=ARCHIVE_DIR):
+    """
+    파일이 min_parts 개 이상 쌓인 날짜 파티션을 합치고 합친 파티션 수를 반환.
+    dates 를 지정하면 해당 날짜만 확인 (수집기는 이번에 기사를 추가한 날짜만 넘김)
+    """
+    if dates is None:
+        dates = [os.path.basename(path)[len("date="):]
+                 for path in sorted(glob.glob(os.path.join(archive_dir, "date=*")))]
+    compacted = 0
+    for date_str in dates:
+        parts = glob.glob(os.path.join(archive_dir, f"date={date_str}", "*.parquet"))
+        if len(parts) >= max(min_parts, 2):
+            merged = compact_partition(date_str, archive_dir)
+            print(f"  🗜️ 아카이브 {date_str} 파티션의 파일 {merged}개를 하나로 합쳤습니다.")
+            compacted += 1
+    return compacted
+
+
+def import_daily_csvs(data_dir=DATA_DIR, archive_dir=ARCHIVE_DIR):
+    """아카이브 도입 이전의 daily_news_*.csv 를 한 번만 아카이브로 옮김 (이후에는 수집기가 직접 아카이브에 기록)"""
+    marker = os.path.join(archive_dir, "_legacy_csv_imported")
+    if os.path.exists(marker):
+        return 0
+
+    # 수집기가 이미 아카이브에 기록한 기사는 다시 가져오지 않음
+    existing_ids = set()
+    if os.path.isdir(archive_dir):
+        dataset = ds.dataset(archive_dir, format="parquet", schema=ARCHIVE_SCHEMA, partitioning=PARTITIONING)
+        existing_ids = set(dataset.to_table(columns=["ArticleId"]).column("ArticleId").to_pylist())
+
+    imported = 0
+    for path in sorted(glob.glob(os.path.join(data_dir, "daily_news_*.csv"))):
+        try:
+            df = pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+        except pd.errors.EmptyDataError:
+            continue
+        keep = []
+        # _to_archive_table 과 같은 방식(빈 값은 "")으로 기사 ID 를 계산해야 저장된 ArticleId 와 일치함
+        for link, title in zip(df["Link"].fillna(""), df["Title"].fillna("")):
+            aid = article_id(link, title)
+            keep.append(aid not in existing_ids)
+            existing_ids.add(aid)
+        df = df[keep]
+        # 파일명 날짜가 아니라 기사 발행일(Date) 기준으로 파티션에 들어감
+        imported += append_to_archive(df, archive_dir)
+
+    os.makedirs(archive_dir, exist_ok=True)
+    with open(marker, "w", encoding="utf-8") as f:
+        f.write(datetime.now().isoformat())
+    return imported
+
+
+def load_window(start_date, end_date, columns=None, archive_dir=ARCHIVE_DIR):
+    """
+    start_date ~ end_date (YYYY-MM-DD, 양 끝 포함) 기간의 기사를 발행 시각 역순으로 반환.
+    기간 밖의 파티션은 디렉터리 이름만으로 제외되고, columns 로 지정한 컬럼만 읽습니다.
+    """
+    columns = list(columns) if columns else list(ARCHIVE_SCHEMA.names)
+    if "Published" not in columns:
+        columns.append("Published")
+
+    if not os.path.isdir(archive_dir):
+        return pd.DataFrame(columns=columns)
+
+    dataset = ds.dataset(archive_dir, format="parquet", schema=ARCHIVE_SCHEMA.append(pa.field("date", pa.string())),
+                         partitioning=PARTITIONING)
+    predicate = (ds.field("date") >= start_date) & (ds.field("date") <= end_date)
+    table = dataset.to_table(columns=columns, filter=predicate)
+    return table.to_pandas().sort_values("Published", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def to_daily_csv_format(df):
+    """아카이브 DataFrame 을 기존 CSV 형식(Date, Time, Title, Link, Summary, Source, Keywords, Lang)으로 변환"""
+    df = df.copy()
+    published = df.pop("Published")
+    df.insert(0, "Date", published.dt.strftime("%Y-%m-%d"))
+    df.insert(1, "Time", published.dt.strftime("%H:%M:%S"))
+    return df.drop(columns=["ArticleId"], errors="ignore")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보안 뉴스 Parquet 아카이브 관리")
+    parser.add_argument("--compact", action="store_true", help="여러 파일로 나뉜 날짜 파티션을 하나로 합침")
+    parser.add_argument("--min-parts", type=int, default=2, help="이 개수 이상 파일이 있는 파티션만 합침")
+    args = parser.parse_args()
+
+    if args.compact:
+        print(f"합친 파티션: {compact_archive(min_parts=args.min_parts)}개")
+    else:
+        parser.print_help()
@@ -0,0 +1,242 @@
+# news_search.py
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from config import ARCHIVE_DIR, SEARCH_INDEX_DB
+from news_archive import ARCHIVE_SCHEMA, PARTITIONING, import_daily_csvs
+from news_store import article_id
+
+# 색인용 텍스트 변환 방식이 바뀌면 올려서 기존 색인을 다시 만들도록 함
+TOKENIZER_VERSION = 1
+
+# 한글 음절·자모가 이어진 구간 (조사가 붙은 어절도 2글자 단위로 쪼개 부분 일치 검색이 되도록 함)
+_HANGUL_RUN = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]+")
+# unicode61 토크나이저와 같은 기준의 토큰 (밑줄은 구분자)
+_TOKEN = re.compile(r"[^\W_]+")
+_QUERY_PART = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_OPERATORS = {"OR", "AND", "NOT"}
+
+# 순위 가중치 (제목 > 요약 > 출처)
+BM25_WEIGHTS = (5.0, 1.0, 0.5)
+
+
+def _bigrams(run):
+    if len(run) < 2:
+        return run
+    return " ".join(run[i:i + 2] for i in range(len(run) - 1))
+
+
+def to_index_text(text):
+    """한글 구간을 글자 2-gram 으로 펼친 색인용 텍스트 ('랜섬웨어가' -> '랜섬 섬웨 웨어 어가')"""
+    return _HANGUL_RUN.sub(lambda m: " " + _bigrams(m.group()) + " ", str(text or ""))
+
+
+def _phrase(text, prefix=False):
+    tokens = _TOKEN.findall(to_index_text(text).lower())
+    if not tokens:
+        return None
+    if len(tokens) == 1 and len(tokens[0]) == 1 and _HANGUL_RUN.fullmatch(tokens[0]):
+        # 한 글자 한국어 검색어는 2-gram 의 앞 글자로 찾음
+        prefix = True
+    return '"' + " ".join(tokens) + '"' + ("*" if prefix else "")
+
+
+def build_match_query(query):
+    """
+    검색어를 FTS5 MATCH 식으로 변환.
+    공백으로 나눈 단어는 모두 포함(AND), 'OR' / 'NOT' / 'AND NOT' 연산자, "따옴표 구문", 끝의 * (접두어 검색) 지원.
+    연산자는 양쪽에 검색어가 있어야 하며, 'NOT lazarus' 처럼 연산자로 시작하거나 끝나는 검색어, 연산자가 연달아 오는
+    검색어('AND NOT' 제외)는 의도와 다르게 검색되지 않도록 ValueError 를 발생시킵니다 (단어 자체는 "not" 처럼 따옴표로 검색).
+    한국어 단어는 2-gram 구문으로 바뀌어 조사가 붙은 형태('랜섬웨어가')도 찾습니다.
+    """
+    parts = []
+    for quoted, quoted_prefix, word in _QUERY_PART.findall(query):
+        if word and word.upper() in _OPERATORS:
+            operator = word.upper()
+            if not parts:
+                raise ValueError(f"검색어는 연산자 '{operator}' 로 시작할 수 없습니다. "
+                                 f"단어로 검색하려면 따옴표로 감싸세요 (예: \"{word.lower()}\").")
+            if parts[-1] == "AND" and operator == "NOT":
+                # FTS5 의 NOT 은 이미 'A 이면서 B 가 아닌' 의미이므로 AND NOT 은 NOT 하나로 줄임
+                parts[-1] = "NOT"
+                continue
+            if parts[-1] in _OPERATORS:
+                raise ValueError(f"연산자 '{parts[-1]}' 뒤에 '{operator}' 가 올 수 없습니다. "
+                                 f"단어로 검색하려면 따옴표로 감싸세요 (예: \"{word.lower()}\").")
+            parts.append(operator)
+            continue
+        if quoted or quoted_prefix:
+            phrase = _phrase(quoted, prefix=bool(quoted_prefix))
+        else:
+            phrase = _phrase(word.rstrip("*"), prefix=word.endswith("*"))
+        if phrase:
+            parts.append(phrase)
+    if parts and parts[-1] in _OPERATORS:
+        raise ValueError(f"연산자 '{parts[-1]}' 뒤에 검색어가 없습니다.")
+    return " ".join(parts)
+
+
+class NewsSearchIndex:
+    """
+    기사 원문(articles)과 FTS5 전문 색인(articles_fts)을 담은 SQLite 검색 색인.
+    수집기가 새 기사를 저장할 때마다 add_articles 로 증분 반영되며, 검색은 bm25 순위로 반환합니다.
+    """
+
+    def __init__(self, path=SEARCH_INDEX_DB):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " id INTEGER PRIMARY KEY,"
+            " article_id TEXT NOT NULL UNIQUE,"
+            " date TEXT, time TEXT, title TEXT, link TEXT, summary TEXT, source TEXT, keywords TEXT, lang TEXT"
+            ");"
+            "CREATE INDEX IF NOT EXISTS articles_date ON articles (date);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+            " title, summary, source, tokenize = 'unicode61 remove_diacritics 2'"
+            ");"
+        )
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != TOKENIZER_VERSION:
+            self.rebuild()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def rebuild(self):
+        """저장된 기사 원문으로 전문 색인을 다시 생성 (색인용 텍스트 변환 방식이 바뀌었을 때)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM articles_fts")
+            rows = self.conn.execute("SELECT id, title, summary, source FROM articles")
+            self.conn.executemany(
+                "INSERT INTO articles_fts (rowid, title, summary, source) VALUES (?, ?, ?, ?)",
+                ((rowid, to_index_text(title), to_index_text(summary), source) for rowid, title, summary, source in rows),
+            )
+            self.conn.execute(f"PRAGMA user_version = {TOKENIZER_VERSION}")
+
+    def add_articles(self, df):
+        """
+        일별 CSV 형식(Date, Time, Title, Link, Summary, Source, ...)의 기사를 색인에 추가하고 새로 추가된 건수를 반환.
+        이미 색인된 기사(같은 기사 ID)는 건너뜁니다.
+        """
+        if df is None or df.empty:
+            return 0
+
+        def column(name):
+            return df[name].fillna("").astype(str).tolist() if name in df.columns else [""] * len(df)
+
+        titles, links = column("Title"), column("Link")
+        ids = df["ArticleId"].tolist() if "ArticleId" in df.columns else [
+            article_id(link, title) for link, title in zip(links, titles)]
+
+        added = 0
+        with self.conn:
+            for row in zip(ids, column("Date"), column("Time"), titles, links, column("Summary"),
+                           column("Source"), column("Keywords"), column("Lang")):
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO articles (article_id, date, time, title, link, summary, source, keywords, lang)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                if cursor.rowcount:
+                    self.conn.execute(
+                        "INSERT INTO articles_fts (rowid, title, summary, source) VALUES (?, ?, ?, ?)",
+                        (cursor.lastrowid, to_index_text(row[3]), to_index_text(row[5]), row[6]))
+                    added += 1
+        return added
+
+    def search(self, query, since=None, until=None, source=None, limit=20):
+        """
+        검색어와 일치하는 기사를 관련도 순 DataFrame 으로 반환 (Score 가 클수록 관련도 높음).
+        since / until: 'YYYY-MM-DD' 발행일 범위 (양 끝 포함), source: 출처 URL 에 포함된 문자열
+        """
+        match = build_match_query(query)
+        columns = ["Date", "Time", "Title", "Source", "Link", "Keywords", "Lang", "Score"]
+        if not match:
+            return pd.DataFrame(columns=columns)
+
+        sql = ("SELECT a.date, a.time, a.title, a.source, a.link, a.keywords, a.lang,"
+               " -bm25(articles_fts, ?, ?, ?) AS score"
+               " FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+               " WHERE articles_fts MATCH ?")
+        params = [*BM25_WEIGHTS, match]
+        if since:
+            sql += " AND a.date >= ?"
+            params.append(since)
+        if until:
+            sql += " AND a.date <= ?"
+            params.append(until)
+        if source:
+            sql += " AND a.source LIKE ?"
+            params.append(f"%{source}%")
+        sql += " ORDER BY bm25(articles_fts, ?, ?, ?) LIMIT ?"
+        params += [*BM25_WEIGHTS, limit]
+        return pd.DataFrame(self.conn.execute(sql, params).fetchall(), columns=columns)
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def backfill(index_path=SEARCH_INDEX_DB, archive_dir=ARCHIVE_DIR, batch_size=50000):
+    """
+    Parquet 아카이브 전체(기존 daily_news_*.csv 포함)를 색인에 추가하고 추가된 건수를 반환.
+    아카이브는 배치 단위로 읽어 수년치 데이터도 메모리에 한 번에 올리지 않습니다.
+    """
+    import_daily_csvs(archive_dir=archive_dir)
+    if not os.path.isdir(archive_dir):
+        return 0
+
+    dataset = ds.dataset(archive_dir, format="parquet", schema=ARCHIVE_SCHEMA, partitioning=PARTITIONING)
+    added = 0
+    with NewsSearchIndex(index_path) as index:
+        for batch in dataset.to_batches(batch_size=batch_size):
+            df = batch.to_pandas()
+            published = df.pop("Published")
+            df["Date"] = published.dt.strftime("%Y-%m-%d")
+            df["Time"] = published.dt.strftime("%H:%M:%S")
+            added += index.add_articles(df)
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보안 뉴스 아카이브 전문 검색")
+    parser.add_argument("query", nargs="?", help='검색어 (예: "Lazarus OR MOVEit", "랜섬웨어 병원", \'"supply chain"\')')
+    parser.add_argument("--days", type=int, help="최근 N일 이내 기사만 검색")
+    parser.add_argument("--since", help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--until", help="종료일 (YYYY-MM-DD)")
+    parser.add_argument("--source", help="출처 URL 에 포함된 문자열로 제한")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--backfill", action="store_true", help="아카이브 전체를 색인에 추가")
+    args = parser.parse_args()
+
+    if args.backfill:
+        start = time.perf_counter()
+        print(f"색인 추가 완료: {backfill()}건 ({time.perf_counter() - start:.1f}초)")
+    if args.query:
+        since = args.since or ((datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d") if args.days else None)
+        with NewsSearchIndex() as search_index:
+            start = time.perf_counter()
+            try:
+                results = search_index.search(args.query, since=since, until=args.until, source=args.source,
+                                              limit=args.limit)
+            except ValueError as e:
+                parser.error(str(e))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"'{args.query}' 검색 결과 {len(results)}건 ({elapsed_ms:.1f} ms)")
+        for _, row in results.iterrows():
+            print(f"[{row['Date']} {row['Time']}] {row['Title']}\n    {row['Link']}  (score {row['Score']:.2f})")
+    elif not args.backfill:
+        parser.print_help()
@@ -0,0 +1,140 @@
+# news_store.py
+
+import csv
+import glob
+import hashlib
+import os
+import sqlite3
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+from config import ARTICLE_INDEX_DB, DATA_DIR
+
+# 일별 CSV 의 기본 컬럼 순서 (새 파일을 만들 때 헤더로 사용)
+ARTICLE_COLUMNS = ["Date", "Time", "Title", "Link", "Summary", "Source", "Keywords", "Lang"]
+
+# 기사 동일성 판단 시 무시할 추적용 쿼리 파라미터
+TRACKING_PARAM_PREFIXES = ("utm_", "fbclid", "gclid")
+
+
+def normalize_url(url):
+    """스킴/호스트 소문자화, fragment·추적 파라미터·마지막 '/' 제거로 같은 기사의 URL 변형을 하나로 정규화"""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAM_PREFIXES)]
+    path = parts.path.rstrip("/") or "/"
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    # http / https 는 같은 기사로 취급
+    return urlunsplit(("", netloc, path, urlencode(sorted(query)), ""))
+
+
+def article_id(link, title=""):
+    """정규화된 URL 의 해시 (링크가 없으면 제목 기준)"""
+    link = str(link or "").strip()
+    key = "url:" + normalize_url(link) if link else "title:" + " ".join(str(title or "").lower().split())
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class NewsStore:
+    """
+    일별 CSV 에 새 기사만 이어 쓰는 저장소.
+    기사 ID 는 SQLite 색인에 영구 보관되어 이미 저장된 기사는 파일에 쓰기 전에 걸러지며,
+    기존 CSV 에는 헤더 한 줄만 읽고 새 행을 이어 씁니다.
+    예외로 업그레이드 이전의 파일에 없는 컬럼(Keywords / Lang 등)이 새 기사에 있으면,
+    그 파일만 한 번 읽어 컬럼을 늘린 헤더로 임시 파일에 쓴 뒤 os.replace 로 교체합니다 (이후에는 다시 이어 쓰기).
+    """
+
+    def __init__(self, data_dir=DATA_DIR, index_path=ARTICLE_INDEX_DB):
+        self.data_dir = data_dir
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        index_dir = os.path.dirname(index_path)
+        if index_dir and not os.path.exists(index_dir):
+            os.makedirs(index_dir)
+        self.conn = sqlite3.connect(index_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_articles ("
+            " article_id TEXT PRIMARY KEY,"
+            " date TEXT NOT NULL,"
+            " link TEXT"
+            ")"
+        )
+        self.conn.commit()
+
+        # 색인 도입 이전에 저장된 CSV 가 있으면 최초 1회만 읽어 색인을 채움
+        if self.conn.execute("SELECT 1 FROM seen_articles LIMIT 1").fetchone() is None:
+            self.seed_from_csv()
+
+    def seed_from_csv(self):
+        """기존 daily_news_*.csv 의 기사 ID 를 색인에 등록 (색인이 비어 있을 때 한 번만 수행)"""
+        with self.conn:
+            for path in sorted(glob.glob(os.path.join(self.data_dir, "daily_news_*.csv"))):
+                date_str = os.path.basename(path)[len("daily_news_"):-len(".csv")]
+                try:
+                    df = pd.read_csv(path, encoding="utf-8-sig", usecols=["Title", "Link"])
+                except (pd.errors.EmptyDataError, ValueError):
+                    continue
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_articles (article_id, date, link) VALUES (?, ?, ?)",
+                    ((article_id(link, title), date_str, link) for title, link in
+                     zip(df["Title"].fillna(""), df["Link"].fillna(""))),
+                )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def daily_path(self, date_str):
+        return os.path.join(self.data_dir, f"daily_news_{date_str}.csv")
+
+    def append(self, articles, date_str):
+        """
+        기사 목록(dict 리스트) 중 처음 보는 기사만 daily_news_{date_str}.csv 에 추가하고 추가된 DataFrame 을 반환.
+        색인 등록과 파일 추가는 하나의 트랜잭션으로 처리되어, 파일 쓰기가 실패하면 색인도 되돌립니다.
+        """
+        new_rows = []
+        with self.conn:
+            for article in articles:
+                aid = article_id(article.get("Link"), article.get("Title"))
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO seen_articles (article_id, date, link) VALUES (?, ?, ?)",
+                    (aid, date_str, article.get("Link", "")),
+                )
+                if cursor.rowcount:
+                    new_rows.append(article)
+
+            if new_rows:
+                self._append_csv(pd.DataFrame(new_rows), self.daily_path(date_str))
+
+        return pd.DataFrame(new_rows)
+
+    def _append_csv(self, df, path):
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # 헤더 한 줄만 읽어 기존 파일의 컬럼 순서에 맞춤 (본문은 읽지 않음)
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                header = next(csv.reader(f), ARTICLE_COLUMNS)
+            added = [c for c in df.columns if c not in header]
+            if added:
+                # 업그레이드 이전에 만들어진 파일(예: Keywords / Lang 컬럼 없음)에 새 컬럼이 버려지지 않도록
+                # 기존 행을 읽어 컬럼을 늘린 헤더로 파일을 다시 씀 (하루치 파일이라 크지 않음)
+                print(f"  ℹ️ '{path}' 헤더에 없는 컬럼 {added} 이(가) 있어 컬럼을 추가하여 파일을 다시 씁니다.")
+                existing = pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+                combined = pd.concat([existing, df], ignore_index=True).reindex(columns=header + added)
+                tmp_path = path + ".tmp"
+                combined.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+                os.replace(tmp_path, path)
+                return
+            df = df.reindex(columns=header)
+            # BOM 은 파일 맨 앞에 한 번만 있어야 하므로 이어 쓸 때는 utf-8 로 기록
+            df.to_csv(path, mode="a", header=False, index=False, encoding="utf-8")
+        else:
+            columns = ARTICLE_COLUMNS + [c for c in df.columns if c not in ARTICLE_COLUMNS]
+            df.reindex(columns=columns).to_csv(path, index=False, encoding="utf-8-sig")
@@ -0,0 +1,253 @@
+# pipeline_runner.py
+
+import argparse
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import pandas as pd
+
+from config import (AI_ANALYSIS_REPORT_DIR, ANALYSIS_NUM_WORKERS, GEMINI_INSIGHT_MODE, PIPELINE_CHECKPOINT_DIR,
+                    PIPELINE_MAX_WORKERS, REPORT_WINDOWS)
+from ai_trend_analyzer import analyze_report, save_insights
+from daily_news_collector import collect_daily_news
+from gemini_ai_trend_analyzer import INSIGHT_FAILURE_PREFIX, generate_overall_insight, save_overall_insight
+from metrics import export_run_report, get_metrics
+from trend_engine import spiking_keywords
+from weekly_report_generator import generate_report
+
+
+class Stage:
+    """파이프라인 단계: func(입력 dict) -> 결과. 입력 dict 에는 deps 단계들의 결과가 이름별로 들어감"""
+
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+class StageCheckpoint:
+    """
+    실행 ID 별 폴더에 단계 결과를 저장하여, 실패한 실행을 다시 돌리면 완료된 단계는 다시 계산하지 않도록 함.
+    DataFrame 은 parquet (불가능하면 pickle), 문자열은 txt, 그 외는 pickle 로 저장
+    """
+
+    def __init__(self, run_id, checkpoint_dir=PIPELINE_CHECKPOINT_DIR):
+        self.dir = os.path.join(checkpoint_dir, run_id)
+        os.makedirs(self.dir, exist_ok=True)
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = {}
+
+    def is_done(self, name):
+        entry = self.manifest.get(name)
+        return bool(entry) and (entry["kind"] == "none" or os.path.exists(os.path.join(self.dir, entry["file"])))
+
+    def load(self, name):
+        entry = self.manifest[name]
+        path = os.path.join(self.dir, entry["file"]) if entry["file"] else None
+        if entry["kind"] == "parquet":
+            return pd.read_parquet(path)
+        if entry["kind"] == "text":
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        if entry["kind"] == "pickle":
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        return None
+
+    def save(self, name, value, seconds):
+        kind, file_name = "none", None
+        if isinstance(value, pd.DataFrame):
+            kind, file_name = "parquet", f"{name}.parquet"
+            parquet_tmp = os.path.join(self.dir, file_name + ".tmp")
+            try:
+                value.to_parquet(parquet_tmp, index=False)
+            except Exception:
+                # parquet 으로 표현할 수 없는 컬럼(혼합 타입 등)이 있으면 pickle 로 저장 (쓰다 만 파일은 삭제)
+                if os.path.exists(parquet_tmp):
+                    os.remove(parquet_tmp)
+                kind, file_name = "pickle", f"{name}.pkl"
+        elif isinstance(value, str):
+            kind, file_name = "text", f"{name}.txt"
+            with open(os.path.join(self.dir, file_name + ".tmp"), "w", encoding="utf-8") as f:
+                f.write(value)
+        elif value is not None:
+            kind, file_name = "pickle", f"{name}.pkl"
+
+        if kind == "pickle":
+            with open(os.path.join(self.dir, file_name + ".tmp"), "wb") as f:
+                pickle.dump(value, f)
+        if file_name:
+            os.replace(os.path.join(self.dir, file_name + ".tmp"), os.path.join(self.dir, file_name))
+
+        self.manifest[name] = {"kind": kind, "file": file_name, "seconds": round(seconds, 3),
+                               "finished_at": datetime.now().isoformat(timespec="seconds")}
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def run_pipeline(stages, run_id, checkpoint_dir=PIPELINE_CHECKPOINT_DIR, max_workers=PIPELINE_MAX_WORKERS,
+                 force=(), skip=()):
+    """
+    단계들을 의존 관계(DAG) 순서로 실행하고 {단계 이름: 상태}, {단계 이름: 결과} 를 반환.
+    - 서로 의존하지 않는 단계는 동시에 실행 (최대 max_workers 개)
+    - 결과는 메모리로 다음 단계에 전달하고, 완료될 때마다 체크포인트에 저장
+    - 체크포인트가 있는 단계는 다시 실행하지 않음 (force 에 포함되었거나 앞 단계가 새로 실행된 경우 제외)
+    - skip 단계는 실행하지 않고 결과를 None 으로 간주, 실패한 단계의 후속 단계는 'blocked'
+    """
+    checkpoint = StageCheckpoint(run_id, checkpoint_dir)
+    metrics = get_metrics()
+    outputs, status, fresh = {}, {}, set()
+    pending = list(stages)
+    running = {}
+
+    def schedule(executor):
+        progressed = True
+        while progressed:
+            progressed = False
+            for stage in list(pending):
+                if any(status.get(dep) in ("failed", "blocked") for dep in stage.deps):
+                    status[stage.name] = "blocked"
+                elif all(dep in outputs for dep in stage.deps):
+                    if stage.name in skip:
+                        outputs[stage.name], status[stage.name] = None, "skipped"
+                    elif (checkpoint.is_done(stage.name) and stage.name not in force
+                          and not any(dep in fresh for dep in stage.deps)):
+                        outputs[stage.name], status[stage.name] = checkpoint.load(stage.name), "resumed"
+                        print(f"♻️ [{stage.name}] 체크포인트 결과를 사용합니다.")
+                    else:
+                        print(f"▶ [{stage.name}] 시작")
+                        inputs = {dep: outputs[dep] for dep in stage.deps}
+                        running[executor.submit(_timed, stage.func, inputs)] = stage
+                        status[stage.name] = "running"
+                else:
+                    continue
+                pending.remove(stage)
+                progressed = True
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        schedule(executor)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    value, seconds = future.result()
+                except Exception as e:
+                    status[stage.name] = "failed"
+                    metrics.inc("pipeline_stage_failures", stage=stage.name)
+                    print(f"❌ [{stage.name}] 실패: {e}")
+                    continue
+                checkpoint.save(stage.name, value, seconds)
+                outputs[stage.name], status[stage.name] = value, "done"
+                fresh.add(stage.name)
+                metrics.observe("pipeline_stage", seconds, stage=stage.name)
+                print(f"✅ [{stage.name}] 완료 ({seconds:.1f}초)")
+            schedule(executor)
+
+    for stage in pending:
+        status.setdefault(stage.name, "blocked")
+    return status, outputs
+
+
+def _timed(func, inputs):
+    start = time.perf_counter()
+    value = func(inputs)
+    return value, time.perf_counter() - start
+
+
+def build_stages(window="weekly", export_format="none", output_dir=AI_ANALYSIS_REPORT_DIR,
+                 gemini_mode=GEMINI_INSIGHT_MODE, end_date=None, analysis_workers=ANALYSIS_NUM_WORKERS):
+    """
+    수집 → 기간 보고서 취합 → (영어 요약 / Gemini 종합 인사이트 동시 실행) 단계 목록.
+    analysis_workers: 각 분석 단계가 요약·번역을 나누어 실행할 프로세스 수
+    """
+    end_date = end_date or datetime.now()
+    report_stem = f"{window}_security_report_{end_date.strftime('%Y-%m-%d')}"
+    # 분석 단계에서 우선 다룰 급증 키워드 (수집 단계가 집계를 갱신한 뒤 조회)
+    focus = {}
+
+    def focus_keywords():
+        if "keywords" not in focus:
+            focus["keywords"] = spiking_keywords(end_date, REPORT_WINDOWS[window])
+        return focus["keywords"]
+
+    def collect(inputs):
+        return collect_daily_news()
+
+    def aggregate(inputs):
+        # 보고서 파일은 선택 사항이며, 분석 단계에는 DataFrame 이 그대로 전달됨
+        return generate_report(window, end_date=end_date, export_format=export_format)
+
+    def analyze_en(inputs):
+        report_df = inputs["aggregate"]
+        if report_df is None or report_df.empty:
+            return None
+        output_df = analyze_report(report_df, focus_keywords=focus_keywords(), num_workers=analysis_workers)
+        save_insights(output_df, report_stem, output_dir)
+        return output_df
+
+    def analyze_gemini(inputs):
+        report_df = inputs["aggregate"]
+        if report_df is None or report_df.empty:
+            return None
+        overall_summary = generate_overall_insight(report_df, gemini_mode, focus_keywords(), analysis_workers)
+        if overall_summary is None:
+            raise RuntimeError("Gemini 모델을 로드하지 못했습니다.")
+        if overall_summary.startswith(INSIGHT_FAILURE_PREFIX):
+            # 실패 결과는 체크포인트에 남기지 않아 다음 실행에서 이 단계만 다시 시도
+            raise RuntimeError(overall_summary)
+        save_overall_insight(overall_summary, report_stem, output_dir)
+        return overall_summary
+
+    return [
+        Stage("collect", collect),
+        Stage("aggregate", aggregate, deps=["collect"]),
+        Stage("analyze_en", analyze_en, deps=["aggregate"]),
+        Stage("analyze_gemini", analyze_gemini, deps=["aggregate"]),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="수집 → 취합 → AI 분석 전체 파이프라인을 한 프로세스에서 실행")
+    parser.add_argument("window", nargs="?", default="weekly", choices=sorted(REPORT_WINDOWS))
+    parser.add_argument("--run-id", help="체크포인트 실행 ID (기본: <날짜>_<기간>, 같은 ID 로 다시 실행하면 이어서 진행)")
+    parser.add_argument("--export", dest="export_format", default="none", choices=["csv", "parquet", "both", "none"],
+                        help="기간 보고서 파일 저장 형식 (기본: 저장하지 않음)")
+    parser.add_argument("--output-dir", default=AI_ANALYSIS_REPORT_DIR, help="AI 분석 결과 저장 폴더")
+    parser.add_argument("--mode", default=GEMINI_INSIGHT_MODE, choices=["auto", "single", "map_reduce"])
+    parser.add_argument("--skip", nargs="*", default=[], choices=["collect", "analyze_en", "analyze_gemini"],
+                        help="실행하지 않을 단계")
+    parser.add_argument("--force", nargs="*", default=[], choices=["collect", "aggregate", "analyze_en", "analyze_gemini"],
+                        help="체크포인트가 있어도 다시 실행할 단계 (후속 단계도 다시 실행됨)")
+    parser.add_argument("--max-workers", type=int, default=PIPELINE_MAX_WORKERS)
+    parser.add_argument("--analysis-workers", type=int, default=ANALYSIS_NUM_WORKERS,
+                        help="분석 단계의 요약·번역을 나누어 실행할 프로세스 수")
+    args = parser.parse_args()
+
+    run_end_date = datetime.now()
+    run_id = args.run_id or f"{run_end_date.strftime('%Y-%m-%d')}_{args.window}"
+    print(f"[{run_end_date.strftime('%Y-%m-%d %H:%M:%S')}] 파이프라인 실행: {run_id}")
+
+    pipeline_stages = build_stages(args.window, args.export_format, args.output_dir, args.mode, run_end_date,
+                                   args.analysis_workers)
+    stage_status, _ = run_pipeline(pipeline_stages, run_id, max_workers=args.max_workers,
+                                   force=set(args.force), skip=set(args.skip))
+    export_run_report("pipeline")
+
+    print("\n--- 단계별 결과 ---")
+    for stage_name, stage_state in stage_status.items():
+        print(f"  {stage_name}: {stage_state}")
+    if any(state in ("failed", "blocked") for state in stage_status.values()):
+        raise SystemExit(1)
@@ -0,0 +1,137 @@
+# result_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from config import RESULT_CACHE_DB, RESULT_CACHE_MAX_BYTES
+
+
+def normalize_text(text):
+    """캐시 키용 본문 정규화 (앞뒤 공백 제거, 연속 공백을 하나로)"""
+    return " ".join(str(text).split())
+
+
+def cache_key(text, model_id, prompt_version):
+    """(정규화된 본문, 모델/번역기 ID, 프롬프트 버전)의 SHA-256"""
+    raw = "\x1f".join((model_id, prompt_version, normalize_text(text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    AI 인사이트·번역 결과를 본문 해시로 저장하는 로컬 SQLite 캐시.
+    전체 크기가 max_bytes 를 넘으면 가장 오래 사용되지 않은 항목부터 삭제(LRU)하며,
+    적중/미스 횟수를 누적 기록합니다.
+    """
+
+    def __init__(self, path=RESULT_CACHE_DB, max_bytes=RESULT_CACHE_MAX_BYTES):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " model_id TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL"
+                ")"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def close(self):
+        self.flush_counters()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_many(self, texts, model_id, prompt_version):
+        """여러 본문의 캐시 결과를 입력 순서대로 반환 (없는 항목은 None)"""
+        keys = [cache_key(text, model_id, prompt_version) for text in texts]
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self.conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({placeholders})", chunk).fetchall())
+            if found:
+                now = time.time()
+                with self.conn:
+                    self.conn.executemany("UPDATE results SET last_access = ? WHERE key = ?",
+                                          ((now, key) for key in found))
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, texts, model_id, prompt_version, values):
+        """결과를 저장한 뒤 크기 한도를 넘으면 LRU 순으로 정리"""
+        now = time.time()
+        rows = [(cache_key(text, model_id, prompt_version), model_id, value, len(value.encode("utf-8")), now)
+                for text, value in zip(texts, values)]
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (key, model_id, value, size, last_access) VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 한도의 90% 까지 줄여 저장할 때마다 정리가 반복되지 않도록 함
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._add_counter("evictions", evicted)
+
+    def _add_counter(self, name, amount):
+        if amount:
+            self.conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, amount))
+
+    def flush_counters(self):
+        """이번 실행의 적중/미스 횟수를 누적 카운터에 반영"""
+        with self._lock, self.conn:
+            self._add_counter("hits", self.hits)
+            self._add_counter("misses", self.misses)
+            self.hits = self.misses = 0
+
+
+def cached_map(cache, texts, model_id, prompt_version, compute, should_store=None):
+    """
+    캐시에 없는 본문만 compute(미스 목록) 로 계산하고 결과를 입력 순서대로 반환.
+    결과가 None 이거나 should_store(결과) 가 False 이면 실패로 보고 캐시에 저장하지 않습니다.
+    """
+    results = cache.get_many(texts, model_id, prompt_version)
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        computed = compute([texts[i] for i in missing])
+        for i, value in zip(missing, computed):
+            results[i] = value
+        stored = [(texts[i], value) for i, value in zip(missing, computed)
+                  if value is not None and (should_store is None or should_store(value))]
+        cache.put_many([text for text, _ in stored], model_id, prompt_version, [value for _, value in stored])
+    return results
@@ -0,0 +1,178 @@
+# sharded_analysis.py
+#
+# 주간 분석의 CPU 작업(영어 요약, 언어 판정, 한국어 번역)을 기사 순서대로 shard 로 나누어 여러 프로세스에서 실행.
+# - 각 워커 프로세스는 initializer 에서 모델(또는 번역기)을 한 번만 로드하고, 연산 스레드 수를 코어 / 워커 수로 제한
+# - 결과는 shard 번호 순서로 합쳐 원래 기사 순서를 유지
+# - 워커가 비정상 종료되면(BrokenProcessPool) 풀을 다시 만들고 끝나지 않은 shard 만 재시도
+
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+import pandas as pd
+
+from config import ANALYSIS_SHARD_MAX_RETRIES, ANALYSIS_SHARDS_PER_WORKER, SUMMARIZER_BACKEND, SUMMARY_NUM_THREADS
+from metrics import get_metrics
+
+
+def threads_per_worker(num_workers, num_threads=SUMMARY_NUM_THREADS):
+    """워커당 연산 스레드 수 (지정하지 않으면 전체 코어를 워커 수로 나눔, 스레드 과다 경쟁 방지)"""
+    return num_threads or max(1, (os.cpu_count() or 1) // num_workers)
+
+
+def split_shards(items, num_workers, min_shard_size=1, shards_per_worker=ANALYSIS_SHARDS_PER_WORKER):
+    """
+    items 를 순서를 유지한 연속 구간(shard) 목록으로 분할.
+    워커당 여러 개의 shard 로 나누어 처리 시간이 고르지 않아도 부하가 분산되고, 워커 장애 시 재시도 범위가 작아짐
+    """
+    if not items:
+        return []
+    shard_size = max(min_shard_size, math.ceil(len(items) / (num_workers * shards_per_worker)))
+    return [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+
+def run_sharded(shards, shard_func, num_workers, initializer=None, initargs=(), shard_args=(),
+                max_retries=ANALYSIS_SHARD_MAX_RETRIES, on_failure=None, label="shard"):
+    """
+    shard_func(shard, *shard_args) -> 결과 목록 을 프로세스 풀에서 실행하고 결과를 shard 순서대로 이어 붙여 반환.
+    - 워커 장애로 풀이 깨지면 완료된 shard 결과는 유지하고, 새 풀에서 남은 shard 만 다시 실행
+    - max_retries 번 재시도해도 실패한 shard 는 on_failure(shard, error) 의 반환값으로 채움 (없으면 예외 발생)
+    shard_func / initializer 는 spawn 된 프로세스에서 import 할 수 있는 모듈 최상위 함수여야 합니다.
+    """
+    metrics = get_metrics()
+    results = [None] * len(shards)
+    attempts = [0] * len(shards)
+    pending = list(range(len(shards)))
+    context = get_context("spawn")
+
+    def give_up(index, error):
+        if on_failure is None:
+            raise RuntimeError(f"{label} {index + 1}/{len(shards)} 처리 실패: {error}") from error
+        metrics.inc("shard_failures", stage=label)
+        print(f"  ❌ {label} {index + 1}/{len(shards)} 처리 실패 ({error}), 결과를 실패로 기록합니다.")
+        results[index] = on_failure(shards[index], error)
+
+    while pending:
+        broken = None
+        with ProcessPoolExecutor(max_workers=min(num_workers, len(pending)), mp_context=context,
+                                 initializer=initializer, initargs=initargs) as executor:
+            running = {executor.submit(_timed_shard, shard_func, shards[i], shard_args): i for i in pending}
+            pending = []
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        value, seconds = future.result()
+                    except BrokenProcessPool as e:
+                        broken = e
+                        pending.append(index)
+                        continue
+                    except Exception as e:
+                        attempts[index] += 1
+                        metrics.inc("shard_retries", stage=label)
+                        if attempts[index] > max_retries:
+                            give_up(index, e)
+                        else:
+                            print(f"  ⚠️ {label} {index + 1}/{len(shards)} 실패 ({e}), 다시 시도합니다.")
+                            try:
+                                running[executor.submit(_timed_shard, shard_func, shards[index], shard_args)] = index
+                            except BrokenProcessPool:
+                                pending.append(index)
+                        continue
+                    results[index] = value
+                    metrics.observe("shard", seconds, stage=label)
+
+        if broken is not None:
+            # 어느 shard 가 워커를 죽였는지 알 수 없으므로 끝나지 않은 shard 모두 시도 횟수를 올림
+            print(f"  ⚠️ 워커 프로세스가 비정상 종료되었습니다 ({broken}). 남은 {label} {len(pending)}개를 새 워커로 다시 실행합니다.")
+            metrics.inc("shard_pool_restarts", stage=label)
+            retry = []
+            for index in sorted(pending):
+                attempts[index] += 1
+                metrics.inc("shard_retries", stage=label)
+                if attempts[index] > max_retries:
+                    give_up(index, broken)
+                else:
+                    retry.append(index)
+            pending = retry
+
+    return [item for shard_result in results for item in shard_result]
+
+
+def _timed_shard(shard_func, shard, shard_args):
+    start = time.perf_counter()
+    value = shard_func(shard, *shard_args)
+    if len(value) != len(shard):
+        raise ValueError(f"shard 결과 수({len(value)})가 입력 수({len(shard)})와 다릅니다.")
+    return value, time.perf_counter() - start
+
+
+# 🔹 영어 요약 (워커마다 모델 1회 로드)
+_worker_summarizer = None
+
+
+def _init_summarizer(backend, num_threads):
+    global _worker_summarizer
+    # torch 가 import 되기 전에 OpenMP 스레드 수를 제한해야 워커 간 과다 경쟁이 생기지 않음
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    from summarizer_backends import load_summarizer
+
+    _worker_summarizer = load_summarizer(backend, num_threads=num_threads)
+
+
+def _summarize_shard(texts, batch_size):
+    from ai_trend_analyzer import summarize_batched
+
+    return summarize_batched(_worker_summarizer, texts, batch_size)
+
+
+def summarize_sharded(texts, num_workers, batch_size, backend=SUMMARIZER_BACKEND, num_threads=SUMMARY_NUM_THREADS):
+    """영어 요약을 num_workers 개 프로세스로 나누어 실행하고 입력 순서대로 요약 목록 반환"""
+    threads = threads_per_worker(num_workers, num_threads)
+    shards = split_shards(list(texts), num_workers, min_shard_size=batch_size)
+    print(f"  🔀 {len(texts)}건을 {len(shards)}개 shard 로 나누어 워커 {num_workers}개에서 요약합니다 "
+          f"(워커당 스레드 {threads}개).")
+    return run_sharded(shards, _summarize_shard, num_workers, initializer=_init_summarizer,
+                       initargs=(backend, threads), shard_args=(batch_size,), label="summarize",
+                       on_failure=lambda shard, error: [f"(Insight extraction failed: {error})"] * len(shard))
+
+
+# 🔹 언어 판정 (langdetect 가 필요한 애매한 기사가 많을 때)
+def _route_shard(records):
+    from lang_router import route_languages
+
+    return route_languages(pd.DataFrame.from_records(records)).tolist()
+
+
+def route_languages_sharded(df, num_workers):
+    """route_languages 를 기사 shard 별로 여러 프로세스에서 실행한 언어 Series (df 와 같은 index)"""
+    columns = [c for c in ("Title", "Summary", "Source") if c in df.columns]
+    records = df[columns].to_dict("records")
+    langs = run_sharded(split_shards(records, num_workers), _route_shard, num_workers, label="lang_route",
+                        on_failure=lambda shard, error: ["unknown"] * len(shard))
+    return pd.Series(langs, index=df.index, dtype=object)
+
+
+# 🔹 한국어 → 영어 번역 (워커마다 번역기 1회 생성)
+def _init_translator():
+    from gemini_ai_trend_analyzer import get_translator
+
+    get_translator()
+
+
+def _translate_shard(contents):
+    from gemini_ai_trend_analyzer import translate_to_english
+
+    return translate_to_english(contents)
+
+
+def translate_sharded(contents, num_workers):
+    """한국어 본문 번역을 여러 프로세스로 나누어 실행 (실패한 항목·shard 는 None)"""
+    return run_sharded(split_shards(list(contents), num_workers), _translate_shard, num_workers,
+                       initializer=_init_translator, label="translate",
+                       on_failure=lambda shard, error: [None] * len(shard))
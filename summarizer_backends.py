@@ -0,0 +1,94 @@
+# summarizer_backends.py
+#
+# 영어 요약 모델의 CPU 추론 백엔드. 모든 백엔드는 transformers summarization pipeline 을 반환하므로
+# ai_trend_analyzer.summarize_batched 의 배치 경로를 그대로 사용합니다.
+#
+#   fp32       원본 모델 (기존 동작)
+#   int8       torch 동적 int8 양자화 (Linear 계층 가중치만 int8, 추가 설치 불필요)
+#   onnx       optimum 으로 ONNX 변환 후 ONNX Runtime 으로 추론 (pip install optimum[onnxruntime])
+#   distilled  증류된 작은 모델 (SUMMARIZER_DISTILLED_MODEL)
+#
+# 백엔드별 품질(fp32 대비)·처리량·최대 메모리 비교: python -m benchmarks.compare_summarizer_backends
+
+import os
+
+from config import SUMMARIZER_BACKEND, SUMMARIZER_DISTILLED_MODEL, SUMMARIZER_MODEL, SUMMARIZER_ONNX_DIR
+
+BACKENDS = ("fp32", "int8", "onnx", "distilled")
+
+
+def backend_model_name(backend=SUMMARIZER_BACKEND, model=SUMMARIZER_MODEL):
+    """백엔드가 실제로 불러오는 체크포인트 이름"""
+    return SUMMARIZER_DISTILLED_MODEL if backend == "distilled" else model
+
+
+def backend_model_id(backend=SUMMARIZER_BACKEND, model=SUMMARIZER_MODEL):
+    """
+    결과 캐시·지표에 쓰는 모델 식별자. 양자화/ONNX 는 출력이 조금씩 달라지므로 '모델@백엔드' 로 구분하고,
+    fp32 는 기존 캐시를 그대로 쓰도록 모델 이름만 사용
+    """
+    if backend in ("int8", "onnx"):
+        return f"{model}@{backend}"
+    return backend_model_name(backend, model)
+
+
+def _load_fp32(model, num_threads):
+    from transformers import pipeline
+    return pipeline("summarization", model=model, device=-1)
+
+
+def _load_int8(model, num_threads):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    fp32_model = AutoModelForSeq2SeqLM.from_pretrained(model).eval()
+    # 연산 대부분을 차지하는 Linear 계층만 가중치 int8, 활성값은 실행 시 양자화
+    quantized = torch.ao.quantization.quantize_dynamic(fp32_model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=quantized, tokenizer=tokenizer, device=-1)
+
+
+def _load_onnx(model, num_threads, onnx_dir=SUMMARIZER_ONNX_DIR):
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError("onnx 백엔드에는 optimum[onnxruntime] 설치가 필요합니다.") from e
+    from transformers import AutoTokenizer, pipeline
+
+    session_options = onnxruntime.SessionOptions()
+    if num_threads:
+        session_options.intra_op_num_threads = num_threads
+
+    # 변환은 처음 한 번만 수행하고 이후에는 저장된 ONNX 모델을 불러옴
+    export_dir = os.path.join(onnx_dir, model.replace("/", "__"))
+    if os.path.isdir(export_dir):
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=session_options)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        print(f"  ONNX 변환 중... ({model} -> {export_dir})")
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(model, export=True, session_options=session_options)
+        tokenizer = AutoTokenizer.from_pretrained(model)
+        ort_model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return pipeline("summarization", model=ort_model, tokenizer=tokenizer, device=-1)
+
+
+_LOADERS = {
+    "fp32": _load_fp32,
+    "int8": _load_int8,
+    "onnx": _load_onnx,
+    "distilled": _load_fp32,
+}
+
+
+def load_summarizer(backend=SUMMARIZER_BACKEND, model=SUMMARIZER_MODEL, num_threads=None):
+    """
+    선택한 백엔드의 요약 pipeline 을 로드하여 반환.
+    num_threads: torch / ONNX Runtime 연산 스레드 수 (None 이면 전체 CPU 코어)
+    """
+    if backend not in _LOADERS:
+        raise ValueError(f"알 수 없는 요약 백엔드: {backend} (선택 가능: {', '.join(BACKENDS)})")
+    import torch
+    torch.set_num_threads(num_threads or os.cpu_count() or 1)
+    return _LOADERS[backend](backend_model_name(backend, model), num_threads)
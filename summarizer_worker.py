@@ -0,0 +1,111 @@
+# summarizer_worker.py
+#
+# 요약 모델을 메모리에 올려둔 채 localhost HTTP 로 요약 요청을 받는 상주 워커.
+# 워커를 한 번 띄워두면 ai_trend_analyzer 실행 시 torch / 모델 로드 없이 바로 요약 결과를 받습니다.
+#
+#   python summarizer_worker.py            # 워커 실행 (모델 로드 후 대기)
+#   python ai_trend_analyzer.py            # 워커가 떠 있으면 자동으로 워커 사용
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import SUMMARIZER_WORKER_HOST, SUMMARIZER_WORKER_PORT, SUMMARIZER_WORKER_TIMEOUT
+
+
+def worker_url(path="", host=SUMMARIZER_WORKER_HOST, port=SUMMARIZER_WORKER_PORT):
+    return f"http://{host}:{port}{path}"
+
+
+def request_summaries(texts, batch_size, host=SUMMARIZER_WORKER_HOST, port=SUMMARIZER_WORKER_PORT,
+                      timeout=SUMMARIZER_WORKER_TIMEOUT):
+    """워커에 요약을 요청하여 결과 목록을 반환 (워커가 실행 중이 아니면 None)"""
+    # 워커 존재 여부는 짧은 타임아웃의 상태 확인으로 판단
+    try:
+        with urllib.request.urlopen(worker_url("/health", host, port), timeout=0.5) as response:
+            if response.status != 200:
+                return None
+    except (urllib.error.URLError, OSError):
+        return None
+
+    payload = json.dumps({"texts": texts, "batch_size": batch_size}).encode("utf-8")
+    request = urllib.request.Request(worker_url("/summarize", host, port), data=payload,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))["summaries"]
+    except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+        print(f"  ⚠️ 요약 워커 요청 실패 ({e}), 로컬에서 처리합니다.")
+        return None
+
+
+def make_handler(summarize):
+    """summarize(texts, batch_size) -> list[str] 를 호출하는 요청 핸들러 생성"""
+    # 모델은 한 번에 한 요청만 처리 (torch 가 이미 모든 코어를 사용하므로 동시 실행 이득이 없음)
+    lock = threading.Lock()
+
+    class SummarizerHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/summarize":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length).decode("utf-8"))
+                texts = [str(text) for text in request["texts"]]
+                batch_size = int(request.get("batch_size", 8))
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"invalid request: {e}"})
+                return
+
+            try:
+                with lock:
+                    summaries = summarize(texts, batch_size)
+            except Exception as e:
+                # 연결을 끊지 않고 오류를 응답하여 클라이언트가 로컬 처리로 넘어가도록 함
+                print(f"  ❌ 요약 요청 처리 실패: {e}")
+                self._send_json(500, {"error": f"summarization failed: {e}"})
+                return
+            self._send_json(200, {"summaries": summaries})
+
+        def log_message(self, format, *args):
+            pass
+
+    return SummarizerHandler
+
+
+def serve(host=SUMMARIZER_WORKER_HOST, port=SUMMARIZER_WORKER_PORT):
+    """모델을 미리 로드한 뒤 요청을 기다림 (Ctrl+C 로 종료)"""
+    # ai_trend_analyzer 가 이 모듈의 클라이언트 함수를 import 하므로 순환 import 를 피해 여기서 import
+    from ai_trend_analyzer import get_summarizer, summarize_batched
+
+    summarizer = get_summarizer()
+    server = ThreadingHTTPServer((host, port), make_handler(
+        lambda texts, batch_size: summarize_batched(summarizer, texts, batch_size)))
+    print(f"요약 워커 대기 중: {worker_url('', host, port)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("요약 워커 종료.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,33 @@
+# test_ai_trend_analyzer.py
+
+import pandas as pd
+
+import ai_trend_analyzer
+from ai_trend_analyzer import SUMMARIZER_MODEL_ID, analyze_report
+from metrics import get_metrics
+
+REPORT = pd.DataFrame({
+    "Title": ["Lazarus targets exchanges", "MOVEit flaw exploited"],
+    "Summary": ["North Korean hackers breached two cryptocurrency exchanges this week.",
+                "Attackers are exploiting a new SQL injection flaw in MOVEit Transfer servers."],
+    "Link": ["https://example.com/1", "https://example.com/2"],
+    "Source": ["Example", "Example"],
+    "Lang": ["en", "en"],
+})
+
+
+def test_analyze_report_exports_result_cache_counters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ai_trend_analyzer, "summarize_texts",
+                        lambda texts, batch_size, num_workers: [f"insight {i}" for i in range(len(texts))])
+    metrics = get_metrics()
+    metrics.reset()
+
+    analyze_report(REPORT, num_workers=1)
+    assert metrics.value("result_cache_misses", model=SUMMARIZER_MODEL_ID) == 2
+
+    metrics.reset()
+    result = analyze_report(REPORT, num_workers=1)
+    assert metrics.value("result_cache_hits", model=SUMMARIZER_MODEL_ID) == 2
+    assert metrics.value("result_cache_misses", model=SUMMARIZER_MODEL_ID) == 0
+    assert result["ai_insight"].tolist() == ["insight 0", "insight 1"]
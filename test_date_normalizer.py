@@ -0,0 +1,56 @@
+# test_date_normalizer.py
+
+from datetime import datetime
+
+import feedparser
+import pytest
+
+from date_normalizer import KST, DateNormalizer
+
+
+def _normalize(published, feed="feed", normalizer=None):
+    """feedparser 가 만드는 것과 같은 (published, published_parsed) 로 정규화"""
+    entry = feedparser.parse(f"<rss><channel><item><pubDate>{published}</pubDate></item></channel></rss>").entries[0]
+    normalizer = normalizer or DateNormalizer(cache_path=None)
+    return normalizer.normalize(feed, entry.get("published"), entry.get("published_parsed"))
+
+
+@pytest.mark.parametrize("published, expected", [
+    # 시간대가 없는 국내 형식은 KST
+    ("2025-10-14 10:00:00", datetime(2025, 10, 14, 10, 0)),
+    ("2025-10-14", datetime(2025, 10, 14, 0, 0)),
+    ("2025.10.14 10:00:00", datetime(2025, 10, 14, 10, 0)),
+    ("2025.10.14", datetime(2025, 10, 14, 0, 0)),
+    ("2025/10/14 10:00:00", datetime(2025, 10, 14, 10, 0)),
+    ("2025년 10월 14일 10:00", datetime(2025, 10, 14, 10, 0)),
+    # 시간대가 있으면 KST 로 변환, -0000 과 알 수 없는 약어는 UTC
+    ("Tue, 14 Oct 2025 10:00:00 +0900", datetime(2025, 10, 14, 10, 0)),
+    ("Tue, 14 Oct 2025 10:00:00 GMT", datetime(2025, 10, 14, 19, 0)),
+    ("Tue, 14 Oct 2025 10:00:00 -0000", datetime(2025, 10, 14, 19, 0)),
+    ("Tue, 14 Oct 2025 10:00:00 CEST", datetime(2025, 10, 14, 19, 0)),
+    ("2025-10-14T10:00:00+02:00", datetime(2025, 10, 14, 17, 0)),
+])
+def test_normalize_to_kst(published, expected):
+    parsed, _ = _normalize(published)
+    assert parsed == expected.replace(tzinfo=KST)
+
+
+def test_learned_format_is_reused_and_saved(tmp_path):
+    cache_path = str(tmp_path / "date_formats.json")
+    normalizer = DateNormalizer(cache_path)
+    assert _normalize("2025.10.14 10:00:00", normalizer=normalizer)[1] == "strict"
+    assert _normalize("2025.10.15 11:30:00", normalizer=normalizer)[1] == "cached"
+    normalizer.save()
+
+    assert DateNormalizer(cache_path).formats == {"feed": "%Y.%m.%d %H:%M:%S"}
+
+
+def test_dateutil_fallback_is_not_remembered():
+    normalizer = DateNormalizer(cache_path=None)
+    assert normalizer.normalize("feed", "October 14th, 2025 10:00 AM")[1] == "dateutil"
+    assert normalizer.formats == {}
+    assert _normalize("2025.10.14 10:00", normalizer=normalizer)[1] == "strict"
+
+
+def test_unparseable_date_returns_none():
+    assert DateNormalizer(cache_path=None).normalize("feed", "not a date") == (None, None)
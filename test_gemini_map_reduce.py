@@ -0,0 +1,65 @@
+# test_gemini_map_reduce.py
+
+import os
+import threading
+
+import pytest
+
+from gemini_map_reduce import RateLimiter, chunk_articles, estimate_tokens, map_reduce_insight
+
+ARTICLES = [f"--- Article {i} ---\nTitle: Ransomware {i}\nBody: " + "lazarus moveit " * 40 for i in range(30)]
+
+
+def _reduce_prompt(partial_text):
+    return "Summarize:\n" + partial_text
+
+
+class FakeGemini:
+    """호출한 프롬프트를 기록하고, fail_after 번째 호출부터 실패하는 generate 대역"""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self._lock:
+            if self.fail_after is not None and len(self.prompts) >= self.fail_after:
+                raise ValueError("interrupted")
+            self.prompts.append(prompt)
+        return f"partial ({len(prompt)} chars)"
+
+
+def _run(generate, checkpoint_dir, token_budget=1000, reduce_prompt=_reduce_prompt):
+    return map_reduce_insight(ARTICLES, generate, reduce_prompt, token_budget=token_budget,
+                              rate_limiter=RateLimiter(requests_per_minute=0), checkpoint_dir=str(checkpoint_dir))
+
+
+def test_resume_reuses_completed_chunks_and_removes_checkpoint(tmp_path):
+    chunks = len(chunk_articles(ARTICLES, 1000))
+    assert chunks > 2
+
+    with pytest.raises(RuntimeError):
+        _run(FakeGemini(fail_after=2), tmp_path)
+    assert len(os.listdir(tmp_path)) == 1
+
+    resumed = FakeGemini()
+    _run(resumed, tmp_path)
+    # 남은 map 청크 + reduce 1회만 호출
+    assert len(resumed.prompts) == chunks - 2 + 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_changed_reduce_prompt_does_not_resume(tmp_path):
+    with pytest.raises(RuntimeError):
+        _run(FakeGemini(fail_after=2), tmp_path)
+
+    fresh = FakeGemini()
+    _run(fresh, tmp_path, reduce_prompt=lambda text: "Focus on Lazarus.\n" + _reduce_prompt(text))
+    assert len(fresh.prompts) == len(chunk_articles(ARTICLES, 1000)) + 1
+
+
+def test_every_prompt_stays_within_budget(tmp_path):
+    gemini = FakeGemini()
+    _run(gemini, tmp_path, token_budget=600)
+    assert max(estimate_tokens(prompt) for prompt in gemini.prompts) <= 600
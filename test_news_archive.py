@@ -0,0 +1,54 @@
+# test_news_archive.py
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+import news_archive
+from news_archive import append_to_archive, compact_archive, compact_partition, load_window
+
+
+def _articles(start, count, date="2025-10-14"):
+    return pd.DataFrame([{"Date": date, "Time": f"10:{n % 60:02d}:00", "Title": f"Title {n}",
+                          "Link": f"https://example.com/{n}", "Summary": "", "Source": "Example",
+                          "Keywords": "ransomware", "Lang": "en"} for n in range(start, start + count)])
+
+
+def _parts(archive_dir, date="2025-10-14"):
+    return glob.glob(os.path.join(archive_dir, f"date={date}", "*.parquet"))
+
+
+def test_compact_archive_merges_partitions_with_enough_parts(tmp_path):
+    archive_dir = str(tmp_path)
+    for run in range(3):
+        append_to_archive(_articles(run * 2, 2), archive_dir)
+    append_to_archive(_articles(100, 1, date="2025-10-13"), archive_dir)
+
+    assert compact_archive(min_parts=3, archive_dir=archive_dir) == 1
+    assert len(_parts(archive_dir)) == 1
+    assert len(_parts(archive_dir, "2025-10-13")) == 1
+    assert len(load_window("2025-10-13", "2025-10-14", archive_dir=archive_dir)) == 7
+
+
+def test_compact_partition_keeps_data_when_interrupted(tmp_path, monkeypatch):
+    archive_dir = str(tmp_path)
+    append_to_archive(_articles(0, 2), archive_dir)
+    append_to_archive(_articles(2, 2), archive_dir)
+
+    def fail(path):
+        raise OSError("interrupted")
+
+    # 합친 파일을 게시한 뒤 기존 파일을 지우다가 중단된 경우
+    monkeypatch.setattr(news_archive.os, "remove", fail)
+    with pytest.raises(OSError):
+        compact_partition("2025-10-14", archive_dir)
+    monkeypatch.undo()
+    assert set(load_window("2025-10-14", "2025-10-14", archive_dir=archive_dir)["Title"]) == {
+        f"Title {n}" for n in range(4)}
+
+    # 다음 합치기에서 남은 중복이 제거됨
+    compact_partition("2025-10-14", archive_dir)
+    assert len(_parts(archive_dir)) == 1
+    assert len(load_window("2025-10-14", "2025-10-14", archive_dir=archive_dir)) == 4
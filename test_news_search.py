@@ -0,0 +1,45 @@
+# test_news_search.py
+
+import pandas as pd
+import pytest
+
+from news_search import NewsSearchIndex, build_match_query, to_index_text
+
+
+def test_korean_words_are_indexed_as_bigrams():
+    assert to_index_text("랜섬웨어가") == " 랜섬 섬웨 웨어 어가 "
+    assert build_match_query("랜섬웨어") == '"랜섬 섬웨 웨어"'
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Lazarus MOVEit", '"lazarus" "moveit"'),
+    ("Lazarus OR MOVEit", '"lazarus" OR "moveit"'),
+    ("lazarus NOT moveit", '"lazarus" NOT "moveit"'),
+    ("lazarus AND NOT moveit", '"lazarus" NOT "moveit"'),
+    ('"supply chain" ransom*', '"supply chain" "ransom"*'),
+    ('"not" lazarus', '"not" "lazarus"'),
+])
+def test_build_match_query(query, expected):
+    assert build_match_query(query) == expected
+
+
+@pytest.mark.parametrize("query", ["NOT lazarus", "OR lazarus", "lazarus OR OR moveit", "lazarus NOT AND moveit",
+                                   "lazarus NOT"])
+def test_dangling_operators_are_rejected(query):
+    with pytest.raises(ValueError):
+        build_match_query(query)
+
+
+def test_search_excludes_not_terms(tmp_path):
+    articles = pd.DataFrame({
+        "Date": ["2025-10-14"] * 3,
+        "Time": ["10:00:00"] * 3,
+        "Title": ["Lazarus hits exchange", "Lazarus exploits MOVEit", "랜섬웨어가 병원을 공격"],
+        "Link": [f"https://example.com/{i}" for i in range(3)],
+        "Summary": ["", "", ""],
+        "Source": ["Example"] * 3,
+    })
+    with NewsSearchIndex(str(tmp_path / "search.sqlite3")) as index:
+        assert index.add_articles(articles) == 3
+        assert index.search("lazarus AND NOT moveit")["Title"].tolist() == ["Lazarus hits exchange"]
+        assert index.search("랜섬웨어 병원")["Title"].tolist() == ["랜섬웨어가 병원을 공격"]
@@ -0,0 +1,42 @@
+# test_news_store.py
+
+import os
+
+import pandas as pd
+
+from news_store import NewsStore, article_id
+
+
+def _article(n, **extra):
+    article = {"Date": "2025-10-14", "Time": "10:00", "Title": f"Title {n}", "Link": f"https://example.com/{n}",
+               "Summary": "summary", "Source": "Example"}
+    article.update(extra)
+    return article
+
+
+def test_article_id_ignores_tracking_params_and_scheme():
+    assert article_id("https://www.Example.com/a/?utm_source=x") == article_id("http://example.com/a")
+
+
+def test_append_skips_already_stored_articles(tmp_path):
+    with NewsStore(str(tmp_path), str(tmp_path / "index.sqlite3")) as store:
+        assert len(store.append([_article(1), _article(2)], "2025-10-14")) == 2
+        assert len(store.append([_article(2), _article(3)], "2025-10-14")) == 1
+        df = pd.read_csv(store.daily_path("2025-10-14"), encoding="utf-8-sig")
+    assert df["Title"].tolist() == ["Title 1", "Title 2", "Title 3"]
+
+
+def test_append_widens_legacy_header(tmp_path):
+    path = tmp_path / "daily_news_2025-10-14.csv"
+    legacy = pd.DataFrame([_article(1)])
+    legacy.to_csv(path, index=False, encoding="utf-8-sig")
+
+    with NewsStore(str(tmp_path), str(tmp_path / "index.sqlite3")) as store:
+        store.append([_article(2, Keywords="ransomware", Lang="en")], "2025-10-14")
+        store.append([_article(3, Keywords="apt", Lang="en")], "2025-10-14")
+
+    df = pd.read_csv(path, encoding="utf-8-sig", keep_default_na=False)
+    assert list(df.columns) == list(legacy.columns) + ["Keywords", "Lang"]
+    assert df["Title"].tolist() == ["Title 1", "Title 2", "Title 3"]
+    assert df["Keywords"].tolist() == ["", "ransomware", "apt"]
+    assert not os.path.exists(str(path) + ".tmp")
@@ -0,0 +1,44 @@
+# test_pipeline_runner.py
+
+import os
+
+import pandas as pd
+
+from pipeline_runner import Stage, StageCheckpoint, run_pipeline
+
+
+def test_save_falls_back_to_pickle_without_leaving_tmp_file(tmp_path, monkeypatch):
+    def broken_to_parquet(self, path, **kwargs):
+        # 파일을 쓰다가 실패한 경우
+        with open(path, "wb") as f:
+            f.write(b"PAR1")
+        raise ValueError("unsupported column")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", broken_to_parquet)
+    checkpoint = StageCheckpoint("run", str(tmp_path))
+    df = pd.DataFrame({"a": [1, 2]})
+    checkpoint.save("aggregate", df, 1.0)
+
+    assert sorted(os.listdir(checkpoint.dir)) == ["aggregate.pkl", "manifest.json"]
+    assert StageCheckpoint("run", str(tmp_path)).load("aggregate").equals(df)
+
+
+def test_rerun_resumes_completed_stages(tmp_path):
+    calls = []
+
+    def stage(name, value, deps=()):
+        def func(inputs):
+            calls.append(name)
+            return value(inputs)
+        return Stage(name, func, deps)
+
+    stages = [stage("collect", lambda inputs: pd.DataFrame({"n": [1, 2, 3]})),
+              stage("summary", lambda inputs: f"{len(inputs['collect'])} articles", deps=("collect",))]
+
+    status, outputs = run_pipeline(stages, "run", str(tmp_path))
+    assert status == {"collect": "done", "summary": "done"}
+
+    status, outputs = run_pipeline(stages, "run", str(tmp_path))
+    assert status == {"collect": "resumed", "summary": "resumed"}
+    assert outputs["summary"] == "3 articles"
+    assert calls == ["collect", "summary"]
@@ -0,0 +1,35 @@
+# test_result_cache.py
+
+import itertools
+
+import result_cache
+from result_cache import ResultCache, cache_key, cached_map
+
+
+def test_cache_key_ignores_whitespace_differences():
+    assert cache_key("  Lazarus   group\n", "model", "v1") == cache_key("Lazarus group", "model", "v1")
+    assert cache_key("Lazarus group", "model", "v1") != cache_key("Lazarus group", "model", "v2")
+
+
+def test_cached_map_computes_only_misses_and_skips_failures(tmp_path):
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return [None if text == "bad" else text.upper() for text in texts]
+
+    with ResultCache(str(tmp_path / "cache.sqlite3")) as cache:
+        assert cached_map(cache, ["a", "b", "bad"], "model", "v1", compute) == ["A", "B", None]
+        assert cached_map(cache, ["b", "c", "bad"], "model", "v1", compute) == ["B", "C", None]
+    # 실패(None)한 결과는 저장되지 않아 다시 계산됨
+    assert calls == [["a", "b", "bad"], ["c", "bad"]]
+
+
+def test_put_many_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(result_cache.time, "time", lambda: next(clock))
+    with ResultCache(str(tmp_path / "cache.sqlite3"), max_bytes=25) as cache:
+        cache.put_many(["a", "b"], "model", "v1", ["x" * 10, "y" * 10])
+        cache.get_many(["a"], "model", "v1")
+        cache.put_many(["c"], "model", "v1", ["z" * 10])
+        assert cache.get_many(["a", "b", "c"], "model", "v1") == ["x" * 10, None, "z" * 10]
@@ -0,0 +1,39 @@
+# test_trend_engine.py
+
+from datetime import date, timedelta
+
+import pandas as pd
+
+from trend_engine import TrendStore
+
+
+def _articles(keyword, days, per_day, start=date(2025, 10, 1)):
+    return pd.DataFrame([{"Date": str(start + timedelta(days=d)), "Source": "Example", "Keywords": keyword,
+                          "Title": f"{keyword} {d}-{n}", "Link": f"https://example.com/{keyword}/{d}/{n}"}
+                         for d in range(days) for n in range(per_day)])
+
+
+def test_add_articles_counts_each_article_once(tmp_path):
+    with TrendStore(str(tmp_path / "trends.sqlite3")) as store:
+        assert store.add_articles(_articles("ransomware", 3, 2)) == 6
+        assert store.add_articles(_articles("ransomware", 3, 2)) == 0
+        assert store.window_counts("2025-10-01", "2025-10-03")["ransomware"] == 6
+
+
+def test_no_spikes_before_enough_history(tmp_path):
+    with TrendStore(str(tmp_path / "trends.sqlite3")) as store:
+        # 수집 2주차: 비교할 과거 기간이 1개뿐이므로 수집 이전 기간을 0 건으로 보고 급증 판정하지 않음
+        store.add_articles(_articles("lazarus", 14, 1))
+        assert store.spikes("2025-10-14", min_count=1).empty
+        assert store.spikes("2025-10-14", z_threshold=-1e9, min_count=1)["ZScore"].isna().all()
+
+
+def test_flat_series_is_not_a_spike_but_a_jump_is(tmp_path):
+    with TrendStore(str(tmp_path / "trends.sqlite3")) as store:
+        store.add_articles(_articles("lazarus", 21, 1))
+        assert store.spikes("2025-10-21", min_count=1).empty
+
+        store.add_articles(_articles("lazarus", 7, 5, start=date(2025, 10, 22)))
+        spikes = store.spikes("2025-10-28", min_count=1)
+        assert spikes["Keyword"].tolist() == ["lazarus"]
+        assert spikes.loc[0, "BaselineMean"] == 7.0
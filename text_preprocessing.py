@@ -0,0 +1,57 @@
+# text_preprocessing.py
+
+import html
+import re
+
+import pandas as pd
+
+# 정규식은 모듈 로드 시 한 번만 컴파일
+TAG_PATTERN = re.compile(r"<[^>]*>")
+# str.split() 과 같은 범위의 공백 (pyarrow 문자열 정규식의 \s 는 ASCII 공백만 포함하므로 유니코드 공백을 직접 나열)
+WHITESPACE_PATTERN = "[\\s\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\u0085\x1c-\x1f]+"
+_WHITESPACE = re.compile(WHITESPACE_PATTERN)
+
+MIN_CONTENT_LENGTH = 30
+
+INSIGHT_PROMPT_SUFFIX = ("Based on the above news summary, describe the emerging trend or significant shift "
+                         "in the cybersecurity landscape in two concise sentences.")
+
+
+def clean_text(text):
+    """HTML 태그 제거, HTML 엔티티 복원 및 공백 정규화 (단일 문자열용)"""
+    text = html.unescape(TAG_PATTERN.sub("", text))
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def clean_series(texts):
+    """clean_text 를 Series 전체에 벡터 연산으로 적용"""
+    texts = texts.fillna("").astype(str).str.replace(TAG_PATTERN.pattern, "", regex=True)
+    # 엔티티 복원은 '&' 가 있는 행에만 적용
+    has_entity = texts.str.contains("&", regex=False)
+    if has_entity.any():
+        texts = texts.copy()
+        texts[has_entity] = texts[has_entity].map(html.unescape)
+    return texts.str.replace(WHITESPACE_PATTERN, " ", regex=True).str.strip()
+
+
+def stripped(df, column):
+    """컬럼을 문자열로 바꾸고 앞뒤 공백 제거 (없거나 NaN 이면 빈 문자열)"""
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].fillna("").astype(str).str.strip()
+
+
+def has_min_length(texts, min_length=MIN_CONTENT_LENGTH):
+    """본문이 min_length 글자 이상인 행 마스크"""
+    return texts.str.len() >= min_length
+
+
+def build_insight_prompts(titles, bodies):
+    """요약 모델 입력 프롬프트를 Series 단위로 조립"""
+    return "Title: " + titles.astype(str) + "\n\nBody: " + bodies.astype(str) + "\n\n" + INSIGHT_PROMPT_SUFFIX
+
+
+def build_article_blocks(numbers, titles, bodies):
+    """Gemini 입력용 '--- Article N ---' 블록을 Series 단위로 조립"""
+    return ("--- Article " + numbers.astype(str) + " ---\nTitle: " + titles.astype(str) + "\nBody: "
+            + bodies.astype(str) + "\n")
@@ -0,0 +1,257 @@
+# trend_engine.py
+
+import argparse
+import math
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from config import (ARCHIVE_DIR, TREND_BASELINE_WINDOWS, TREND_DB, TREND_MIN_BASELINE_WINDOWS, TREND_MIN_COUNT,
+                    TREND_REPORT_DIR, TREND_SPIKE_Z, TREND_TOP_N)
+from news_archive import ARCHIVE_SCHEMA, PARTITIONING, import_daily_csvs
+from news_store import article_id
+
+
+def _day(date):
+    return date if isinstance(date, str) else date.strftime("%Y-%m-%d")
+
+
+def _shift(date_str, days):
+    return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class TrendStore:
+    """
+    일자·키워드·출처별 기사 수를 미리 집계해 두는 SQLite 시계열 저장소.
+    수집기가 새 기사를 저장할 때마다 add_articles 로 건수를 더하며(upsert), 이미 반영한 기사는 다시 세지 않습니다.
+    추세 조회는 CSV 를 다시 읽지 않고 집계 테이블에서 기간 합계만 계산합니다.
+    """
+
+    def __init__(self, path=TREND_DB):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS keyword_daily ("
+            " date TEXT NOT NULL, keyword TEXT NOT NULL, source TEXT NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (date, keyword, source)"
+            ") WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS article_daily ("
+            " date TEXT NOT NULL, source TEXT NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (date, source)"
+            ") WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS counted_articles (article_id TEXT PRIMARY KEY) WITHOUT ROWID;"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_articles(self, df):
+        """
+        일별 CSV 형식(Date, Source, Keywords='키워드1; 키워드2', ...)의 기사를 집계에 더하고 새로 반영한 기사 수를 반환.
+        """
+        if df is None or df.empty:
+            return 0
+
+        links = df["Link"].fillna("").astype(str) if "Link" in df.columns else pd.Series("", index=df.index)
+        titles = df["Title"].fillna("").astype(str) if "Title" in df.columns else pd.Series("", index=df.index)
+        ids = df["ArticleId"] if "ArticleId" in df.columns else pd.Series(
+            [article_id(link, title) for link, title in zip(links, titles)], index=df.index)
+
+        with self.conn:
+            is_new = []
+            for aid in ids:
+                cursor = self.conn.execute("INSERT OR IGNORE INTO counted_articles (article_id) VALUES (?)", (aid,))
+                is_new.append(bool(cursor.rowcount))
+            new = df[is_new]
+            if new.empty:
+                return 0
+
+            articles = pd.DataFrame({
+                "date": new["Date"].astype(str),
+                "source": new["Source"].fillna("").astype(str),
+                "keywords": new["Keywords"].fillna("").astype(str) if "Keywords" in new.columns else "",
+            })
+            self.conn.executemany(
+                "INSERT INTO article_daily (date, source, count) VALUES (?, ?, ?)"
+                " ON CONFLICT (date, source) DO UPDATE SET count = count + excluded.count",
+                articles.groupby(["date", "source"]).size().reset_index().itertuples(index=False, name=None),
+            )
+
+            # 'A; B' 형식의 Keywords 를 키워드별 행으로 펼쳐 (일자, 키워드, 출처) 단위로 합산
+            hits = articles.assign(keyword=articles["keywords"].str.split(";")).explode("keyword")
+            hits["keyword"] = hits["keyword"].str.strip()
+            hits = hits[hits["keyword"].fillna("") != ""]
+            self.conn.executemany(
+                "INSERT INTO keyword_daily (date, keyword, source, count) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (date, keyword, source) DO UPDATE SET count = count + excluded.count",
+                hits.groupby(["date", "keyword", "source"]).size().reset_index().itertuples(index=False, name=None),
+            )
+        return len(new)
+
+    def window_counts(self, start_date, end_date):
+        """start_date ~ end_date (양 끝 포함) 기간의 키워드별 기사 수 Series"""
+        rows = self.conn.execute(
+            "SELECT keyword, SUM(count) FROM keyword_daily WHERE date BETWEEN ? AND ? GROUP BY keyword",
+            (_day(start_date), _day(end_date))).fetchall()
+        return pd.Series(dict(rows), dtype="int64").rename_axis("Keyword")
+
+    def daily_counts(self, start_date, end_date, keywords=None):
+        """일자 x 키워드 기사 수 표 (기사가 없는 날은 0)"""
+        rows = self.conn.execute(
+            "SELECT date, keyword, SUM(count) FROM keyword_daily WHERE date BETWEEN ? AND ? GROUP BY date, keyword",
+            (_day(start_date), _day(end_date))).fetchall()
+        table = pd.DataFrame(rows, columns=["Date", "Keyword", "Count"]).pivot_table(
+            index="Date", columns="Keyword", values="Count", aggfunc="sum", fill_value=0)
+        days = pd.date_range(_day(start_date), _day(end_date)).strftime("%Y-%m-%d")
+        table = table.reindex(index=days, fill_value=0)
+        if keywords is not None:
+            table = table.reindex(columns=list(keywords), fill_value=0)
+        return table
+
+    def rising_keywords(self, end_date=None, window_days=7, top_n=TREND_TOP_N, min_count=TREND_MIN_COUNT):
+        """
+        end_date 까지 최근 window_days 일과 그 직전 같은 길이 기간의 키워드 건수를 비교하여 증가폭이 큰 순으로 반환.
+        Growth 는 (현재 + 1) / (이전 + 1) 배율
+        """
+        end = _day(end_date or datetime.now())
+        start = _shift(end, -(window_days - 1))
+        current = self.window_counts(start, end)
+        previous = self.window_counts(_shift(start, -window_days), _shift(start, -1))
+
+        table = pd.DataFrame({"Current": current, "Previous": previous}).fillna(0).astype("int64")
+        table = table[table["Current"] >= min_count]
+        table["Change"] = table["Current"] - table["Previous"]
+        table["Growth"] = ((table["Current"] + 1) / (table["Previous"] + 1)).round(2)
+        table = table.sort_values(["Change", "Growth"], ascending=False).head(top_n)
+        return table.rename_axis("Keyword").reset_index()
+
+    def first_date(self):
+        """집계된 가장 이른 기사 날짜 (집계가 없으면 None)"""
+        return self.conn.execute("SELECT MIN(date) FROM article_daily").fetchone()[0]
+
+    def spikes(self, end_date=None, window_days=7, baseline_windows=TREND_BASELINE_WINDOWS,
+               z_threshold=TREND_SPIKE_Z, min_count=TREND_MIN_COUNT, min_baseline_windows=TREND_MIN_BASELINE_WINDOWS):
+        """
+        최근 window_days 일의 키워드 건수가 직전 baseline_windows 개 같은 길이 기간의 평균보다
+        z_threshold 표준편차 이상 높은 키워드를 z 점수 순으로 반환.
+        수집 시작일 이전에 걸친 기간은 0 건이 아니라 기록이 없는 것이므로 비교 기간에서 빼고,
+        남은 비교 기간이 min_baseline_windows 개보다 적으면 판정하지 않습니다 (ZScore 는 NaN).
+        건수가 적을 때 표준편차가 0 에 가까워 과대평가되지 않도록 표준편차는 최소 1 로 둡니다.
+        """
+        end = _day(end_date or datetime.now())
+        first = self.first_date()
+        windows = []
+        for i in range(baseline_windows + 1):
+            window_end = _shift(end, -i * window_days)
+            window_start = _shift(window_end, -(window_days - 1))
+            if i and (first is None or window_start < first):
+                break
+            windows.append(self.window_counts(window_start, window_end))
+
+        counts = pd.DataFrame({i: window for i, window in enumerate(windows)}).fillna(0)
+        current = counts[0]
+        baseline = counts.drop(columns=[0])
+        mean = baseline.mean(axis=1)
+        std = baseline.std(axis=1, ddof=0).clip(lower=1.0)
+        if baseline.shape[1] < min_baseline_windows:
+            # 도입 직후처럼 비교할 과거가 부족하면 모든 키워드가 급증으로 보이므로 판정하지 않음
+            mean = std = pd.Series(math.nan, index=counts.index)
+
+        table = pd.DataFrame({"Current": current.astype("int64"), "BaselineMean": mean.round(2),
+                              "BaselineStd": std.round(2), "ZScore": ((current - mean) / std).round(2)})
+        table = table[(table["Current"] >= min_count) & (table["ZScore"] >= z_threshold)]
+        return table.sort_values("ZScore", ascending=False).rename_axis("Keyword").reset_index()
+
+    def source_breakdown(self, start_date, end_date, keywords=None):
+        """키워드 x 출처 기사 수 표 (전체 건수 많은 키워드 순)"""
+        rows = self.conn.execute(
+            "SELECT keyword, source, SUM(count) FROM keyword_daily WHERE date BETWEEN ? AND ? GROUP BY keyword, source",
+            (_day(start_date), _day(end_date))).fetchall()
+        table = pd.DataFrame(rows, columns=["Keyword", "Source", "Count"]).pivot_table(
+            index="Keyword", columns="Source", values="Count", aggfunc="sum", fill_value=0)
+        if keywords is not None:
+            table = table.reindex(index=list(keywords), fill_value=0)
+        return table.loc[table.sum(axis=1).sort_values(ascending=False).index]
+
+    def trend_table(self, end_date=None, window_days=7, top_n=TREND_TOP_N):
+        """
+        보고서용 키워드 추세 표: 현재/이전 기간 건수, 증감, z 점수, 급증 여부, 주요 출처
+        """
+        end = _day(end_date or datetime.now())
+        rising = self.rising_keywords(end, window_days, top_n=None, min_count=1)
+        if rising.empty:
+            return rising
+        spikes = self.spikes(end, window_days, z_threshold=-math.inf, min_count=1).set_index("Keyword")["ZScore"]
+        table = rising.set_index("Keyword")
+        table["ZScore"] = spikes.reindex(table.index)
+        table["Spike"] = (table["ZScore"] >= TREND_SPIKE_Z) & (table["Current"] >= TREND_MIN_COUNT)
+
+        breakdown = self.source_breakdown(_shift(end, -(window_days - 1)), end, table.index).reindex(table.index)
+        table["TopSources"] = [
+            ", ".join(f"{source} ({int(count)})" for source, count in row[row > 0].nlargest(3).items())
+            for _, row in breakdown.iterrows()
+        ]
+        table = table.sort_values(["Spike", "Change", "Current"], ascending=False).head(top_n)
+        return table.reset_index()
+
+
+def spiking_keywords(end_date=None, window_days=7, limit=10, trend_db=TREND_DB):
+    """분석 단계에서 우선 다룰 급증 키워드 목록 (집계가 없으면 빈 목록)"""
+    if not os.path.exists(trend_db):
+        return []
+    with TrendStore(trend_db) as store:
+        return store.spikes(end_date, window_days)["Keyword"].head(limit).tolist()
+
+
+def write_trend_table(window="weekly", end_date=None, window_days=7, output_dir=TREND_REPORT_DIR, trend_db=TREND_DB):
+    """기간 보고서와 함께 볼 키워드 추세 표를 '{window}_keyword_trends_{날짜}.csv' 로 저장하고 (경로, 표) 반환"""
+    with TrendStore(trend_db) as store:
+        table = store.trend_table(end_date, window_days)
+    if table.empty:
+        return None, table
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{window}_keyword_trends_{_day(end_date or datetime.now())}.csv")
+    table.to_csv(path, index=False, encoding="utf-8-sig")
+    return path, table
+
+
+def backfill(trend_db=TREND_DB, archive_dir=ARCHIVE_DIR, batch_size=50000):
+    """Parquet 아카이브 전체(기존 daily_news_*.csv 포함)를 집계에 반영 (이미 반영한 기사는 건너뜀)"""
+    import_daily_csvs(archive_dir=archive_dir)
+    if not os.path.isdir(archive_dir):
+        return 0
+
+    dataset = ds.dataset(archive_dir, format="parquet", schema=ARCHIVE_SCHEMA, partitioning=PARTITIONING)
+    added = 0
+    with TrendStore(trend_db) as store:
+        for batch in dataset.to_batches(columns=["Published", "Source", "Keywords", "ArticleId"],
+                                        batch_size=batch_size):
+            df = batch.to_pandas()
+            df["Date"] = df.pop("Published").dt.strftime("%Y-%m-%d")
+            added += store.add_articles(df.dropna(subset=["Date"]))
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보안 키워드 추세 조회")
+    parser.add_argument("--end-date", help="기준일 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument("--days", type=int, default=7, help="비교 기간 길이(일)")
+    parser.add_argument("--top", type=int, default=TREND_TOP_N)
+    parser.add_argument("--backfill", action="store_true", help="아카이브 전체를 집계에 반영")
+    args = parser.parse_args()
+
+    if args.backfill:
+        print(f"집계 반영 완료: {backfill()}건")
+    with TrendStore() as trend_store:
+        print(trend_store.trend_table(args.end_date, args.days, top_n=args.top).to_string(index=False))
@@ -1,69 +1,117 @@
 # weekly_report_generator.py
 
-import pandas as pd
+import argparse
 import os
+import time
 from datetime import datetime, timedelta
-from config import DATA_DIR, WEEKLY_REPORT_DIR, WEEKLY_REPORT_DAYS
+from config import WEEKLY_REPORT_DIR, REPORT_WINDOWS
+from near_duplicate import cluster_near_duplicates
+from metrics import export_run_report, get_metrics
+from news_archive import import_daily_csvs, load_window, to_daily_csv_format
+from trend_engine import TrendStore, write_trend_table
 
 
-def generate_weekly_report():
+def build_report(window_days, end_date=None, columns=None):
     """
-    일별 수집된 CSV 파일들을 취합하여 주간 보고서 CSV 파일을 생성합니다.
+    아카이브에서 end_date 기준 최근 window_days 일(시작일 포함)의 기사를 읽어 최신순 DataFrame 으로 반환합니다.
+    기간에 해당하는 날짜 파티션과 요청한 컬럼만 읽습니다.
     """
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 주간 보고서 생성 시작...")
+    end_date = end_date or datetime.now()
+    start_date = end_date - timedelta(days=window_days)
+    df = load_window(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), columns=columns)
 
-    # 주간 보고서 저장 폴더 생성 (없으면)
-    if not os.path.exists(WEEKLY_REPORT_DIR):
-        os.makedirs(WEEKLY_REPORT_DIR)
+    # 중복 제거 (정규화된 URL 기준 기사 ID)
+    loaded = len(df)
+    if "ArticleId" in df.columns:
+        df = df.drop_duplicates(subset=['ArticleId']).reset_index(drop=True)
 
-    all_weekly_articles = []
+    metrics = get_metrics()
+    metrics.inc("report_articles_loaded", loaded)
+    metrics.inc("report_exact_duplicates", loaded - len(df))
+    return df
 
-    # 보고서 생성 기준 날짜 (오늘부터 WEEKLY_REPORT_DAYS 이전까지)
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=WEEKLY_REPORT_DAYS)
 
-    print(f"기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
-
-    # 지정된 기간 내의 모든 일별 CSV 파일 읽기
-    for i in range(WEEKLY_REPORT_DAYS + 1):  # 시작일 포함
-        current_date = start_date + timedelta(days=i)
-        filename = os.path.join(DATA_DIR, f"daily_news_{current_date.strftime('%Y-%m-%d')}.csv")
-
-        if os.path.exists(filename):
-            try:
-                df_daily = pd.read_csv(filename, encoding='utf-8-sig')
-                all_weekly_articles.append(df_daily)
-                print(f"  -> '{filename}' 파일 로드 완료.")
-            except pd.errors.EmptyDataError:
-                print(f"  -> '{filename}' 파일은 비어있습니다. 건너뜝니다.")
-            except Exception as e:
-                print(f"  -> '{filename}' 파일을 로드하는 중 오류 발생: {e}")
-        # else:
-        #     print(f"  -> '{filename}' 파일이 존재하지 않습니다. 건너뜝니다.") # 너무 많으면 주석처리
+def generate_report(window="weekly", end_date=None, export_format="csv"):
+    """
+    아카이브에 저장된 기사를 취합하여 주간/월간/분기 보고서 파일을 생성합니다.
+    export_format: 'csv' (기존 형식), 'parquet', 'both', 'none' (파일을 쓰지 않고 DataFrame 만 반환)
+    """
+    window_days = REPORT_WINDOWS[window]
+    metrics = get_metrics()
+    report_start = time.perf_counter()
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {window} 보고서 생성 시작...")
 
-    if not all_weekly_articles:
-        print("수집된 일별 뉴스 파일이 없어 주간 보고서를 생성할 수 없습니다.")
-        return
+    # 보고서 저장 폴더 생성 (없으면)
+    if not os.path.exists(WEEKLY_REPORT_DIR):
+        os.makedirs(WEEKLY_REPORT_DIR)
 
-    # 모든 일별 데이터를 하나의 DataFrame으로 합치기
-    df_combined = pd.concat(all_weekly_articles, ignore_index=True)
+    # 아카이브 도입 이전의 일별 CSV 가 있으면 최초 1회 아카이브로 옮김
+    imported = import_daily_csvs()
+    if imported:
+        print(f"  -> 기존 일별 CSV 에서 {imported}건을 아카이브로 가져왔습니다.")
 
-    # 중복 제거 (제목과 링크가 완전히 동일한 경우만)
-    df_combined.drop_duplicates(subset=['Title', 'Link'], inplace=True)
+    end_date = end_date or datetime.now()
+    start_date = end_date - timedelta(days=window_days)
+    print(f"기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
 
-    # 발행일 기준으로 정렬
-    # 'Date'와 'Time' 컬럼을 합쳐 datetime 객체로 변환하여 정확히 정렬
-    df_combined['FullDateTime'] = pd.to_datetime(df_combined['Date'] + ' ' + df_combined['Time'], errors='coerce')
-    df_combined.sort_values(by='FullDateTime', ascending=False, inplace=True)
-    df_combined.drop(columns=['FullDateTime'], inplace=True)  # 정렬 후 임시 컬럼 삭제
+    with metrics.timer("stage", stage="report_load", window=window):
+        df_combined = build_report(window_days, end_date)
+
+    if df_combined.empty:
+        print("수집된 뉴스가 없어 보고서를 생성할 수 없습니다.")
+        return None
+
+    # 다른 매체가 보도한 같은 사건을 하나의 클러스터로 묶고 대표 기사를 지정
+    with metrics.timer("stage", stage="report_cluster", window=window):
+        df_combined = cluster_near_duplicates(df_combined)
+    representatives = int(df_combined['IsRepresentative'].sum())
+    print(f"유사 중복 클러스터링: 기사 {len(df_combined)}건 -> 사건 {representatives}건")
+    # 중복 비율: 전체 기사 중 대표 기사가 아닌(다른 기사와 같은 사건인) 기사 비율
+    metrics.set("report_articles", len(df_combined), window=window)
+    metrics.set("report_clusters", representatives, window=window)
+    metrics.set("report_near_duplicate_ratio", round(1 - representatives / len(df_combined), 4), window=window)
+
+    # 보고서 파일명 정의 (가장 최근 날짜 기준)
+    output_stem = os.path.join(WEEKLY_REPORT_DIR, f"{window}_security_report_{end_date.strftime('%Y-%m-%d')}")
+
+    if export_format in ("csv", "both"):
+        to_daily_csv_format(df_combined).to_csv(output_stem + ".csv", index=False, encoding='utf-8-sig')
+        print(f"보고서 생성 완료: 총 {len(df_combined)}건의 뉴스가 '{output_stem}.csv'에 저장되었습니다.")
+    if export_format in ("parquet", "both"):
+        df_combined.to_parquet(output_stem + ".parquet", index=False)
+        print(f"보고서 생성 완료: 총 {len(df_combined)}건의 뉴스가 '{output_stem}.parquet'에 저장되었습니다.")
+
+    # 미리 집계된 키워드 건수로 직전 기간 대비 추세 표 작성 (기사 본문을 다시 읽지 않음)
+    with metrics.timer("stage", stage="report_trends", window=window):
+        if export_format == "none":
+            with TrendStore() as trend_store:
+                trends = trend_store.trend_table(end_date, window_days)
+        else:
+            trend_path, trends = write_trend_table(window, end_date, window_days)
+            if trend_path:
+                print(f"키워드 추세 표 저장: '{trend_path}'")
+    if not trends.empty:
+        spiking = trends[trends["Spike"]]
+        metrics.set("report_spiking_keywords", len(spiking), window=window)
+        print("키워드 추세 (직전 기간 대비): " + ", ".join(
+            f"{row.Keyword} {row.Previous}→{row.Current}" + (" 🔺" if row.Spike else "")
+            for row in trends.head(5).itertuples()))
+
+    metrics.observe("stage", time.perf_counter() - report_start, stage="report", window=window)
+    return df_combined
 
-    # 주간 보고서 파일명 정의 (가장 최근 날짜 기준)
-    output_weekly_filename = os.path.join(WEEKLY_REPORT_DIR,
-                                          f"weekly_security_report_{end_date.strftime('%Y-%m-%d')}.csv")
 
-    df_combined.to_csv(output_weekly_filename, index=False, encoding='utf-8-sig')
-    print(f"주간 보고서 생성 완료: 총 {len(df_combined)}건의 뉴스가 '{output_weekly_filename}'에 저장되었습니다.")
+def generate_weekly_report():
+    """
+    일별 수집된 기사들을 취합하여 주간 보고서 CSV 파일을 생성합니다.
+    """
+    return generate_report("weekly")
 
 
 if __name__ == "__main__":
-    generate_weekly_report()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="보안 뉴스 기간별 보고서 생성")
+    parser.add_argument("window", nargs="?", default="weekly", choices=sorted(REPORT_WINDOWS))
+    parser.add_argument("--format", dest="export_format", default="csv", choices=["csv", "parquet", "both", "none"])
+    args = parser.parse_args()
+    generate_report(args.window, export_format=args.export_format)
+    export_run_report(f"report_{args.window}")